@@ -0,0 +1,157 @@
+from typing import Dict, Any, Optional, Tuple
+import threading
+import time
+from sqlalchemy import text
+from app.core.config import settings
+
+# Fallback when a category x complexity cell has too little history
+DEFAULT_DURATIONS = {"low": 2, "medium": 5, "high": 10}
+DEFAULT_BUFFER = 1.2
+# Optimistic / most likely / pessimistic spread around an uncalibrated estimate
+DEFAULT_SPREAD = (0.6, 1.0, 2.0)
+
+# Nearest-rank quantiles per category x complexity in one pass: window functions
+# rank every completed task within its cell, the outer GROUP BY keeps one row per cell
+AGGREGATE_QUERY = text("""
+    WITH ranked AS (
+        SELECT category, complexity, actual_duration,
+               ROW_NUMBER() OVER (PARTITION BY category, complexity ORDER BY actual_duration) AS rank,
+               COUNT(*) OVER (PARTITION BY category, complexity) AS samples
+        FROM task_history
+        WHERE actual_duration > 0 AND category IS NOT NULL AND complexity IS NOT NULL
+    )
+    SELECT category, complexity, MAX(samples) AS samples, AVG(actual_duration) AS mean,
+           MIN(CASE WHEN rank >= 0.1 * samples THEN actual_duration END) AS p10,
+           MIN(CASE WHEN rank >= 0.5 * samples THEN actual_duration END) AS p50,
+           MIN(CASE WHEN rank >= 0.8 * samples THEN actual_duration END) AS p80,
+           MIN(CASE WHEN rank >= 0.9 * samples THEN actual_duration END) AS p90
+    FROM ranked
+    GROUP BY category, complexity
+""")
+
+
+class DurationTable:
+    """Immutable snapshot of calibrated durations (working days) per category x complexity.
+
+    ``cells`` maps ``(category, complexity)`` to ``samples``, ``mean``,
+    ``p10``/``p50``/``p80``/``p90`` and the ``estimate`` used for planning
+    (the quantile named by ``DURATION_TABLE_QUANTILE``). Cells with fewer than
+    ``DURATION_TABLE_MIN_SAMPLES`` completed tasks are left out and fall
+    back to the static defaults with a 20% buffer.
+    """
+
+    def __init__(self, cells: Optional[Dict[Tuple[str, str], Dict[str, float]]] = None,
+                 version: int = 0, built_at: Optional[float] = None):
+        self.cells = cells or {}
+        self.version = version
+        self.built_at = built_at
+
+    def estimate(self, category: Optional[str], complexity: Optional[str]) -> float:
+        cell = self.cells.get((category, complexity))
+        if cell is not None:
+            return cell["estimate"]
+        return round(DEFAULT_DURATIONS.get(complexity, 5) * DEFAULT_BUFFER, 1)
+
+    def is_calibrated(self, category: Optional[str], complexity: Optional[str]) -> bool:
+        return (category, complexity) in self.cells
+
+    def three_point(self, category: Optional[str], complexity: Optional[str]) -> Tuple[float, float, float]:
+        """(optimistic, most likely, pessimistic): the cell's p10/p50/p90, or ``DEFAULT_SPREAD``
+        around the buffered ``estimate()`` when uncalibrated, so risk samples what the plan uses"""
+        cell = self.cells.get((category, complexity))
+        if cell is None:
+            estimate = self.estimate(category, complexity)
+            return tuple(round(estimate * factor, 2) for factor in DEFAULT_SPREAD)
+        return cell["p10"], cell["p50"], cell["p90"]
+
+    @classmethod
+    def build(cls, rows, version: int, quantile: str, min_samples: int) -> "DurationTable":
+        cells = {}
+        for row in rows:
+            if row.samples < min_samples:
+                continue
+            cell = {
+                "samples": int(row.samples),
+                "mean": round(float(row.mean), 2),
+                "p10": float(row.p10),
+                "p50": float(row.p50),
+                "p80": float(row.p80),
+                "p90": float(row.p90),
+            }
+            cell["estimate"] = round(cell[quantile], 1)
+            cells[(row.category, row.complexity)] = cell
+        return cls(cells, version, time.time())
+
+
+class DurationTableStore:
+    """Holds the current ``DurationTable`` and swaps in rebuilt ones.
+
+    Readers take ``current()`` once per request and look durations up in
+    that snapshot, so a reload never changes estimates mid-plan. A stale
+    table is rebuilt on a background thread (one aggregate query against
+    ``task_history``) while the old one keeps serving; the version only
+    increments when the rebuilt cells differ. On any DB error the current
+    table is kept.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._table = DurationTable()
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def current(self) -> DurationTable:
+        self.ensure_fresh()
+        return self._table
+
+    def ensure_fresh(self):
+        if self._checked_at is not None and time.monotonic() - self._checked_at <= self.ttl:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            self._checked_at = time.monotonic()
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> DurationTable:
+        """Rebuild from ``task_history`` now; returns the table in use afterwards"""
+        self._checked_at = time.monotonic()
+        try:
+            from app.ML_model.database import SessionLocal
+            session = SessionLocal()
+            try:
+                rows = session.execute(AGGREGATE_QUERY).all()
+            finally:
+                session.close()
+        except Exception as e:
+            print(f"Warning: duration table not refreshed: {e}")
+            return self._table
+
+        table = DurationTable.build(
+            rows, self._table.version + 1, settings.DURATION_TABLE_QUANTILE,
+            settings.DURATION_TABLE_MIN_SAMPLES,
+        )
+        if table.cells != self._table.cells:
+            self._table = table
+            print(f"Duration table v{table.version}: {len(table.cells)} calibrated cells")
+        return self._table
+
+    def snapshot(self) -> Dict[str, Any]:
+        table = self._table
+        return {
+            "version": table.version,
+            "built_at": table.built_at,
+            "cells": {f"{category}/{complexity}": cell for (category, complexity), cell in table.cells.items()},
+        }
+
+
+duration_table = DurationTableStore(settings.DURATION_TABLE_TTL)
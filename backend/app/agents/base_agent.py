@@ -1,29 +1,147 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Optional
 from app.core.config import settings
+from app.core.json_stream import IncrementalJSONParser
+from app.core.concurrency import AdaptiveLimiter, get_limiter
+from app.core.llm import get_llm, use_groq
+from app.core.response_cache import response_cache
+from app.agents.routing import choose_tier, routing_stats, FAST, LARGE
 
 class BaseAgent(ABC):
     def __init__(self, name: str):
         self.name = name
-        
-        # Choose LLM provider based on settings
-        if settings.USE_GROQ and settings.GROQ_API_KEY:
-            from langchain_groq import ChatGroq
-            self.llm = ChatGroq(
-                model=settings.GROQ_MODEL,
-                temperature=0.7,
-                groq_api_key=settings.GROQ_API_KEY
-            )
+
+        # Choose LLM provider based on settings; clients are shared and pre-built at startup
+        if use_groq():
+            self.model_name = settings.GROQ_MODEL
+            self.fast_model_name = settings.GROQ_FAST_MODEL
             print(f"Using Groq ({settings.GROQ_MODEL}) for {name} agent")
         else:
-            from langchain_openai import ChatOpenAI
-            self.llm = ChatOpenAI(
-                model=settings.OPENAI_MODEL,
-                temperature=0.7,
-                openai_api_key=settings.OPENAI_API_KEY
-            )
+            self.model_name = settings.OPENAI_MODEL
+            self.fast_model_name = settings.OPENAI_FAST_MODEL
             print(f"Using OpenAI ({settings.OPENAI_MODEL}) for {name} agent")
-    
+
+        self.llm = get_llm(self.model_name)
+        self.fast_llm = get_llm(self.fast_model_name)
+
     @abstractmethod
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        pass
\ No newline at end of file
+        pass
+
+    async def run_cascade(self, route_text: str,
+                          attempt: Callable[[Any], Awaitable[Any]],
+                          validate: Callable[[Any], Optional[str]],
+                          item_count: int = 0) -> Any:
+        """Run ``attempt`` on the fast model for simple inputs, escalating on failure.
+
+        ``validate`` returns None for acceptable output or a short reason string.
+        The large model's output is returned as-is for the caller to handle.
+        """
+        tier = choose_tier(route_text, item_count)
+        if tier == FAST:
+            try:
+                result = await attempt(self.fast_llm)
+                error = validate(result)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if error is None:
+                routing_stats.record(self.name, FAST)
+                print(f"[{self.name}] routed to {self.fast_model_name}")
+                return result
+            routing_stats.record(self.name, FAST, escalated=True)
+            print(f"[{self.name}] {self.fast_model_name} output rejected ({error}), "
+                  f"escalating to {self.model_name}")
+        else:
+            routing_stats.record(self.name, LARGE)
+            print(f"[{self.name}] routed to {self.model_name}")
+
+        return await attempt(self.llm)
+
+    def model_for(self, llm=None) -> str:
+        return self.fast_model_name if llm is not None and llm is self.fast_llm else self.model_name
+
+    def _limiter(self, llm=None) -> AdaptiveLimiter:
+        """Adaptive concurrency limiter shared by every agent calling the same model"""
+        return get_limiter(self.model_for(llm))
+
+    def _json_llm(self, llm=None):
+        """Bind the provider's JSON mode (Groq and OpenAI both accept response_format)"""
+        llm = llm or self.llm
+        try:
+            return llm.bind(response_format={"type": "json_object"})
+        except (AttributeError, TypeError):
+            return llm
+
+    async def astream_json_items(self, prompt: Any, items_key: Optional[str] = None,
+                                 llm=None,
+                                 parser: Optional[IncrementalJSONParser] = None) -> AsyncIterator[Any]:
+        """Stream the response and yield array items as soon as each one closes.
+
+        Prompts must ask for a JSON object (JSON mode rejects bare arrays), with
+        the items under ``items_key``. Parse errors surface on the offending
+        item instead of after the full completion. Pass a tolerant ``parser``
+        to keep malformed or truncated items for repair instead of raising.
+
+        The response is read by a separate task that holds the concurrency
+        slot only while the provider streams, so a slow consumer neither
+        keeps the slot nor inflates the limiter's latency signal.
+        """
+        parser = parser or IncrementalJSONParser(items_key)
+        items: asyncio.Queue = asyncio.Queue()
+        end = object()
+        
+        async def read():
+            try:
+                async with self._limiter(llm).slot() as timer:
+                    async for chunk in self._json_llm(llm).astream(prompt):
+                        timer.first_token()
+                        for item in parser.feed(self._chunk_text(chunk)):
+                            items.put_nowait(item)
+                        if parser.done:
+                            break
+            finally:
+                items.put_nowait(end)
+        
+        reader = asyncio.create_task(read())
+        try:
+            while (item := await items.get()) is not end:
+                yield item
+            await reader  # re-raises a parse or provider error after the items before it
+        finally:
+            reader.cancel()
+        if not parser.done and not parser.tolerant:
+            parser.close()  # raises on truncated output
+
+    async def ainvoke_json(self, prompt: Any, items_key: Optional[str] = None,
+                           on_item: Optional[Callable[[Any], None]] = None,
+                           llm=None, cache_key: Optional[str] = None) -> Any:
+        """Stream the response and return the parsed JSON document.
+
+        With a ``cache_key`` (see ``PromptTemplate.cache_key``) parsed
+        documents are served from and stored in the local response cache.
+        """
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                print(f"[{self.name}] response cache hit")
+                return cached
+
+        parser = IncrementalJSONParser(items_key)
+        async with self._limiter(llm).slot() as timer:
+            async for chunk in self._json_llm(llm).astream(prompt):
+                timer.first_token()
+                for item in parser.feed(self._chunk_text(chunk)):
+                    if on_item:
+                        on_item(item)
+                if parser.done:
+                    break
+        document = parser.close()
+        if cache_key:
+            response_cache.set(cache_key, document)
+        return document
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        content = getattr(chunk, "content", chunk)
+        return content if isinstance(content, str) else ""
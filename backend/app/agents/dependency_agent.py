@@ -1,6 +1,22 @@
-from typing import Dict, Any, List, Set, Tuple
-import json
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+from datetime import date
 from app.agents.base_agent import BaseAgent
+from app.agents.dependency_rules import cooccurrence_stats, infer_dependencies
+from app.agents.dependency_windows import make_windows, merge_window_graphs
+from app.agents.prompt_builder import PromptBuilder
+from app.agents.prompts import DEPENDENCY
+from app.agents.validation import validate_dependency_plan
+from app.ML_model.duration_table import duration_table
+from app.core.config import settings
+from app.scheduling.calendar import DATE_FORMAT, parse_date
+from app.scheduling.cycles import find_cycles, repair_cycles
+from app.scheduling.graph import TaskGraph
+from app.scheduling.hierarchy import merge_epic_dependencies
+from app.scheduling.layering import topological_layers
+from app.scheduling.reduction import transitive_reduction
+from app.scheduling.risk import scaled_iterations, schedule_risk
+from app.scheduling.schedule import level_schedule, propagate_schedule
 
 class DependencyAgent(BaseAgent):
     def __init__(self):
@@ -8,310 +24,214 @@ class DependencyAgent(BaseAgent):
         
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         tasks = state.get('tasks', [])
-        
-        # Create task summary for the LLM
-        task_summary = []
-        for task in tasks:
-            task_summary.append({
-                "id": task["id"],
-                "name": task["name"],
-                "category": task["category"],
-                "description": task["description"]
-            })
-        
-        prompt = f"""
-        Analyze these project tasks and identify dependencies between them.
-        Tasks: {json.dumps(task_summary, indent=2)}
-        
-        Rules for dependencies:
-        1. Setup/initialization tasks usually have no dependencies
-        2. Core development tasks depend on setup tasks
-        3. Testing tasks depend on development tasks
-        4. Deployment depends on testing
-        5. Documentation can often be done in parallel with development
-        6. Tasks in the same category might have dependencies if one builds on another
-        
-        Return a JSON object with:
-        {{
-            "dependencies": {{
-                "task_id": ["list", "of", "dependent", "task_ids"],
-                ...
-            }},
-            "parallel_groups": [
-                ["task_ids", "that", "can", "run", "together"],
-                ...
-            ],
-            "critical_path": ["ordered", "list", "of", "task_ids", "forming", "longest", "path"]
-        }}
-        
-        Example:
-        {{
-            "dependencies": {{
-                "task_1": [],
-                "task_2": ["task_1"],
-                "task_3": ["task_1"],
-                "task_4": ["task_2", "task_3"]
-            }},
-            "parallel_groups": [
-                ["task_1"],
-                ["task_2", "task_3"],
-                ["task_4"]
-            ],
-            "critical_path": ["task_1", "task_2", "task_4"]
-        }}
-        
-        Return ONLY the JSON object, no other text.
-        """
-        
-        try:
-            message = await self.llm.ainvoke(prompt)
-            response = message.content
-            
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
-            
-            dep_data = json.loads(response.strip())
-            dependencies = dep_data.get("dependencies", {})
-            parallel_groups = dep_data.get("parallel_groups", [])
-            critical_path = dep_data.get("critical_path", [])
-            
-            # Validate dependencies (no cycles)
-            if self._has_cycles(dependencies):
-                print("Warning: Cycle detected in dependencies, using fallback")
-                dependencies = self._create_safe_dependencies(tasks)
-                parallel_groups = self._create_parallel_groups(tasks, dependencies)
-                critical_path = self._find_critical_path(tasks, dependencies)
-            
-        except Exception as e:
-            print(f"Error in dependency agent: {e}")
-            # Fallback to simple sequential dependencies
-            dependencies = self._create_safe_dependencies(tasks)
-            parallel_groups = self._create_parallel_groups(tasks, dependencies)
-            critical_path = self._find_critical_path(tasks, dependencies)
+        order = [task["id"] for task in tasks]
+        
+        epics = state.get("epics")
+        inferred = {"confidence": None}
+        if epics:
+            # Hierarchical plan: intra-epic edges came with each decomposition and
+            # epic ordering with the epic plan, so no whole-plan analysis is needed
+            intra = {task["id"]: task.get("dependencies", []) for task in tasks}
+            dependencies, dropped = merge_epic_dependencies(epics, intra)
+            if dropped:
+                print(f"Warning: broke hierarchical plan cycles by removing {dropped}")
+            source = "hierarchical"
+        else:
+            # Rule-based graph: the primary answer in "rules" mode, otherwise the fallback.
+            # Stale stats are reloaded on a background thread, never on the event loop
+            cooccurrence_stats.ensure_fresh()
+            inferred = infer_dependencies(tasks, cooccurrence_stats)
+            mode = state.get("dependency_mode") or settings.DEPENDENCY_MODE
+            
+            if mode == "rules" and inferred["confidence"] >= settings.DEPENDENCY_RULES_MIN_CONFIDENCE:
+                dependencies, source = inferred["dependencies"], "rules"
+            else:
+                try:
+                    if len(tasks) > settings.DEPENDENCY_WINDOW_SIZE:
+                        dependencies, source = await self._windowed_dependencies(tasks, order, inferred), "llm_windowed"
+                    else:
+                        dependencies, source = await self._llm_dependencies(tasks, order), "llm"
+                except Exception as e:
+                    print(f"Error in dependency agent: {e}")
+                    dependencies, source = inferred["dependencies"], "rules_fallback"
+        
+        # One interned CSR graph shared by every pass below; dicts only for the output
+        graph = TaskGraph.from_dependencies(order, dependencies)
+        
+        # Drop edges already implied by a longer chain (A->C when A->B->C)
+        graph, redundant = transitive_reduction(graph)
+        if redundant:
+            print(f"Removed {len(redundant)} implied dependency edges: {redundant}")
+        dependencies = graph.to_dependencies()
         
         # Update tasks with dependency information
         for task in tasks:
             task_id = task["id"]
             task["dependencies"] = dependencies.get(task_id, [])
         
-        # Update timeline based on dependencies
-        state = self._adjust_timeline(state, dependencies)
+        # Reschedule in dependency order; CPM's critical path replaces the LLM's (untrusted) one
+        cpm = self._schedule_tasks(state, dependencies, graph)
+        
+        # With team capacity, everything reported below (float, critical path,
+        # duration, risk) describes the leveled plan: CPM over the dependencies
+        # plus the resource links the leveling introduced
+        schedule, constrained, schedule_graph = cpm, dependencies, graph
+        capacity = state.get("team_capacity") or settings.TEAM_CAPACITY
+        if capacity and tasks:
+            state["resource_schedule"], schedule, constrained = self._level_resources(
+                state, dependencies, cpm, capacity, graph
+            )
+            schedule_graph = None
+        if tasks and settings.RISK_ITERATIONS > 0:
+            state["schedule_risk"] = await asyncio.to_thread(
+                schedule_risk, tasks, constrained, cpm["project_start"],
+                iterations=scaled_iterations(len(tasks), settings.RISK_ITERATIONS,
+                                             settings.RISK_CELL_BUDGET, settings.RISK_MIN_ITERATIONS),
+                distribution=settings.RISK_DISTRIBUTION,
+                seed=settings.RISK_SEED, region=state.get("calendar_region"), graph=schedule_graph,
+                three_point=(state.get("duration_table") or duration_table.current()).three_point,
+            )
         
         # Add to state
         state["dependencies"] = dependencies
-        state["parallel_groups"] = parallel_groups
-        state["critical_path"] = critical_path
+        state["parallel_groups"] = self._create_parallel_groups(tasks, dependencies, graph)
+        state["critical_path"] = schedule["critical_path"]
+        state["schedule_analysis"] = {
+            "project_duration_days": schedule["project_duration"],
+            "unconstrained_duration_days": cpm["project_duration"],
+            "resource_leveled": schedule is not cpm,
+            "critical_path": schedule["critical_path"],
+            "critical_tasks": sum(1 for t in schedule["tasks"].values() if t["is_critical"]),
+            "redundant_edges_removed": len(redundant),
+            "dependency_source": source,
+            "rules_confidence": inferred["confidence"],
+            "epics": len(epics) if epics else 0,
+        }
         
         return state
     
-    def _has_cycles(self, dependencies: Dict[str, List[str]]) -> bool:
-        """Check if dependency graph has cycles using DFS"""
-        visited = set()
-        rec_stack = set()
-        
-        def visit(node):
-            if node in rec_stack:
-                return True
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for dep in dependencies.get(node, []):
-                if visit(dep):
-                    return True
-            
-            rec_stack.remove(node)
-            return False
-        
-        for node in dependencies:
-            if node not in visited:
-                if visit(node):
-                    return True
-        return False
+    def _level_resources(self, state: Dict[str, Any], dependencies: Dict[str, List[str]],
+                         cpm: Dict[str, Any], capacity: Dict[str, int],
+                         graph: Optional[TaskGraph] = None) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, List[str]]]:
+        """Re-date tasks so no category runs more tasks at once than the team allows.
+
+        Returns the leveling summary, the leveled CPM and the dependencies
+        plus resource links it was computed on.
+        """
+        leveled = level_schedule(state.get('tasks', []), dependencies, cpm, capacity,
+                                 state.get("calendar_region"), graph)
+        project_end = leveled.pop("project_end")
+        leveled_cpm, constrained = leveled.pop("cpm"), leveled.pop("constrained")
+        state["total_duration"] = (project_end - cpm["project_start"]).days
+        state["project_end"] = project_end.strftime(DATE_FORMAT)
+        return leveled, leveled_cpm, constrained
     
-    def _create_safe_dependencies(self, tasks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Create simple, safe dependencies based on task categories"""
-        dependencies = {}
-        
-        # Group tasks by category
-        setup_tasks = []
-        dev_tasks = []
-        test_tasks = []
-        deploy_tasks = []
-        doc_tasks = []
-        
-        for task in tasks:
-            task_id = task["id"]
-            category = task["category"]
-            
-            if "setup" in task["name"].lower() or "initial" in task["name"].lower():
-                setup_tasks.append(task_id)
-            elif category == "development":
-                dev_tasks.append(task_id)
-            elif category == "testing":
-                test_tasks.append(task_id)
-            elif category == "deployment":
-                deploy_tasks.append(task_id)
-            elif category == "documentation":
-                doc_tasks.append(task_id)
-        
-        # Create dependencies
-        for task in tasks:
-            task_id = task["id"]
-            deps = []
-            
-            if task_id in setup_tasks:
-                # Setup tasks have no dependencies
-                deps = []
-            elif task_id in dev_tasks:
-                # Dev tasks depend on setup
-                deps = setup_tasks[:1]  # Just first setup task
-            elif task_id in test_tasks:
-                # Test tasks depend on some dev tasks
-                deps = dev_tasks[:2] if len(dev_tasks) >= 2 else dev_tasks
-            elif task_id in deploy_tasks:
-                # Deploy depends on testing
-                deps = test_tasks
-            elif task_id in doc_tasks:
-                # Docs can start after setup
-                deps = setup_tasks[:1] if setup_tasks else []
-            
-            dependencies[task_id] = deps
-        
+    async def _windowed_dependencies(self, tasks: List[Dict[str, Any]], order: List[str],
+                                     inferred: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Analyze overlapping topic windows concurrently and merge them into one graph.
+
+        Each window goes through the regular single-prompt analysis; the rule
+        engine's edges cover task pairs no window contained.
+        """
+        windows = make_windows(tasks, settings.DEPENDENCY_WINDOW_SIZE, settings.DEPENDENCY_WINDOW_OVERLAP)
+        semaphore = asyncio.Semaphore(settings.DEPENDENCY_WINDOW_CONCURRENCY)
+        
+        async def analyze(window: List[Dict[str, Any]]) -> Optional[Dict[str, List[str]]]:
+            window_order = [task["id"] for task in window]
+            async with semaphore:
+                try:
+                    return await self._llm_dependencies(window, window_order)
+                except Exception as e:
+                    print(f"Dependency window of {len(window)} tasks failed: {e}")
+                    return None
+        
+        results = await asyncio.gather(*(analyze(window) for window in windows))
+        if all(result is None for result in results):
+            raise ValueError(f"all {len(windows)} dependency windows failed")
+        
+        dependencies, stats = merge_window_graphs(
+            order, [[task["id"] for task in window] for window in windows], results,
+            fallback=inferred["dependencies"],
+        )
+        print(f"Merged windowed dependency analysis: {stats}")
         return dependencies
     
-    def _create_parallel_groups(self, tasks: List[Dict[str, Any]], 
-                               dependencies: Dict[str, List[str]]) -> List[List[str]]:
-        """Group tasks that can be executed in parallel"""
-        groups = []
-        remaining = set(task["id"] for task in tasks)
-        completed = set()
-        
-        while remaining:
-            # Find tasks that can run now
-            current_group = []
-            for task_id in remaining:
-                deps = dependencies.get(task_id, [])
-                if all(dep in completed for dep in deps):
-                    current_group.append(task_id)
-            
-            if not current_group:
-                # Prevent infinite loop
-                current_group = list(remaining)
-            
-            groups.append(current_group)
-            completed.update(current_group)
-            remaining.difference_update(current_group)
-        
-        return groups
+    async def _llm_dependencies(self, tasks: List[Dict[str, Any]], order: List[str]) -> Dict[str, List[str]]:
+        """Ask the LLM for the graph, then repair it rather than discard it"""
+        # Create compact task summary for the LLM
+        builder = PromptBuilder("Dependency")
+        fields = ("id", "name", "category", "description")
+        # The prompt used to embed these fields with indent=2
+        task_summary = builder.tasks_context(tasks, fields=fields, baseline_fields=fields, baseline_indent=2)
+        builder.log_report()
+        
+        prompt = DEPENDENCY.messages(tasks=task_summary)
+        
+        task_ids = set(order)
+        
+        def validate(dep_data: Dict[str, Any]) -> Optional[str]:
+            deps = dep_data.get("dependencies")
+            if not isinstance(deps, dict):
+                return "missing dependencies object"
+            unknown = {d for ds in deps.values() for d in ds} - task_ids
+            if unknown:
+                return f"unknown task ids {sorted(unknown)}"
+            cycles = find_cycles(list(deps), deps)
+            if cycles:
+                return f"cyclic dependencies {cycles}"
+            return None
+        
+        dep_data = await self.run_cascade(
+            " ".join(t["name"] for t in tasks),
+            lambda llm: self.ainvoke_json(
+                prompt, llm=llm,
+                cache_key=DEPENDENCY.cache_key(self.model_for(llm), tasks=task_summary)
+            ),
+            validate,
+            item_count=len(tasks),
+        )
+        plan, fixes = validate_dependency_plan(dep_data, order)
+        
+        # Repair cycles by removing a minimal edge set instead of discarding the graph
+        cycles = find_cycles(order, plan.dependencies)
+        dependencies, removed = repair_cycles(order, plan.dependencies)
+        if removed:
+            kept = sum(len(d) for d in dependencies.values())
+            fixes.append(f"cycles {cycles} broken by removing {removed} "
+                         f"({kept} of {kept + len(removed)} edges kept)")
+        if fixes:
+            print(f"Warning: repaired dependency graph: {'; '.join(fixes)}")
+        return dependencies
     
-    def _find_critical_path(self, tasks: List[Dict[str, Any]], 
-                           dependencies: Dict[str, List[str]]) -> List[str]:
-        """Find the longest path through the dependency graph"""
-        # Simple implementation: find path with most dependencies
-        task_ids = [t["id"] for t in tasks]
-        
-        # For each task, find its depth
-        depths = {}
-        
-        def get_depth(task_id):
-            if task_id in depths:
-                return depths[task_id]
-            
-            deps = dependencies.get(task_id, [])
-            if not deps:
-                depths[task_id] = 0
-            else:
-                depths[task_id] = max(get_depth(dep) for dep in deps) + 1
-            
-            return depths[task_id]
-        
-        # Calculate depths
-        for task_id in task_ids:
-            get_depth(task_id)
-        
-        # Build critical path
-        critical_path = []
-        
-        # Start with deepest task
-        if depths:
-            current = max(depths.items(), key=lambda x: x[1])[0]
-            
-            while current:
-                critical_path.insert(0, current)
-                deps = dependencies.get(current, [])
-                
-                if deps:
-                    # Choose dependency with highest depth
-                    current = max(deps, key=lambda d: depths.get(d, 0))
-                else:
-                    current = None
-        
-        return critical_path if critical_path else [task_ids[0]] if task_ids else []
+    def _create_parallel_groups(self, tasks: List[Dict[str, Any]], 
+                               dependencies: Dict[str, List[str]],
+                               graph: Optional[TaskGraph] = None) -> List[List[str]]:
+        """Group tasks that can be executed in parallel (Kahn layers)"""
+        layering = topological_layers([task["id"] for task in tasks], dependencies, graph)
+        if layering["cycles"]:
+            print(f"Warning: tasks in dependency cycles left unscheduled: {layering['cycles']}")
+        return layering["layers"]
     
-    def _adjust_timeline(self, state: Dict[str, Any], 
-                        dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
-        """Adjust task dates based on dependencies"""
-        from datetime import datetime, timedelta
-        
+    def _schedule_tasks(self, state: Dict[str, Any],
+                        dependencies: Dict[str, List[str]],
+                        graph: Optional[TaskGraph] = None) -> Dict[str, Any]:
+        """Propagate dates in topological order and attach CPM float/criticality to tasks.
+
+        Returns the CPM result of ``propagate_schedule`` (per-task fields,
+        ``critical_path``, ``project_duration``, ``project_start``/``project_end``).
+        """
         tasks = state.get('tasks', [])
-        task_map = {t["id"]: t for t in tasks}
+        starts = [parse_date(t["start_date"]) for t in tasks if t.get("start_date")]
+        project_start = min(starts) if starts else date.today()
         
-        # For each task, ensure it starts after its dependencies end
+        cpm = propagate_schedule(tasks, dependencies, project_start,
+                                 state.get("calendar_region"), graph)
         for task in tasks:
-            task_id = task["id"]
-            deps = dependencies.get(task_id, [])
-            
-            if deps:
-                # Find latest end date among dependencies
-                latest_end = None
-                for dep_id in deps:
-                    if dep_id in task_map:
-                        dep_task = task_map[dep_id]
-                        dep_end = datetime.strptime(dep_task["end_date"], "%Y-%m-%d")
-                        if latest_end is None or dep_end > latest_end:
-                            latest_end = dep_end
-                
-                if latest_end:
-                    # Adjust this task's start date
-                    new_start = latest_end + timedelta(days=1)
-                    
-                    # Skip weekends
-                    while new_start.weekday() >= 5:
-                        new_start += timedelta(days=1)
-                    
-                    # Calculate new end date
-                    duration_days = task.get("duration", 5)
-                    end_date = new_start
-                    days_added = 0
-                    
-                    while days_added < duration_days:
-                        end_date += timedelta(days=1)
-                        if end_date.weekday() < 5:
-                            days_added += 1
-                    
-                    task["start_date"] = new_start.strftime("%Y-%m-%d")
-                    task["end_date"] = end_date.strftime("%Y-%m-%d")
+            task.update(cpm["tasks"][task["id"]])
         
-        # Recalculate total project duration
         if tasks:
-            all_dates = []
-            for task in tasks:
-                all_dates.append(datetime.strptime(task["start_date"], "%Y-%m-%d"))
-                all_dates.append(datetime.strptime(task["end_date"], "%Y-%m-%d"))
-            
-            project_start = min(all_dates)
-            project_end = max(all_dates)
-            total_days = (project_end - project_start).days
-            
-            state["total_duration"] = total_days
-            state["project_start"] = project_start.strftime("%Y-%m-%d")
-            state["project_end"] = project_end.strftime("%Y-%m-%d")
+            state["total_duration"] = (cpm["project_end"] - cpm["project_start"]).days
+            state["project_start"] = cpm["project_start"].strftime(DATE_FORMAT)
+            state["project_end"] = cpm["project_end"].strftime(DATE_FORMAT)
         
-        return state
\ No newline at end of file
+        return cpm
@@ -0,0 +1,244 @@
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import re
+import threading
+import time
+from collections import Counter
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Project
+
+# Work stages in the order they normally happen; a task depends on the
+# closest earlier stage present in the plan
+STAGES = ["setup", "design", "schema", "auth", "api", "frontend", "feature", "test", "docs", "deploy"]
+STAGE_RANK = {stage: rank for rank, stage in enumerate(STAGES)}
+
+KEYWORDS = {
+    "setup": "setup set-up initialize initialise init scaffold bootstrap environment repository repo "
+             "install configure configuration boilerplate",
+    "design": "design architecture requirements wireframe wireframes mockup mockups research spec specification planning",
+    "schema": "schema database db model models migration migrations orm table tables postgres mysql sqlite mongodb",
+    "auth": "auth authentication authorization login logout signup sign-up register oauth jwt session sessions "
+            "permissions",
+    "api": "api apis endpoint endpoints backend back-end server rest graphql service services webhook integration",
+    "frontend": "frontend front-end ui ux interface page pages component components dashboard screen screens "
+                "react vue angular layout css",
+    "feature": "implement implementation feature features functionality logic develop",
+    "test": "test tests testing qa verify verification e2e unit integration-test coverage",
+    "docs": "document documentation docs readme guide guides manual tutorial",
+    "deploy": "deploy deployment release launch ci cd pipeline production hosting docker kubernetes monitoring",
+}
+KEYWORD_INDEX = {word: tag for tag, words in KEYWORDS.items() for word in words.split()}
+# Two-word keywords, matched as a phrase before their words count on their own
+# (so "Clean up logs" or "Follow up" is not setup work)
+PHRASES = {
+    "setup": ["set up"],
+    "auth": ["sign up", "sign in", "log in", "log out"],
+    "api": ["back end"],
+    "frontend": ["front end"],
+}
+PHRASE_INDEX = {tuple(phrase.split()): tag for tag, phrases in PHRASES.items() for phrase in phrases}
+WORD = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)?")
+
+# Generic verbs only decide the stage when nothing more specific matches
+WEAK_TAGS = {"feature"}
+
+# Stage a task falls back to when no keyword matches
+CATEGORY_STAGE = {"development": "feature", "testing": "test", "documentation": "docs", "deployment": "deploy"}
+
+# Explicit precedences that skip the "closest earlier stage" rule: (dependent, dependency) -> score
+PAIR_RULES = {
+    ("api", "schema"): 0.9,
+    ("auth", "schema"): 0.85,
+    ("frontend", "api"): 0.8,
+    ("feature", "schema"): 0.6,
+    ("test", "feature"): 0.8,
+    ("test", "api"): 0.75,
+    ("test", "frontend"): 0.75,
+    ("docs", "api"): 0.6,
+    ("deploy", "test"): 0.9,
+    ("deploy", "setup"): 0.55,
+}
+ADJACENT_STAGE_SCORE = 0.7
+EDGE_THRESHOLD = 0.5
+
+# Per-task confidence by how its stage was determined
+TAG_CONFIDENCE = {"name": 1.0, "description": 0.7, "category": 0.4}
+
+
+def keyword_tags(text: str) -> List[str]:
+    """Stage of every keyword in ``text``, phrases first"""
+    words = WORD.findall(text.lower())
+    tags = []
+    i = 0
+    while i < len(words):
+        tag = PHRASE_INDEX.get(tuple(words[i:i + 2]))
+        if tag:
+            tags.append(tag)
+            i += 2
+            continue
+        tag = KEYWORD_INDEX.get(words[i])
+        if tag:
+            tags.append(tag)
+        i += 1
+    return tags
+
+
+def tag_task(task: Dict[str, Any]) -> Tuple[str, str]:
+    """Stage of a task and how it was found (``name``, ``description`` or ``category``).
+
+    Name words count double (generic verbs single); ties go to the later
+    stage, so "API tests" is testing and "Set up database schema" is schema
+    work.
+    """
+    hits: Counter = Counter()
+    for tag in keyword_tags(task.get("name", "")):
+        hits[tag] += 1 if tag in WEAK_TAGS else 2
+    source = "name"
+    if not hits:
+        source = "description"
+        hits.update(keyword_tags(task.get("description", "")))
+    if not hits:
+        return CATEGORY_STAGE.get(task.get("category"), "feature"), "category"
+    return max(hits, key=lambda tag: (hits[tag], STAGE_RANK[tag])), source
+
+
+class CooccurrenceStats:
+    """How often, in past plans, a task of one stage depended on a task of another.
+
+    ``probability(a, b)`` is the share of plans containing both an ``a`` and a
+    ``b`` task where some ``a`` task depended on a ``b`` task. Loaded from the
+    stored projects; once older than ``ttl`` seconds it is rebuilt on a
+    background thread while the current counts keep serving.
+    """
+
+    def __init__(self, ttl: float = 3600, min_support: int = 5):
+        self.ttl = ttl
+        self.min_support = min_support
+        self.loaded_at: Optional[float] = None
+        self.edges: Counter = Counter()
+        self.pairs: Counter = Counter()
+        self.projects = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def learn(self, tasks: List[Dict[str, Any]]):
+        tags = {task["id"]: tag_task(task)[0] for task in tasks if "id" in task}
+        present = set(tags.values())
+        self.pairs.update((a, b) for a in present for b in present if a != b)
+        self.edges.update({
+            (tags[task["id"]], tags[dep])
+            for task in tasks if task.get("id") in tags
+            for dep in task.get("dependencies", []) if dep in tags and tags[dep] != tags[task["id"]]
+        })
+        self.projects += 1
+
+    def refresh(self):
+        """Rebuild from the stored projects; on any DB error keep what we have"""
+        self.loaded_at = time.monotonic()
+        db = SessionLocal()
+        try:
+            rows = db.query(Project.tasks).order_by(Project.id.desc()).limit(settings.DEPENDENCY_RULES_HISTORY).all()
+        except Exception as e:
+            print(f"Warning: dependency co-occurrence stats unavailable: {e}")
+            return
+        finally:
+            db.close()
+        fresh = CooccurrenceStats(self.ttl, self.min_support)
+        for (raw,) in rows:
+            try:
+                fresh.learn(json.loads(raw or "[]"))
+            except (TypeError, ValueError):
+                continue
+        self.edges, self.pairs, self.projects = fresh.edges, fresh.pairs, fresh.projects
+
+    def ensure_fresh(self):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at <= self.ttl:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            self.loaded_at = time.monotonic()
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def probability(self, dependent: str, dependency: str) -> Optional[float]:
+        support = self.pairs[(dependent, dependency)]
+        if support < self.min_support:
+            return None
+        return self.edges[(dependent, dependency)] / support
+
+
+cooccurrence_stats = CooccurrenceStats()
+
+
+def infer_dependencies(tasks: List[Dict[str, Any]],
+                       stats: Optional[CooccurrenceStats] = None) -> Dict[str, Any]:
+    """Deterministic dependency graph from task text, category and past plans.
+
+    Each task depends on the closest earlier stage in the plan, plus any
+    earlier stage covered by ``PAIR_RULES``; learned
+    co-occurrence probabilities are averaged into the rule score when there
+    is enough support, and can add edges the rules miss. Edges scoring below
+    ``EDGE_THRESHOLD`` are dropped. Only edges to earlier stages are created,
+    so the result is acyclic.
+
+    A task depends on every task of each stage it links to. Stage links
+    implied through another linked stage (``test -> api`` when ``test ->
+    frontend -> api``) are left out: every task of the middle stage already
+    depends on every task of the earlier one, so reachability, leveling and
+    what-if results are unchanged.
+
+    Returns ``dependencies``, per-edge ``scores`` keyed ``"task->dep"``, the
+    ``stages`` assigned and an overall ``confidence`` in [0, 1].
+    """
+    tagged = [(task["id"], *tag_task(task)) for task in tasks]
+    by_stage: Dict[str, List[str]] = {}
+    for task_id, stage, _ in tagged:
+        by_stage.setdefault(stage, []).append(task_id)
+    present = sorted(by_stage, key=STAGE_RANK.get)
+
+    # Scores depend only on the stage pair, so links are decided per stage,
+    # earliest first, with each stage's transitive upstream set alongside
+    stage_links: Dict[str, Dict[str, float]] = {}
+    upstream: Dict[str, set] = {}
+    for i, stage in enumerate(present):
+        earlier = present[:i]
+        linked = {}
+        for dep_stage in earlier:
+            score = PAIR_RULES.get((stage, dep_stage), 0.0)
+            if dep_stage == earlier[-1]:
+                score = max(score, ADJACENT_STAGE_SCORE)
+            learned = stats.probability(stage, dep_stage) if stats else None
+            if learned is not None:
+                score = (score + learned) / 2 if score else learned
+            if score >= EDGE_THRESHOLD:
+                linked[dep_stage] = score
+        upstream[stage] = set(linked).union(*(upstream[d] for d in linked))
+        implied = set().union(*(upstream[d] for d in linked))
+        stage_links[stage] = {d: score for d, score in linked.items() if d not in implied}
+
+    dependencies: Dict[str, List[str]] = {}
+    scores: Dict[str, float] = {}
+    for task_id, stage, _ in tagged:
+        deps = []
+        for dep_stage, score in stage_links[stage].items():
+            for dep in by_stage[dep_stage]:
+                deps.append(dep)
+                scores[f"{task_id}->{dep}"] = round(score, 3)
+        dependencies[task_id] = deps
+
+    confidence = sum(TAG_CONFIDENCE[source] for _, _, source in tagged) / len(tagged) if tagged else 0.0
+    return {
+        "dependencies": dependencies,
+        "scores": scores,
+        "stages": {task_id: stage for task_id, stage, _ in tagged},
+        "confidence": round(confidence, 3),
+    }
@@ -0,0 +1,94 @@
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from app.agents.dependency_rules import STAGE_RANK, tag_task
+from app.scheduling.cycles import repair_cycles
+
+Edge = Tuple[str, str]  # (task, dependency)
+
+
+def make_windows(tasks: List[Dict[str, Any]], size: int, overlap: int) -> List[List[Dict[str, Any]]]:
+    """Overlapping windows of at most ``size`` tasks, clustered by topic.
+
+    Tasks are ordered by work stage (see ``tag_task``), then plan order, so
+    a window holds related tasks and neighbouring windows hold the adjacent
+    stages most dependencies point to. Consecutive windows share ``overlap``
+    tasks so edges across a window boundary are still seen together.
+    """
+    if len(tasks) <= size:
+        return [list(tasks)]
+    position = {task["id"]: i for i, task in enumerate(tasks)}
+    ordered = sorted(tasks, key=lambda task: (STAGE_RANK[tag_task(task)[0]], position[task["id"]]))
+    step = max(1, size - overlap)
+    windows = []
+    for start in range(0, len(ordered), step):
+        windows.append(ordered[start:start + size])
+        if start + size >= len(ordered):
+            break
+    return windows
+
+
+def merge_window_graphs(order: List[str], windows: List[List[str]],
+                        results: List[Optional[Dict[str, List[str]]]],
+                        fallback: Optional[Dict[str, List[str]]] = None
+                        ) -> Tuple[Dict[str, List[str]], Dict[str, Any]]:
+    """One consistent graph from per-window dependency graphs.
+
+    ``windows`` are the task ids of each window and ``results`` its graph
+    (None for a window whose analysis failed). A pair of tasks seen together
+    in several windows is decided by vote: ``a -> b`` is kept when at least
+    half of those windows report it and it outvotes ``b -> a`` (a tie goes
+    to the direction that follows plan order). ``fallback`` edges (e.g. the
+    rule engine's) fill in pairs no successful window ever contained. Cycles
+    formed across windows are repaired, weakest vote share first. Returns
+    the dependencies and merge statistics.
+    """
+    position = {task_id: i for i, task_id in enumerate(order)}
+    seen: Counter = Counter()
+    votes: Counter = Counter()
+    for members, result in zip(windows, results):
+        if result is None:
+            continue
+        members = sorted(set(members), key=position.get)
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                seen[(a, b)] += 1
+        for task_id, deps in result.items():
+            for dep in deps:
+                votes[(task_id, dep)] += 1
+
+    def pair(a: str, b: str) -> Edge:
+        return (a, b) if position[a] < position[b] else (b, a)
+
+    dependencies: Dict[str, List[str]] = {task_id: [] for task_id in order}
+    confidence: Dict[Edge, float] = {}
+    conflicts = 0
+    for (task_id, dep), count in votes.items():
+        if task_id == dep or task_id not in position or dep not in position:
+            continue
+        support = seen[pair(task_id, dep)]
+        against = votes[(dep, task_id)]
+        if against:
+            conflicts += 1
+        if count * 2 < support or count < against:
+            continue
+        if count == against and position[dep] > position[task_id]:
+            continue
+        dependencies[task_id].append(dep)
+        confidence[(task_id, dep)] = count / support
+
+    filled = 0
+    for task_id, deps in (fallback or {}).items():
+        for dep in deps:
+            if task_id in dependencies and dep in position and not seen[pair(task_id, dep)]:
+                dependencies[task_id].append(dep)
+                confidence[(task_id, dep)] = 0.5
+                filled += 1
+
+    dependencies, removed = repair_cycles(order, dependencies, confidence)
+    return dependencies, {
+        "windows": len(windows),
+        "failed_windows": sum(result is None for result in results),
+        "conflicts": conflicts // 2,
+        "fallback_edges": filled,
+        "cycle_edges_removed": len(removed),
+    }
@@ -62,14 +62,15 @@ class FormatterAgent(BaseAgent):
                 start_date = task.get('start_date', '')
                 duration = int(task.get('duration', 1))
                 deps = task.get('dependencies', [])
+                tags = "crit, " if task.get('is_critical') else ""
                 
                 if deps:
                     # Task with dependencies
                     deps_str = ', '.join(deps)
-                    gantt += f"    {task_name} ({task_id}) :{task_id}, after {deps[0]}, {duration}d\n"
+                    gantt += f"    {task_name} ({task_id}) :{tags}{task_id}, after {deps[0]}, {duration}d\n"
                 else:
                     # Task without dependencies
-                    gantt += f"    {task_name} ({task_id}) :{task_id}, {start_date}, {duration}d\n"
+                    gantt += f"    {task_name} ({task_id}) :{tags}{task_id}, {start_date}, {duration}d\n"
         
         gantt += "```\n"
         return gantt
@@ -84,11 +85,15 @@ class FormatterAgent(BaseAgent):
                 "start_date": state.get('project_start', ''),
                 "end_date": state.get('project_end', ''),
             },
+            "epics": state.get('epics', []),
             "tasks": state.get('tasks', []),
             "dependencies": state.get('dependencies', {}),
             "execution_plan": {
                 "parallel_groups": state.get('parallel_groups', []),
                 "critical_path": state.get('critical_path', []),
+                "schedule_analysis": state.get('schedule_analysis', {}),
+                "resource_schedule": state.get('resource_schedule', {}),
+                "schedule_risk": state.get('schedule_risk', {}),
             },
             "statistics": {
                 "total_tasks": len(state.get('tasks', [])),
@@ -108,7 +113,8 @@ class FormatterAgent(BaseAgent):
         # Write headers
         headers = [
             'ID', 'Name', 'Description', 'Category', 'Complexity',
-            'Duration (days)', 'Start Date', 'End Date', 'Dependencies'
+            'Duration (days)', 'Start Date', 'End Date', 'Dependencies',
+            'Total Float (days)', 'Free Float (days)', 'Critical'
         ]
         writer.writerow(headers)
         
@@ -123,7 +129,10 @@ class FormatterAgent(BaseAgent):
                 task.get('duration', ''),
                 task.get('start_date', ''),
                 task.get('end_date', ''),
-                ', '.join(task.get('dependencies', []))
+                ', '.join(task.get('dependencies', [])),
+                task.get('total_float', ''),
+                task.get('free_float', ''),
+                'yes' if task.get('is_critical') else 'no'
             ]
             writer.writerow(row)
         
@@ -189,10 +198,18 @@ class FormatterAgent(BaseAgent):
                 "category": task['category'],
                 "complexity": task['complexity'],
                 "duration": task.get('duration', 0),
+                "critical": task.get('is_critical', False),
+                "total_float": task.get('total_float'),
                 "x": (i % 4) * 150,  # Simple grid layout
                 "y": (i // 4) * 100
             })
         
+        # Edges between consecutive critical-path tasks are highlighted
+        critical_path = state.get('critical_path', [])
+        critical_edges = {}
+        for prev, nxt in zip(critical_path, critical_path[1:]):
+            critical_edges.setdefault(nxt, set()).add(prev)
+        
         # Create edges
         edges = []
         edge_id = 0
@@ -202,7 +219,8 @@ class FormatterAgent(BaseAgent):
                     "id": f"edge_{edge_id}",
                     "source": dep,
                     "target": task_id,
-                    "label": "depends on"
+                    "label": "depends on",
+                    "critical": dep in critical_edges.get(task_id, ())
                 })
                 edge_id += 1
         
@@ -218,6 +236,7 @@ class FormatterAgent(BaseAgent):
         total_duration = state.get('total_duration', 0)
         critical_path = state.get('critical_path', [])
         parallel_groups = state.get('parallel_groups', [])
+        critical_days = state.get('schedule_analysis', {}).get('project_duration_days', 0)
         
         summary = f"""## Executive Summary
 
@@ -227,7 +246,7 @@ class FormatterAgent(BaseAgent):
 - Number of Tasks: {len(tasks)}
 
 **Key Metrics**
-- Critical Path Length: {len(critical_path)} tasks
+- Critical Path Length: {len(critical_path)} tasks ({critical_days} working days)
 - Parallel Execution Phases: {len(parallel_groups)}
 - Average Task Duration: {sum(t.get('duration', 0) for t in tasks) / max(len(tasks), 1):.1f} days
 
@@ -254,6 +273,21 @@ class FormatterAgent(BaseAgent):
         if len(critical_path) > len(tasks) * 0.7:
             summary += "- Long critical path (limited parallelization)\n"
         
+        risk = state.get('schedule_risk')
+        if risk:
+            p50, p80, p95 = (risk['percentiles'][p] for p in ('p50', 'p80', 'p95'))
+            summary += (f"- Completion estimate: 50% by {p50['date']}, 80% by {p80['date']}, "
+                        f"95% by {p95['date']} ({risk['iterations']} simulations)\n")
+        
+        leveling = state.get('resource_schedule')
+        if leveling and leveling['delay_days'] > 0:
+            summary += (f"- Team capacity adds {leveling['delay_days']} working days "
+                        f"({leveling['unconstrained_makespan_days']} → {leveling['makespan_days']})\n")
+        
+        near_critical = [t for t in tasks if not t.get('is_critical') and t.get('total_float', 99) <= 2]
+        if near_critical:
+            summary += f"- {len(near_critical)} near-critical tasks with 2 or fewer days of float\n"
+        
         # Recommendations
         summary += "\n**Recommendations**\n"
         if len(parallel_groups) > 1:
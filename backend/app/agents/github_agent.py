@@ -1,40 +1,26 @@
 from typing import Dict, Any
-import json
 from app.agents.base_agent import BaseAgent
+from app.agents.prompt_builder import PromptBuilder
+from app.agents.prompts import GITHUB
 
 class GitHubAgent(BaseAgent):
     def __init__(self):
         super().__init__("GitHub Agent")
-        self.prompt_template = """
-You are a GitHub repository architecture expert. Design the optimal repository structure.
-
-Project: {project_description}
-Tasks: {tasks}
-Tech Stack: {tech_stack}
-
-Provide:
-1. repository_structure: Folder hierarchy with key files
-2. branch_strategy: Branch naming and workflow (gitflow/github-flow)
-3. ci_cd_pipeline: GitHub Actions workflow configuration
-4. protection_rules: Branch protection settings
-5. team_permissions: Access control recommendations
-6. documentation_structure: Where to place different docs
-7. commit_conventions: Commit message format
-8. pr_template: Pull request template
-
-Return ONLY a JSON object with GitHub configuration.
-"""
 
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        # Generate GitHub-specific configuration
-        prompt = self.prompt_template.format(
-            project_description=state.get('project_description'),
-            tasks=json.dumps(state.get('tasks', [])),
-            tech_stack=json.dumps(state.get('technology_stack', {}))
-        )
+        # Generate GitHub-specific configuration; repo layout only needs task names/categories
+        builder = PromptBuilder("GitHub Agent")
+        values = {
+            "project_description": state.get('project_description'),
+            "tasks": builder.tasks_context(state.get('tasks', []), fields=("id", "name", "category")),
+            "tech_stack": builder.json_context("tech_stack", state.get('technology_stack', {}))
+        }
+        builder.log_report()
         
-        response = await self.llm.apredict(prompt)
-        github_config = json.loads(response.strip())
+        github_config = await self.ainvoke_json(
+            GITHUB.messages(**values),
+            cache_key=GITHUB.cache_key(self.model_name, **values)
+        )
         state['github_configuration'] = github_config
         
         return state
\ No newline at end of file
@@ -1,41 +1,73 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import aclosing
+import asyncio
 import json
 from app.agents.base_agent import BaseAgent
+from app.agents.prompts import EPIC_PLANNER, EPIC_TASKS, PLANNER, PLANNER_REPAIR
+from app.agents.validation import validate_epics, validate_tasks
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.json_stream import IncrementalJSONParser
 
 class PlannerAgent(BaseAgent):
     def __init__(self):
         super().__init__("Planner")
         
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = f"""
-        Break down this project into 5-8 specific tasks:
-        "{state['description']}"
+        if (state.get("planning_mode") or settings.PLANNING_MODE) == "hierarchical":
+            try:
+                return await self._plan_hierarchical(state)
+            except Exception as e:
+                print(f"Hierarchical planning failed, using a flat plan: {e}")
         
-        Return a JSON array with tasks, each having:
-        - id: (task_1, task_2, etc.)
-        - name: (short descriptive name)
-        - description: (1-2 sentences)
-        - category: (development/testing/documentation/deployment)
-        - complexity: (low/medium/high)
+        prompt = PLANNER.messages(description=state['description'])
+        # Keyed by the model that produced the plan; the winning attempt's key is stored
+        attempt = {}
         
-        Example:
-        [{{"id": "task_1", "name": "Setup Environment", "description": "Initialize project", "category": "development", "complexity": "low"}}]
-        
-        Return ONLY the JSON array, no other text.
-        """
+        async def generate(llm) -> List[Dict[str, Any]]:
+            attempt["cache_key"] = PLANNER.cache_key(self.model_for(llm), description=state['description'])
+            cached = response_cache.get(attempt["cache_key"])
+            if cached is not None:
+                print(f"[{self.name}] response cache hit")
+                return cached
+            
+            parser = IncrementalJSONParser("tasks", tolerant=True)
+            items = []
+            stream = self.astream_json_items(prompt, items_key="tasks", llm=llm, parser=parser)
+            async with aclosing(stream):
+                async for item in stream:
+                    items.append(item)
+                    if len(items) >= 8:  # Limit to 8 tasks, stop generating early
+                        break
+            
+            # Keep every valid task; only the broken entries go back to the model.
+            # Entries are keyed by stream position so repaired tasks keep their place.
+            skipped = {index for index, _, _ in parser.errors}
+            positions = [i for i in range(len(items) + len(skipped)) if i not in skipped]
+            tasks, invalid = validate_tasks(items)
+            bad = {index for index, _, _ in invalid}
+            placed = list(zip([positions[i] for i in range(len(items)) if i not in bad], tasks))
+            
+            broken = list(parser.errors)
+            broken += [(positions[index], json.dumps(item), error) for index, item, error in invalid]
+            if parser.fragment and len(items) < 8:
+                broken.append((len(positions) + len(skipped), parser.fragment,
+                               "response was cut off inside this task"))
+            broken.sort(key=lambda entry: entry[0])
+            
+            if broken and len(tasks) < 8:
+                repaired = await self._repair_tasks([(raw, error) for _, raw, error in broken], tasks, llm)
+                placed += [(broken[entry][0], task) for entry, task in repaired.items()]
+            
+            placed.sort(key=lambda entry: entry[0])
+            return [task for _, task in placed][:8]
         
         try:
-            message = await self.llm.ainvoke(prompt)
-            response = message.content
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
-            
-            tasks = json.loads(response.strip())
-            state['tasks'] = tasks[:8]  # Limit to 8 tasks
+            tasks = await self.run_cascade(state['description'], generate, self._validate_tasks)
+            if not tasks:
+                raise ValueError("Planner returned no tasks")
+            response_cache.set(attempt["cache_key"], tasks)
+            state['tasks'] = tasks
             
         except Exception as e:
             print(f"Error in planner: {e}")
@@ -64,4 +96,169 @@ class PlannerAgent(BaseAgent):
                 }
             ]
         
-        return state
\ No newline at end of file
+        return state
+    
+    async def _plan_hierarchical(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Plan epics, then decompose every epic concurrently and merge the results.
+
+        Each decomposition is an independent call, so wall-clock time is
+        about two calls regardless of plan size; at most
+        ``PLANNER_EPIC_CONCURRENCY`` run at once (the per-model limiter still
+        applies on top). Tasks are renumbered globally and tagged with their
+        epic; the decomposition's dependencies are kept as the intra-epic
+        graph and ``state["epics"]`` carries the epic-level ordering.
+        """
+        description = state['description']
+        epics = await self._plan_epics(description)
+        
+        semaphore = asyncio.Semaphore(settings.PLANNER_EPIC_CONCURRENCY)
+        
+        async def decompose(epic: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._decompose_epic(description, epic)
+                except Exception as e:
+                    # One bad epic should not sink the plan: keep it as a single task
+                    print(f"Decomposing {epic['id']} failed: {e}")
+                    return [{
+                        "id": "task_1", "name": epic["name"], "description": epic["description"],
+                        "category": "development", "complexity": "high", "dependencies": [],
+                    }]
+        
+        decomposed = await asyncio.gather(*(decompose(epic) for epic in epics))
+        
+        tasks = []
+        for epic, epic_tasks in zip(epics, decomposed):
+            local = {task["id"]: f"task_{len(tasks) + i + 1}" for i, task in enumerate(epic_tasks)}
+            for task in epic_tasks:
+                task["dependencies"] = [local[d] for d in task["dependencies"] if d in local]
+                task["id"] = local[task["id"]]
+                task["epic"] = epic["id"]
+            epic["tasks"] = [task["id"] for task in epic_tasks]
+            tasks.extend(epic_tasks)
+        
+        print(f"Hierarchical plan: {len(epics)} epics, {len(tasks)} tasks")
+        state['tasks'] = tasks
+        state['epics'] = epics
+        return state
+    
+    async def _plan_epics(self, description: str) -> List[Dict[str, Any]]:
+        max_epics = settings.PLANNER_MAX_EPICS
+        prompt = EPIC_PLANNER.messages(description=description, max_epics=max_epics)
+        
+        def validate(document: Any) -> Optional[str]:
+            epics, invalid = validate_epics(document.get("epics", []) if isinstance(document, dict) else [])
+            if len(epics) < 2:
+                reason = f" ({invalid[0][2]})" if invalid else ""
+                return f"expected at least 2 valid epics, got {len(epics)}{reason}"
+            return None
+        
+        document = await self.run_cascade(
+            description,
+            lambda llm: self.ainvoke_json(
+                prompt, items_key="epics", llm=llm,
+                cache_key=EPIC_PLANNER.cache_key(self.model_for(llm), description=description,
+                                                 max_epics=max_epics),
+            ),
+            validate,
+        )
+        epics, invalid = validate_epics(document.get("epics", []))
+        if invalid:
+            print(f"Warning: dropped {len(invalid)} malformed epic(s)")
+        if not epics:
+            raise ValueError("Epic planner returned no epics")
+        return epics[:max_epics]
+    
+    async def _decompose_epic(self, description: str, epic: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Tasks of one epic with local ids and dependencies on tasks of the same epic"""
+        values = dict(description=description, epic_name=epic["name"],
+                      epic_description=epic["description"], max_tasks=settings.PLANNER_TASKS_PER_EPIC)
+        prompt = EPIC_TASKS.messages(**values)
+        
+        def validate(document: Any) -> Optional[str]:
+            tasks, invalid = validate_tasks(document.get("tasks", []) if isinstance(document, dict) else [])
+            if invalid and not tasks:
+                return f"malformed tasks: {invalid[0][2]}"
+            if not tasks:
+                return "no tasks"
+            return None
+        
+        document = await self.run_cascade(
+            epic["name"] + " " + epic["description"],
+            lambda llm: self.ainvoke_json(
+                prompt, items_key="tasks", llm=llm,
+                cache_key=EPIC_TASKS.cache_key(self.model_for(llm), **values),
+            ),
+            validate,
+        )
+        items = document.get("tasks", [])
+        tasks, invalid = validate_tasks(items)
+        if invalid:
+            print(f"Warning: dropped {len(invalid)} malformed task(s) in {epic['id']}")
+        if not tasks:
+            # The escalated output is returned unvalidated; let the caller fall back
+            raise ValueError(f"no valid tasks for {epic['id']}")
+        
+        # PlannedTask ignores the dependency field; read it from the raw items
+        raw_dependencies = {}
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("dependencies"), list):
+                raw_id = item.get("id", item.get("task_id"))
+                raw_id = f"task_{raw_id}" if isinstance(raw_id, int) else raw_id
+                raw_dependencies[raw_id] = [
+                    f"task_{d}" if isinstance(d, int) else d for d in item["dependencies"]
+                ]
+        
+        tasks = list({task["id"]: task for task in tasks}.values())[:settings.PLANNER_TASKS_PER_EPIC]
+        ids = {task["id"] for task in tasks}
+        for task in tasks:
+            task["dependencies"] = [
+                d for d in dict.fromkeys(raw_dependencies.get(task["id"], [])) if d in ids and d != task["id"]
+            ]
+        return tasks
+    
+    async def _repair_tasks(self, broken: List[Tuple[str, str]],
+                            tasks: List[Dict[str, Any]], llm) -> Dict[int, Dict[str, Any]]:
+        """Ask the model to fix only the malformed task entries.
+
+        Returns repaired tasks keyed by their index in ``broken``, matched on
+        the entry number the model echoes back (never on response order).
+        Entries without a valid number, repeats of an entry, and tasks
+        whose id is taken or already used by another repair are dropped.
+        """
+        entries = "\n".join(f"{i + 1}. {raw[:500]} (problem: {error})" for i, (raw, error) in enumerate(broken))
+        taken = ", ".join(t["id"] for t in tasks) or "none"
+        prompt = PLANNER_REPAIR.messages(entries=entries, taken=taken)
+        
+        try:
+            response = await self.ainvoke_json(prompt, llm=llm)
+            items = response.get("tasks", [])
+            items = items if isinstance(items, list) else []
+        except Exception as e:
+            print(f"Task repair failed: {e}")
+            return {}
+        
+        used_ids = {t["id"] for t in tasks}
+        repaired: Dict[int, Dict[str, Any]] = {}
+        for item in items:
+            entry = item.get("entry") if isinstance(item, dict) else None
+            entry = int(entry) if isinstance(entry, str) and entry.strip().isdigit() else entry
+            if not isinstance(entry, int) or not 1 <= entry <= len(broken) or entry - 1 in repaired:
+                continue
+            valid, _ = validate_tasks([item])
+            if valid and valid[0]["id"] not in used_ids:
+                used_ids.add(valid[0]["id"])
+                repaired[entry - 1] = valid[0]
+        print(f"Repaired {len(repaired)} of {len(broken)} malformed task(s)")
+        return repaired
+    
+    def _validate_tasks(self, tasks: List[Dict[str, Any]]) -> Optional[str]:
+        """Return why a generated task list is unusable, or None if it is valid"""
+        if not 3 <= len(tasks) <= 8:
+            return f"expected 3-8 valid tasks, got {len(tasks)}"
+        
+        ids = [task["id"] for task in tasks]
+        if len(set(ids)) != len(ids):
+            return "duplicate task ids"
+        
+        return None
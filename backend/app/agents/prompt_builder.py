@@ -0,0 +1,120 @@
+from typing import Dict, Any, List, Optional, Sequence
+import json
+import re
+from app.core.config import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_encoder = None
+
+
+def _get_encoder():
+    """Load tiktoken lazily if installed; fall back to a regex estimate"""
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = False
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """Estimate tokens with a local tokenizer (no network round trip).
+
+    cl100k_base matches OpenAI models; for other providers (the Groq/Llama
+    default) it is an approximation, and without tiktoken installed the
+    regex fallback is rougher still. Budgets built on this are estimates.
+    """
+    encoder = _get_encoder()
+    if encoder:
+        return len(encoder.encode(text))
+    # Words longer than ~4 chars usually split into several BPE tokens
+    return sum(max(1, len(piece) // 4) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def compact_json(data: Any) -> str:
+    """Serialize without indentation or spaces after separators"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut text at a word boundary, marking the cut with an ellipsis"""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+    cut = text[:max_chars].rsplit(" ", 1)[0] or text[:max_chars]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+class PromptBuilder:
+    """Build compact prompt context for a pipeline stage within an estimated token budget"""
+
+    # Description lengths tried in order until the context fits the budget
+    DESCRIPTION_STEPS = (240, 120, 60, 0)
+
+    def __init__(self, stage: str, budget: Optional[int] = None):
+        self.stage = stage
+        self.budget = budget or settings.PROMPT_TOKEN_BUDGET
+        self.report: Dict[str, Any] = {}
+
+    def tasks_context(self, tasks: List[Dict[str, Any]], fields: Sequence[str],
+                      baseline_fields: Optional[Sequence[str]] = None,
+                      baseline_indent: Optional[int] = None) -> str:
+        """Minified task list holding only ``fields``, shortened to fit the budget.
+
+        Savings are measured against the stage's previous serialization:
+        ``json.dumps`` of ``baseline_fields`` (every field when None) with
+        ``baseline_indent``.
+        """
+        selected = [{f: task[f] for f in fields if f in task} for task in tasks]
+        previous = tasks if baseline_fields is None else [
+            {f: task[f] for f in baseline_fields if f in task} for task in tasks
+        ]
+        baseline = count_tokens(json.dumps(previous, indent=baseline_indent))
+
+        text = compact_json(selected)
+        tokens = count_tokens(text)
+        truncated_to = None
+
+        if tokens > self.budget and "description" in fields:
+            for max_chars in self.DESCRIPTION_STEPS:
+                shortened = []
+                for task in selected:
+                    task = dict(task)
+                    if max_chars:
+                        task["description"] = truncate_text(task.get("description", ""), max_chars)
+                    else:
+                        task.pop("description", None)
+                    shortened.append(task)
+                text = compact_json(shortened)
+                tokens = count_tokens(text)
+                truncated_to = max_chars
+                if tokens <= self.budget:
+                    break
+
+        self._record("tasks", baseline, tokens, truncated_to)
+        return text
+
+    def json_context(self, name: str, data: Any, baseline_indent: Optional[int] = None) -> str:
+        """Minified JSON for auxiliary context (tech stack, config), measured against ``json.dumps`` with ``baseline_indent``"""
+        text = compact_json(data)
+        self._record(name, count_tokens(json.dumps(data, indent=baseline_indent)), count_tokens(text))
+        return text
+
+    def log_report(self):
+        saved = sum(r["tokens_saved"] for r in self.report.values())
+        used = sum(r["tokens"] for r in self.report.values())
+        over = " (over budget)" if used > self.budget else ""
+        print(f"[{self.stage}] prompt context: {used} tokens, {saved} saved{over}")
+
+    def _record(self, name: str, baseline: int, tokens: int,
+                truncated_to: Optional[int] = None):
+        self.report[name] = {
+            "tokens": tokens,
+            "baseline_tokens": baseline,
+            "tokens_saved": max(baseline - tokens, 0),
+            "descriptions_truncated_to": truncated_to,
+        }
+
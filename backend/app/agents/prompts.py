@@ -0,0 +1,208 @@
+from typing import Any, List
+import hashlib
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+class PromptTemplate:
+    """A prompt split into a static, versioned system prefix and a per-request user part.
+
+    Everything that does not change between requests (instructions, rules,
+    examples) lives in ``system`` so it forms a byte-identical prefix that
+    provider-side prompt caching can reuse. Bump ``version`` whenever the
+    text changes so cached responses keyed on it are invalidated.
+    """
+
+    def __init__(self, name: str, version: str, system: str, user: str):
+        self.name = name
+        self.version = version
+        self.system = system.strip()
+        self.user = user.strip()
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.version}"
+
+    def render(self, **values: Any) -> str:
+        return self.user.format(**values)
+
+    def messages(self, **values: Any) -> List[BaseMessage]:
+        return [SystemMessage(content=self.system), HumanMessage(content=self.render(**values))]
+
+    def cache_key(self, model: str, **values: Any) -> str:
+        """Key for local response caching: template version, model and rendered input"""
+        digest = hashlib.sha256(self.render(**values).encode("utf-8")).hexdigest()
+        return f"{self.key}:{model}:{digest}"
+
+
+PLANNER = PromptTemplate(
+    name="planner",
+    version="v1",
+    system="""
+You are a project planner. Break the project the user describes into 5-8 specific tasks.
+
+Return a JSON object with a "tasks" array, each task having:
+- id: (task_1, task_2, etc.)
+- name: (short descriptive name)
+- description: (1-2 sentences)
+- category: (development/testing/documentation/deployment)
+- complexity: (low/medium/high)
+
+Example:
+{"tasks": [{"id": "task_1", "name": "Setup Environment", "description": "Initialize project", "category": "development", "complexity": "low"}]}
+
+Return ONLY the JSON object, no other text.
+""",
+    user='Project: "{description}"',
+)
+
+PLANNER_REPAIR = PromptTemplate(
+    name="planner_repair",
+    version="v2",
+    system="""
+You fix malformed task entries from a project plan. The user lists each malformed
+entry with its number and its problem.
+
+Return a JSON object {"tasks": [...]} with one corrected entry per malformed entry,
+completing any entry that was cut off. Each task needs exactly these fields:
+entry (the number of the malformed entry it fixes), id, name, description,
+category (development/testing/documentation/deployment), complexity (low/medium/high).
+Never reuse an id the user lists as taken, and never give two tasks the same id.
+
+Return ONLY the JSON object, no other text.
+""",
+    user="""
+Malformed entries:
+{entries}
+
+Taken ids: {taken}
+""",
+)
+
+EPIC_PLANNER = PromptTemplate(
+    name="epic_planner",
+    version="v1",
+    system="""
+You are a program planner. Break the project the user describes into epics: large,
+self-contained bodies of work that are each later split into tasks. The user gives
+the maximum number of epics.
+
+Return a JSON object with an "epics" array, each epic having:
+- id: (epic_1, epic_2, etc.)
+- name: (short descriptive name)
+- description: (1-2 sentences on the scope of the epic)
+- dependencies: (ids of epics that must finish before this one starts; [] if none)
+
+Example:
+{"epics": [{"id": "epic_1", "name": "Platform Foundation", "description": "Repository, CI and base infrastructure", "dependencies": []}, {"id": "epic_2", "name": "User Accounts", "description": "Registration, login and profiles", "dependencies": ["epic_1"]}]}
+
+Return ONLY the JSON object, no other text.
+""",
+    user="""
+Project: "{description}"
+Maximum epics: {max_epics}
+""",
+)
+
+EPIC_TASKS = PromptTemplate(
+    name="epic_tasks",
+    version="v1",
+    system="""
+You are a project planner. Break one epic of a larger project into specific tasks.
+The user gives the project, the epic and the maximum number of tasks.
+
+Return a JSON object with a "tasks" array, each task having:
+- id: (task_1, task_2, etc., numbered within this epic)
+- name: (short descriptive name)
+- description: (1-2 sentences)
+- category: (development/testing/documentation/deployment)
+- complexity: (low/medium/high)
+- dependencies: (ids of tasks in this list that must finish first; [] if none)
+
+Only reference tasks of this epic in dependencies; ordering between epics is handled
+separately.
+
+Example:
+{"tasks": [{"id": "task_1", "name": "Design Schema", "description": "Model users and sessions", "category": "development", "complexity": "medium", "dependencies": []}, {"id": "task_2", "name": "Login Endpoint", "description": "Password login returning a token", "category": "development", "complexity": "medium", "dependencies": ["task_1"]}]}
+
+Return ONLY the JSON object, no other text.
+""",
+    user="""
+Project: "{description}"
+Epic: {epic_name} - {epic_description}
+Maximum tasks: {max_tasks}
+""",
+)
+
+DEPENDENCY = PromptTemplate(
+    name="dependency",
+    version="v1",
+    system="""
+Analyze the project tasks the user provides and identify dependencies between them.
+
+Rules for dependencies:
+1. Setup/initialization tasks usually have no dependencies
+2. Core development tasks depend on setup tasks
+3. Testing tasks depend on development tasks
+4. Deployment depends on testing
+5. Documentation can often be done in parallel with development
+6. Tasks in the same category might have dependencies if one builds on another
+
+Return a JSON object with:
+{
+    "dependencies": {
+        "task_id": ["list", "of", "dependent", "task_ids"],
+        ...
+    },
+    "parallel_groups": [
+        ["task_ids", "that", "can", "run", "together"],
+        ...
+    ],
+    "critical_path": ["ordered", "list", "of", "task_ids", "forming", "longest", "path"]
+}
+
+Example:
+{
+    "dependencies": {
+        "task_1": [],
+        "task_2": ["task_1"],
+        "task_3": ["task_1"],
+        "task_4": ["task_2", "task_3"]
+    },
+    "parallel_groups": [
+        ["task_1"],
+        ["task_2", "task_3"],
+        ["task_4"]
+    ],
+    "critical_path": ["task_1", "task_2", "task_4"]
+}
+
+Return ONLY the JSON object, no other text.
+""",
+    user="Tasks: {tasks}",
+)
+
+GITHUB = PromptTemplate(
+    name="github",
+    version="v1",
+    system="""
+You are a GitHub repository architecture expert. Design the optimal repository structure
+for the project the user describes.
+
+Provide:
+1. repository_structure: Folder hierarchy with key files
+2. branch_strategy: Branch naming and workflow (gitflow/github-flow)
+3. ci_cd_pipeline: GitHub Actions workflow configuration
+4. protection_rules: Branch protection settings
+5. team_permissions: Access control recommendations
+6. documentation_structure: Where to place different docs
+7. commit_conventions: Commit message format
+8. pr_template: Pull request template
+
+Return ONLY a JSON object with GitHub configuration.
+""",
+    user="""
+Project: {project_description}
+Tasks: {tasks}
+Tech Stack: {tech_stack}
+""",
+)
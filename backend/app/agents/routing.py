@@ -0,0 +1,52 @@
+from typing import Dict, Any
+import re
+from app.core.config import settings
+
+# Phrases that signal a project is too involved for the small model
+COMPLEX_SIGNALS = re.compile(
+    r"\b(microservices?|distributed|multi[- ]tenant|real[- ]time|compliance|hipaa|"
+    r"gdpr|migration|machine learning|kubernetes|blockchain|payments?|"
+    r"high availability|scal(?:e|able|ability))\b",
+    re.IGNORECASE,
+)
+
+FAST = "fast"
+LARGE = "large"
+
+
+def choose_tier(text: str, item_count: int = 0) -> str:
+    """Pick the model tier for an input: short, plain inputs go to the fast model"""
+    if not settings.ROUTING_ENABLED:
+        return LARGE
+    if len(text) > settings.ROUTING_MAX_SIMPLE_CHARS:
+        return LARGE
+    if item_count > settings.ROUTING_MAX_SIMPLE_ITEMS:
+        return LARGE
+    if COMPLEX_SIGNALS.search(text):
+        return LARGE
+    return FAST
+
+
+class RoutingStats:
+    """Per-agent counters of routing decisions and fast-model escalations"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, agent: str, tier: str, escalated: bool = False):
+        stats = self._stats.setdefault(agent, {"fast": 0, "large": 0, "escalated": 0})
+        stats[tier] += 1
+        if escalated:
+            stats["escalated"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            agent: {
+                **stats,
+                "escalation_rate": round(stats["escalated"] / stats["fast"], 3) if stats["fast"] else 0.0,
+            }
+            for agent, stats in self._stats.items()
+        }
+
+
+routing_stats = RoutingStats()
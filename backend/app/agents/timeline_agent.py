@@ -1,44 +1,45 @@
 from typing import Dict, Any
-from datetime import datetime, timedelta
+from datetime import date
+import math
+import numpy as np
 from app.agents.base_agent import BaseAgent
+from app.ML_model.duration_table import duration_table
+from app.scheduling.calendar import format_dates, get_calendar, offset_dates
 
 class TimelineAgent(BaseAgent):
     def __init__(self):
         super().__init__("Timeline")
-        self.duration_map = {
-            "low": 2,
-            "medium": 5,
-            "high": 10
-        }
         
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         tasks = state.get('tasks', [])
-        current_date = datetime.now()
-        total_days = 0
         
-        for task in tasks:
-            # Get base duration
-            complexity = task.get('complexity', 'medium')
-            duration = self.duration_map.get(complexity, 5)
-            
-            # Add buffer (20%)
-            duration = duration * 1.2
-            
-            # Set dates
-            task['duration'] = round(duration, 1)
-            task['start_date'] = current_date.strftime("%Y-%m-%d")
-            
-            # Calculate end date (skip weekends)
-            end_date = current_date
-            days_added = 0
-            while days_added < duration:
-                end_date += timedelta(days=1)
-                if end_date.weekday() < 5:  # Monday-Friday
-                    days_added += 1
-                    
-            task['end_date'] = end_date.strftime("%Y-%m-%d")
-            current_date = end_date + timedelta(days=1)
-            total_days += duration
+        # Calibrated from completed tasks per category x complexity (static defaults
+        # plus a 20% buffer where history is thin); one snapshot for the whole plan
+        table = duration_table.current()
+        state['duration_table'] = table  # Schedule risk samples the same cells
+        durations = [
+            table.estimate(task.get('category'), task.get('complexity', 'medium'))
+            for task in tasks
+        ]
+        state['duration_estimates'] = {
+            "table_version": table.version,
+            "calibrated_tasks": sum(
+                table.is_calibrated(task.get('category'), task.get('complexity', 'medium')) for task in tasks
+            ),
+        }
+        
+        # Back-to-back in plan order: each task starts the working day after the
+        # previous one ends. All dates come from one vectorized busday_offset call.
+        working_days = np.array([max(1, math.ceil(d)) for d in durations], dtype=np.int64)
+        start_offsets = np.cumsum(working_days) - working_days
+        calendar = get_calendar(state.get('calendar_region'))
+        starts = offset_dates(date.today(), start_offsets, calendar)
+        ends = offset_dates(date.today(), start_offsets + working_days - 1, calendar)
+        
+        for task, duration, start, end in zip(tasks, durations, format_dates(starts), format_dates(ends)):
+            task['duration'] = duration
+            task['start_date'] = start
+            task['end_date'] = end
             
-        state['total_duration'] = int(total_days)
-        return state
\ No newline at end of file
+        state['total_duration'] = int(sum(durations))
+        return state
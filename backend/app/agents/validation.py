@@ -0,0 +1,140 @@
+from typing import Dict, Any, List, Literal, Tuple
+from pydantic import AliasChoices, BaseModel, Field, TypeAdapter, ValidationError, field_validator
+
+
+class PlannedTask(BaseModel):
+    """Schema for one planner task; aliases accept common LLM field-name drift"""
+    id: str = Field(validation_alias=AliasChoices("id", "task_id"))
+    name: str = Field(min_length=1, validation_alias=AliasChoices("name", "title", "task_name", "task"))
+    description: str = Field(validation_alias=AliasChoices("description", "details", "summary", "desc"))
+    category: Literal["development", "testing", "documentation", "deployment"] = Field(
+        validation_alias=AliasChoices("category", "type", "phase")
+    )
+    complexity: Literal["low", "medium", "high"] = Field(
+        validation_alias=AliasChoices("complexity", "difficulty", "effort")
+    )
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def _coerce_id(cls, value: Any) -> Any:
+        if isinstance(value, int):
+            return f"task_{value}"
+        return value
+
+    @field_validator("category", "complexity", mode="before")
+    @classmethod
+    def _normalize_enum(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class PlannedEpic(BaseModel):
+    """Schema for one epic of a hierarchical plan"""
+    id: str = Field(validation_alias=AliasChoices("id", "epic_id"))
+    name: str = Field(min_length=1, validation_alias=AliasChoices("name", "title", "epic_name", "epic"))
+    description: str = Field(default="", validation_alias=AliasChoices("description", "details", "summary", "scope"))
+    dependencies: List[str] = Field(default_factory=list,
+                                    validation_alias=AliasChoices("dependencies", "depends_on"))
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def _coerce_id(cls, value: Any) -> Any:
+        if isinstance(value, int):
+            return f"epic_{value}"
+        return value
+
+    @field_validator("dependencies", mode="before")
+    @classmethod
+    def _coerce_dependencies(cls, value: Any) -> Any:
+        if isinstance(value, list):
+            return [f"epic_{d}" if isinstance(d, int) else d for d in value]
+        return value
+
+
+class DependencyPlan(BaseModel):
+    """Schema for the dependency agent's response"""
+    dependencies: Dict[str, List[str]]
+    parallel_groups: List[List[str]] = Field(default_factory=list)
+    critical_path: List[str] = Field(default_factory=list)
+
+
+# Validators are compiled once by pydantic-core and reused for every response
+TASK_LIST_ADAPTER = TypeAdapter(List[PlannedTask])
+EPIC_LIST_ADAPTER = TypeAdapter(List[PlannedEpic])
+DEPENDENCY_PLAN_ADAPTER = TypeAdapter(DependencyPlan)
+
+
+def format_error(error: Dict[str, Any]) -> str:
+    """Render one pydantic error as 'field: message'"""
+    loc = ".".join(str(part) for part in error["loc"][1:] if part != "") or "item"
+    return f"{loc}: {error['msg']}"
+
+
+def validate_tasks(items: List[Any]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Any, str]]]:
+    """Split items into normalized valid tasks and ``(index, item, error)`` failures"""
+    try:
+        tasks = TASK_LIST_ADAPTER.validate_python(items)
+        return [task.model_dump() for task in tasks], []
+    except ValidationError as e:
+        errors_by_index: Dict[int, List[str]] = {}
+        for error in e.errors():
+            errors_by_index.setdefault(error["loc"][0], []).append(format_error(error))
+
+    valid, invalid = [], []
+    for index, item in enumerate(items):
+        if index in errors_by_index:
+            invalid.append((index, item, "; ".join(errors_by_index[index])))
+        else:
+            valid.append(PlannedTask.model_validate(item).model_dump())
+    return valid, invalid
+
+
+def validate_epics(items: List[Any]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Any, str]]]:
+    """Valid epics with unique ids and known, non-self dependencies, plus ``(index, item, error)`` failures"""
+    valid, invalid = [], []
+    try:
+        epics = EPIC_LIST_ADAPTER.validate_python(items)
+    except ValidationError as e:
+        errors_by_index: Dict[int, List[str]] = {}
+        for error in e.errors():
+            errors_by_index.setdefault(error["loc"][0], []).append(format_error(error))
+        epics = []
+        for index, item in enumerate(items):
+            if index in errors_by_index:
+                invalid.append((index, item, "; ".join(errors_by_index[index])))
+            else:
+                epics.append(PlannedEpic.model_validate(item))
+
+    seen = set()
+    for epic in epics:
+        if epic.id not in seen:
+            seen.add(epic.id)
+            valid.append(epic.model_dump())
+    for epic in valid:
+        epic["dependencies"] = [d for d in dict.fromkeys(epic["dependencies"]) if d in seen and d != epic["id"]]
+    return valid, invalid
+
+
+def validate_dependency_plan(data: Any, task_ids: List[str]) -> Tuple[DependencyPlan, List[str]]:
+    """Validate the dependency response and drop references to unknown tasks.
+
+    Raises ``ValidationError`` when the overall shape is wrong; returns the
+    cleaned plan and a list of the fixes applied.
+    """
+    plan = DEPENDENCY_PLAN_ADAPTER.validate_python(data)
+    known = set(task_ids)
+    fixes = []
+
+    dependencies = {}
+    for task_id in task_ids:
+        deps = plan.dependencies.get(task_id, [])
+        kept = [d for d in dict.fromkeys(deps) if d in known and d != task_id]
+        if len(kept) != len(deps):
+            fixes.append(f"{task_id}: dropped {sorted(set(deps) - set(kept))}")
+        dependencies[task_id] = kept
+    for task_id in sorted(set(plan.dependencies) - known):
+        fixes.append(f"dropped unknown task {task_id}")
+
+    plan.dependencies = dependencies
+    plan.parallel_groups = [[t for t in group if t in known] for group in plan.parallel_groups]
+    plan.critical_path = [t for t in plan.critical_path if t in known]
+    return plan, fixes
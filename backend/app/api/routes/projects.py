@@ -1,12 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date
+import asyncio
 import json
 import traceback  # Add this
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.schemas import ProjectCreate, ProjectResponse
+from app.models.schemas import (
+    AssignmentRequest, AssignmentResponse, CompressionRequest, CompressionResponse, DependencyEdit, DependencyEditResponse, PortfolioRequest, PortfolioResponse,
+    ProjectCreate, ProjectResponse, ReachabilityResponse, WhatIfRequest, WhatIfResponse,
+)
 from app.models.models import Project
+from app.scheduling.calendar import parse_date
+from app.scheduling.reachability import ReachabilityIndex
+from app.scheduling.schedule import level_schedule, propagate_schedule
+from app.services.assignment import run_assignment
+from app.services.compression import run_compression
 from app.services.orchestrator import Orchestrator
+from app.services.portfolio import run_portfolio
+from app.services.reachability import reachability_cache
+from app.services.what_if import run_what_if
 
 router = APIRouter()
 
@@ -19,7 +33,10 @@ async def create_project(
     try:
         # Run the orchestrator
         orchestrator = Orchestrator()
-        result = await orchestrator.run(project.description)
+        result = await orchestrator.run(
+            project.description, project.team_capacity, project.dependency_mode,
+            project.planning_mode, project.calendar_region
+        )
         
         # Print result for debugging
         print("Orchestrator result keys:", result.keys())
@@ -29,12 +46,20 @@ async def create_project(
         db_project = Project(
             description=project.description,
             tasks=json.dumps(result.get('tasks', [])),
-            total_duration=result.get('total_duration', 0)
+            total_duration=result.get('total_duration', 0),
+            team_capacity=json.dumps(project.team_capacity or settings.TEAM_CAPACITY or {}),
+            calendar_region=project.calendar_region or settings.CALENDAR_REGION,
         )
         db.add(db_project)
         db.commit()
         db.refresh(db_project)
         
+        # Build the reachability index now so upstream/downstream queries never wait on it
+        tasks = result.get('tasks', [])
+        reachability_cache.put(db_project.id, _version(db_project), ReachabilityIndex.from_dependencies(
+            [t["id"] for t in tasks], {t["id"]: t.get("dependencies", []) for t in tasks}
+        ))
+        
         # Return response
         return ProjectResponse(
             id=db_project.id,
@@ -50,6 +75,186 @@ async def create_project(
         print(traceback.format_exc())  # Full error trace
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/portfolio", response_model=PortfolioResponse)
+async def portfolio(
+    request: PortfolioRequest,
+    db: Session = Depends(get_db)
+):
+    """Level several saved plans against one shared team, by project priority (nothing is persisted)"""
+    ids = list(dict.fromkeys(p.id for p in request.projects))
+    rows = {row.id: row for row in db.query(Project).filter(Project.id.in_(ids)).all()}
+    missing = [project_id for project_id in ids if project_id not in rows]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Projects not found: {missing}")
+    
+    projects = [(project_id, json.loads(rows[project_id].tasks or "[]")) for project_id in ids]
+    try:
+        # Leveling every project against one team is CPU-bound: keep it off the event loop
+        return await asyncio.to_thread(run_portfolio, projects, request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.post("/{project_id}/what-if", response_model=WhatIfResponse)
+async def what_if(
+    project_id: int,
+    request: WhatIfRequest,
+    db: Session = Depends(get_db)
+):
+    """Evaluate duration/dependency change scenarios against a saved plan (nothing is persisted)"""
+    db_project, tasks = _load_project(db, project_id)
+    try:
+        # CPU-bound on large plans and many scenarios: keep it off the event loop
+        return await asyncio.to_thread(run_what_if, project_id, tasks, request.scenarios, request.calendar_region)
+    except ValueError as e:
+        # The stored plan itself is cyclic
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.post("/{project_id}/compress", response_model=CompressionResponse)
+async def compress(
+    project_id: int,
+    request: CompressionRequest,
+    db: Session = Depends(get_db)
+):
+    """Cheapest crashing/fast-tracking to finish a saved plan by a target date (nothing is persisted)"""
+    db_project, tasks = _load_project(db, project_id)
+    try:
+        # Seconds of CPU on large plans: keep it off the event loop
+        return await asyncio.to_thread(run_compression, project_id, tasks, request)
+    except ValueError as e:
+        # Malformed target date or a cyclic stored plan
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.post("/{project_id}/assign", response_model=AssignmentResponse)
+async def assign(
+    project_id: int,
+    request: AssignmentRequest,
+    db: Session = Depends(get_db)
+):
+    """Skill-aware assignment of a saved plan's tasks to a roster, as per-person timelines"""
+    db_project, tasks = _load_project(db, project_id)
+    try:
+        # Local search is CPU-bound on large rosters: keep it off the event loop
+        return await asyncio.to_thread(run_assignment, project_id, tasks, request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.get("/{project_id}/tasks/{task_id}/upstream", response_model=ReachabilityResponse)
+async def task_upstream(project_id: int, task_id: str, db: Session = Depends(get_db)):
+    """Every task that task_id transitively needs"""
+    return _reachability(db, project_id, task_id, "upstream")
+
+@router.get("/{project_id}/tasks/{task_id}/downstream", response_model=ReachabilityResponse)
+async def task_downstream(project_id: int, task_id: str, db: Session = Depends(get_db)):
+    """Every task transitively blocked by task_id"""
+    return _reachability(db, project_id, task_id, "downstream")
+
+@router.patch("/{project_id}/tasks/{task_id}/dependencies", response_model=DependencyEditResponse)
+async def edit_dependencies(
+    project_id: int,
+    task_id: str,
+    edit: DependencyEdit,
+    db: Session = Depends(get_db)
+):
+    """Add/remove dependencies of one task, re-date and re-level the plan and update the reachability index in place"""
+    db_project, tasks = _load_project(db, project_id)
+    index = reachability_cache.get(project_id, _version(db_project), lambda: tasks)
+    unknown = [t for t in [task_id, *edit.add, *edit.remove] if t not in index.index]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown task ids: {unknown}")
+    
+    # Apply removals before additions; undo everything if an addition closes a cycle
+    applied: List[Tuple[str, str]] = []
+    try:
+        for dep in edit.remove:
+            if index.index[dep] in index.preds[index.index[task_id]]:
+                index.remove_dependency(task_id, dep)
+                applied.append(("remove", dep))
+        for dep in edit.add:
+            if index.index[dep] not in index.preds[index.index[task_id]]:
+                index.add_dependency(task_id, dep)
+                applied.append(("add", dep))
+    except ValueError as e:
+        for action, dep in reversed(applied):
+            if action == "add":
+                index.remove_dependency(task_id, dep)
+            else:
+                index.add_dependency(task_id, dep)
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    task = next(t for t in tasks if t["id"] == task_id)
+    removed = set(edit.remove)
+    task["dependencies"] = [d for d in task.get("dependencies", []) if d not in removed]
+    task["dependencies"] += [d for d in dict.fromkeys(edit.add) if d not in task["dependencies"]]
+    
+    # Re-date with the capacity and calendar the plan was saved with unless the edit
+    # overrides them (plans saved before these were stored fall back to settings)
+    if edit.team_capacity is not None:
+        capacity = edit.team_capacity
+    elif db_project.team_capacity is not None:
+        capacity = json.loads(db_project.team_capacity)
+    else:
+        capacity = settings.TEAM_CAPACITY
+    region = edit.calendar_region or db_project.calendar_region
+    try:
+        # CPU-bound on large plans: keep it off the event loop
+        db_project.total_duration = await asyncio.to_thread(_redate, tasks, region, capacity)
+        db_project.tasks = json.dumps(tasks)
+        db_project.team_capacity = json.dumps(capacity or {})
+        db_project.calendar_region = region or settings.CALENDAR_REGION
+        db.commit()
+        db.refresh(db_project)
+    except Exception:
+        # The cached index already holds the edit; never serve it unsaved
+        db.rollback()
+        reachability_cache.evict(project_id)
+        raise
+    reachability_cache.put(project_id, _version(db_project), index)
+    
+    return DependencyEditResponse(
+        project_id=project_id,
+        task_id=task_id,
+        dependencies=task["dependencies"],
+        total_duration=db_project.total_duration,
+        upstream_count=len(index.upstream(task_id)),
+        downstream_count=len(index.downstream(task_id)),
+    )
+
+def _redate(tasks: List[Dict[str, Any]], region: Optional[str], capacity: Dict[str, int]) -> int:
+    """Re-date the plan from its existing start, leveled like the DependencyAgent does; returns total_duration"""
+    dependencies = {t["id"]: t.get("dependencies", []) for t in tasks}
+    starts = [parse_date(t["start_date"]) for t in tasks if t.get("start_date")]
+    cpm = propagate_schedule(tasks, dependencies, min(starts) if starts else date.today(), region)
+    for t in tasks:
+        t.update(cpm["tasks"][t["id"]])
+    project_end = cpm["project_end"]
+    if capacity and tasks:
+        project_end = level_schedule(tasks, dependencies, cpm, capacity, region)["project_end"]
+    return (project_end - cpm["project_start"]).days
+
+def _load_project(db: Session, project_id: int) -> Tuple[Project, List[Dict[str, Any]]]:
+    db_project = db.query(Project).filter(Project.id == project_id).first()
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return db_project, json.loads(db_project.tasks or "[]")
+
+def _version(db_project: Project):
+    return db_project.updated_at or db_project.created_at
+
+def _reachability(db: Session, project_id: int, task_id: str, direction: str) -> ReachabilityResponse:
+    # Only the version columns are read on a cache hit, so the query stays O(k)
+    row = db.query(Project.updated_at, Project.created_at).filter(Project.id == project_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    index = reachability_cache.get(project_id, row.updated_at or row.created_at,
+                                   lambda: _load_project(db, project_id)[1])
+    if task_id not in index.index:
+        raise HTTPException(status_code=404, detail="Task not found")
+    related = index.upstream(task_id) if direction == "upstream" else index.downstream(task_id)
+    return ReachabilityResponse(
+        project_id=project_id, task_id=task_id, direction=direction,
+        count=len(related), tasks=related,
+    )
+
 @router.get("/test")
 async def test_endpoint():
     """Test endpoint"""
@@ -0,0 +1,136 @@
+from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import time
+from app.core.config import settings
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Detect provider 429s without importing the provider SDKs"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(error).__name__
+
+
+class CallTimer:
+    """Time to first token of one call; the whole call if it never marks one"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+
+    def first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    def latency(self) -> float:
+        return (self.first_token_at or time.monotonic()) - self.started
+
+
+class AdaptiveLimiter:
+    """AIMD limit on in-flight calls to one model.
+
+    Each successful call with normal latency grows the limit by
+    ``1 / limit`` (about +1 per full window); a 429 or a latency spike
+    multiplies it by ``decrease``. Cuts are spaced by at least one baseline
+    latency so a single burst of failures only halves the limit once.
+
+    Latency is time to first token (callers mark it on the ``CallTimer`` the
+    slot yields): it tracks provider load, whereas total latency mostly
+    tracks output length, which differs widely between prompt types sharing
+    one model.
+    """
+
+    def __init__(self, name: str, initial: float = 4, min_limit: float = 1,
+                 max_limit: float = 32, decrease: float = 0.5,
+                 spike_ratio: float = 2.0, smoothing: float = 0.1):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.decrease = decrease
+        self.spike_ratio = spike_ratio
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.waiting = 0
+        self.baseline_latency: Optional[float] = None
+        self.rate_limited = 0
+        self.spikes = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one in-flight slot for the duration of a call; yields its ``CallTimer``"""
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+        timer = CallTimer()
+        try:
+            yield timer
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limited += 1
+                self._cut()
+            raise
+        else:
+            self._on_success(timer.latency())
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def _on_success(self, latency: float):
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+            return
+        if latency > self.baseline_latency * self.spike_ratio:
+            self.spikes += 1
+            self._cut()
+            return
+        self.baseline_latency += self.smoothing * (latency - self.baseline_latency)
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _cut(self):
+        now = time.monotonic()
+        if now - self._last_decrease < (self.baseline_latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "baseline_first_token_s": round(self.baseline_latency, 3) if self.baseline_latency else None,
+            "rate_limited": self.rate_limited,
+            "latency_spikes": self.spikes,
+        }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(model: str) -> AdaptiveLimiter:
+    """Shared limiter per model, so all agents calling it see the same capacity"""
+    if model not in _limiters:
+        _limiters[model] = AdaptiveLimiter(
+            model,
+            initial=settings.LLM_CONCURRENCY_INITIAL,
+            min_limit=settings.LLM_CONCURRENCY_MIN,
+            max_limit=settings.LLM_CONCURRENCY_MAX,
+        )
+    return _limiters[model]
+
+
+def limiter_snapshot() -> Dict[str, Any]:
+    return {model: limiter.snapshot() for model, limiter in _limiters.items()}
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 import os
 
 class Settings(BaseSettings):
@@ -10,12 +10,70 @@ class Settings(BaseSettings):
     
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_MODEL: str = "gpt-4o"  # Escalation target; must be stronger than OPENAI_FAST_MODEL
+    OPENAI_FAST_MODEL: str = "gpt-4o-mini"
     
     # Groq
     GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY", None)
     USE_GROQ: bool = True
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_FAST_MODEL: str = "llama-3.1-8b-instant"
+
+    # Model routing: simple inputs go to the fast model, escalating on invalid output
+    ROUTING_ENABLED: bool = True
+    ROUTING_MAX_SIMPLE_CHARS: int = 280
+    ROUTING_MAX_SIMPLE_ITEMS: int = 8
+
+    # Startup: build LLM clients before serving; optionally make a 1-token warm-up call
+    LLM_WARMUP_CALL: bool = False
+
+    # Adaptive (AIMD) concurrency limits for outbound LLM calls, per model
+    LLM_CONCURRENCY_INITIAL: int = 4
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 32
+
+    # Local cache of parsed LLM responses, keyed by prompt version + model + input
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_TTL: int = 3600  # seconds
+
+    # Prompt construction
+    PROMPT_TOKEN_BUDGET: int = 3000  # Max tokens of embedded task context per prompt
+    
+    # Planning: "flat" asks for one 5-8 task plan; "hierarchical" plans epics first and
+    # decomposes them into tasks with concurrent calls, for plans of hundreds of tasks
+    PLANNING_MODE: str = "flat"
+    PLANNER_MAX_EPICS: int = 40
+    PLANNER_TASKS_PER_EPIC: int = 25
+    PLANNER_EPIC_CONCURRENCY: int = 8  # Epic decompositions in flight per request
+    
+    # Task durations calibrated from task_history (ML database), per category x complexity
+    DURATION_TABLE_TTL: int = 3600  # seconds between background rebuilds
+    DURATION_TABLE_MIN_SAMPLES: int = 5  # Fewer completed tasks fall back to the static defaults
+    DURATION_TABLE_QUANTILE: Literal["mean", "p50", "p80", "p90"] = "p80"  # Of actual durations
+    
+    # Working calendars: region -> {"weekmask": "1111100", "holidays": ["2026-12-25", ...]}
+    CALENDAR_REGION: str = "default"
+    CALENDAR_REGIONS: Dict[str, Dict[str, Any]] = {"default": {"weekmask": "1111100", "holidays": []}}
+    
+    # Team capacity per task category (concurrent tasks); empty means unlimited parallelism
+    TEAM_CAPACITY: Dict[str, int] = {}
+    
+    # Dependency inference: "llm" asks the model (rules as fallback); "rules" uses the
+    # deterministic engine and only asks the model when its confidence is low
+    DEPENDENCY_MODE: str = "llm"
+    DEPENDENCY_RULES_MIN_CONFIDENCE: float = 0.6
+    DEPENDENCY_RULES_HISTORY: int = 500  # Past projects mined for co-occurrence stats
+    # Plans larger than one window are analyzed in overlapping windows, concurrently
+    DEPENDENCY_WINDOW_SIZE: int = 30
+    DEPENDENCY_WINDOW_OVERLAP: int = 10
+    DEPENDENCY_WINDOW_CONCURRENCY: int = 8
+    
+    # Monte Carlo schedule risk (0 iterations disables it)
+    RISK_ITERATIONS: int = 10000  # Upper bound per plan; 0 disables the simulation
+    RISK_CELL_BUDGET: int = 10_000_000  # Full RISK_ITERATIONS up to 1,000 tasks, scaled down beyond
+    RISK_MIN_ITERATIONS: int = 1000
+    RISK_DISTRIBUTION: str = "pert"  # "pert" or "triangular"
+    RISK_SEED: Optional[int] = None
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
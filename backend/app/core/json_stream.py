@@ -0,0 +1,166 @@
+from typing import Any, List, Optional, Tuple
+import json
+
+
+class StructuredOutputError(ValueError):
+    """Raised when an LLM response cannot be parsed as the expected JSON"""
+
+
+class IncrementalJSONParser:
+    """Parse a JSON document as it streams in, yielding array items as they close.
+
+    The target array is either the top-level array of the document or, when
+    the document is an object, the array stored under ``items_key``. Text
+    before the document (```json fences, preambles) is skipped.
+
+    In ``tolerant`` mode malformed items are collected in ``errors`` as
+    ``(index, raw_text, message)`` instead of raising, so the complete items
+    around them can be salvaged.
+    """
+
+    def __init__(self, items_key: Optional[str] = None, tolerant: bool = False):
+        self.items_key = items_key
+        self.tolerant = tolerant
+        self.items: List[Any] = []
+        self.errors: List[Tuple[int, str, str]] = []
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._doc_start: Optional[int] = None
+        self._doc_end: Optional[int] = None
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._pending_key: Optional[str] = None
+        self._target_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self._doc_end is not None
+
+    @property
+    def fragment(self) -> Optional[str]:
+        """Text of the item that was still open when the stream stopped"""
+        if self.done or self._item_start is None:
+            return None
+        return self._buf[self._item_start:].strip() or None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text and return the items completed by it"""
+        if self.done or not chunk:
+            return []
+
+        self._buf += chunk
+        completed = []
+        buf = self._buf
+        i = self._pos
+
+        while i < len(buf) and not self.done:
+            c = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._pending_key = buf[self._string_start + 1:i]
+
+            elif self._doc_start is None:
+                if c in "{[":
+                    self._doc_start = i
+                    self._stack.append(c)
+                    if c == "[":
+                        self._target_depth = 1
+
+            elif c == '"':
+                self._mark_item_start(i)
+                self._in_string = True
+                self._string_start = i
+
+            elif c in "{[":
+                self._mark_item_start(i)
+                opens_target = (
+                    c == "["
+                    and self._target_depth is None
+                    and self.items_key is not None
+                    and self._stack == ["{"]
+                    and self._pending_key == self.items_key
+                )
+                self._stack.append(c)
+                if opens_target:
+                    self._target_depth = len(self._stack)
+
+            elif c in "}]":
+                if not self._stack:
+                    raise StructuredOutputError(f"Unbalanced '{c}' at offset {i}")
+                self._stack.pop()
+                depth = len(self._stack)
+                if self._target_depth is not None:
+                    if depth == self._target_depth - 1:
+                        # The target array itself just closed
+                        completed.extend(self._flush(i))
+                        self._target_depth = -1
+                    elif depth == self._target_depth and self._item_start is not None:
+                        completed.extend(self._flush(i + 1))
+                if not self._stack:
+                    self._doc_end = i + 1
+
+            elif c == ",":
+                if self._target_depth is not None and len(self._stack) == self._target_depth:
+                    completed.extend(self._flush(i))
+
+            elif not c.isspace():
+                self._mark_item_start(i)
+
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def close(self) -> Any:
+        """Return the fully parsed document once the stream has ended"""
+        if self._doc_start is None:
+            raise StructuredOutputError("No JSON document found in response")
+        if not self.done:
+            raise StructuredOutputError(
+                f"Truncated JSON response ({len(self.items)} complete items salvaged)"
+            )
+        try:
+            return json.loads(self._buf[self._doc_start:self._doc_end])
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"Invalid JSON response: {e}") from e
+
+    def _mark_item_start(self, i: int):
+        if (
+            self._target_depth is not None
+            and len(self._stack) == self._target_depth
+            and self._item_start is None
+        ):
+            self._item_start = i
+
+    def _flush(self, end: int) -> List[Any]:
+        if self._item_start is None:
+            return []
+        text = self._buf[self._item_start:end].strip()
+        self._item_start = None
+        index = len(self.items) + len(self.errors)
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            if self.tolerant:
+                self.errors.append((index, text, str(e)))
+                return []
+            raise StructuredOutputError(f"Invalid array item #{index + 1}: {e}") from e
+        self.items.append(item)
+        return [item]
+
+
+def parse_json_response(text: str, items_key: Optional[str] = None) -> Any:
+    """Parse a complete (possibly fenced) LLM response"""
+    parser = IncrementalJSONParser(items_key)
+    parser.feed(text)
+    return parser.close()
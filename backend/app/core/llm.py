@@ -0,0 +1,74 @@
+from typing import Dict, Any, List
+import time
+from app.core.config import settings
+
+# Shared chat clients keyed by model; agents are created per request but reuse these
+_clients: Dict[str, Any] = {}
+_status: Dict[str, Any] = {"ready": False, "warmed_models": [], "warmup_call_ok": None}
+
+
+def use_groq() -> bool:
+    return bool(settings.USE_GROQ and settings.GROQ_API_KEY)
+
+
+def provider_models() -> List[str]:
+    """Large and fast model for the configured provider"""
+    if use_groq():
+        return [settings.GROQ_MODEL, settings.GROQ_FAST_MODEL]
+    return [settings.OPENAI_MODEL, settings.OPENAI_FAST_MODEL]
+
+
+def get_llm(model: str):
+    """Return the shared client for ``model``, building it on first use.
+
+    The provider module is imported here rather than at module import time;
+    ``warm_up`` calls this during startup so requests never pay for it.
+    """
+    if model not in _clients:
+        if use_groq():
+            from langchain_groq import ChatGroq
+            _clients[model] = ChatGroq(
+                model=model,
+                temperature=0.7,
+                groq_api_key=settings.GROQ_API_KEY
+            )
+        else:
+            from langchain_openai import ChatOpenAI
+            _clients[model] = ChatOpenAI(
+                model=model,
+                temperature=0.7,
+                openai_api_key=settings.OPENAI_API_KEY
+            )
+    return _clients[model]
+
+
+async def warm_up(probe: bool = False) -> Dict[str, Any]:
+    """Import the provider, build every client and optionally make a 1-token call"""
+    started = time.perf_counter()
+    try:
+        for model in provider_models():
+            get_llm(model)
+    except Exception as e:
+        # Keep serving /health; /ready stays 503 so the instance gets no traffic
+        print(f"LLM client initialization failed: {type(e).__name__}: {e}")
+        _status["error"] = str(e)
+        return dict(_status)
+    _status["warmed_models"] = list(_clients)
+    _status["client_init_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if probe:
+        # Opens the HTTPS connection pool so the first request skips the TLS handshake
+        try:
+            await get_llm(provider_models()[0]).bind(max_tokens=1).ainvoke("ping")
+            _status["warmup_call_ok"] = True
+        except Exception as e:
+            print(f"LLM warm-up call failed: {e}")
+            _status["warmup_call_ok"] = False
+
+    _status["ready"] = True
+    print(f"LLM clients ready in {_status['client_init_ms']} ms: {', '.join(_status['warmed_models'])}")
+    return dict(_status)
+
+
+def readiness() -> Dict[str, Any]:
+    return dict(_status)
@@ -0,0 +1,45 @@
+from typing import Any, Optional
+from collections import OrderedDict
+import copy
+import time
+from app.core.config import settings
+
+
+class ResponseCache:
+    """In-process LRU cache of parsed LLM responses with a TTL.
+
+    Keys come from ``PromptTemplate.cache_key`` so a prompt version bump
+    never serves stale output. Values are deep-copied in and out because
+    agents mutate task dicts in place.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def snapshot(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
@@ -1,17 +1,37 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api.routes import projects
+from app.core.database import engine, Base, add_missing_columns
+from app.core.concurrency import limiter_snapshot
+from app.core.llm import warm_up, readiness
+from app.core.response_cache import response_cache
+from app.ML_model.duration_table import duration_table
+from app.agents.dependency_rules import cooccurrence_stats
+from app.agents.routing import routing_stats
 from app.api.routes import projects
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+add_missing_columns()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import the LLM provider and build clients before the first request arrives
+    await warm_up(probe=settings.LLM_WARMUP_CALL)
+    # Load calibrated durations so the first plans don't use the static defaults
+    await asyncio.to_thread(duration_table.refresh)
+    # Same for the rule engine's co-occurrence stats (refreshed in the background after that)
+    await asyncio.to_thread(cooccurrence_stats.refresh)
+    yield
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set all CORS enabled origins
@@ -42,4 +62,24 @@ async def root():
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+# Readiness check: 503 until LLM clients are warm (use as the startup probe)
+@app.get("/ready")
+async def readiness_check():
+    status = readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+# LLM call metrics: adaptive concurrency limits, queue depth and routing decisions
+@app.get("/metrics/llm")
+async def llm_metrics():
+    return {
+        "concurrency": limiter_snapshot(),
+        "routing": routing_stats.snapshot(),
+        "response_cache": response_cache.snapshot()
+    }
+
+# Calibrated duration table currently in use
+@app.get("/metrics/durations")
+async def duration_metrics():
+    return duration_table.snapshot()
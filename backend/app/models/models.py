@@ -9,5 +9,8 @@ class Project(Base):
     description = Column(Text, nullable=False)
     tasks = Column(Text)  # JSON string
     total_duration = Column(Integer)
+    # Leveling context the dates were computed with, reused by dependency edits
+    team_capacity = Column(Text)  # JSON string; "{}" when not leveled, NULL for older plans
+    calendar_region = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Literal, Optional, Any
 from datetime import datetime
 
 class TaskSchema(BaseModel):
@@ -12,9 +12,19 @@ class TaskSchema(BaseModel):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     dependencies: List[str] = Field(default_factory=list)
+    earliest_start: Optional[float] = None
+    latest_start: Optional[float] = None
+    total_float: Optional[float] = None
+    free_float: Optional[float] = None
+    is_critical: Optional[bool] = None
+    epic: Optional[str] = None
 
 class ProjectCreate(BaseModel):
     description: str = Field(..., min_length=10, max_length=1000)
+    team_capacity: Optional[Dict[str, int]] = None  # category -> concurrent tasks
+    dependency_mode: Optional[Literal["llm", "rules"]] = None  # Defaults to settings.DEPENDENCY_MODE
+    planning_mode: Optional[Literal["flat", "hierarchical"]] = None  # Defaults to settings.PLANNING_MODE
+    calendar_region: Optional[str] = None  # Key of settings.CALENDAR_REGIONS; defaults to settings.CALENDAR_REGION
 
 class ProjectResponse(BaseModel):
     id: int
@@ -25,4 +35,167 @@ class ProjectResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskChange(BaseModel):
+    task_id: str
+    duration: Optional[float] = Field(None, gt=0)  # New duration in working days
+    delay_days: Optional[float] = None  # Added to the current duration (negative to shorten)
+    add_dependencies: List[str] = Field(default_factory=list)
+    remove_dependencies: List[str] = Field(default_factory=list)
+
+class WhatIfScenario(BaseModel):
+    name: Optional[str] = None
+    changes: List[TaskChange] = Field(..., min_length=1)
+
+class WhatIfRequest(BaseModel):
+    scenarios: List[WhatIfScenario] = Field(..., min_length=1, max_length=100)
+    calendar_region: Optional[str] = None  # Key of settings.CALENDAR_REGIONS; defaults to settings.CALENDAR_REGION
+
+class TaskShift(BaseModel):
+    id: str
+    start_date: str
+    end_date: str
+    start_shift_days: int  # Working days, positive means later
+    end_shift_days: int
+
+class ScenarioResult(BaseModel):
+    name: Optional[str] = None
+    project_end: Optional[str] = None
+    project_duration_days: Optional[float] = None
+    end_shift_days: Optional[float] = None
+    critical_path: List[str] = Field(default_factory=list)
+    changed_tasks: List[TaskShift] = Field(default_factory=list)
+    error: Optional[str] = None
+
+class WhatIfResponse(BaseModel):
+    project_id: int
+    # Baseline and scenarios are dependency-only CPM on the request's calendar; no
+    # resource leveling, so baseline_end can be earlier than the saved plan's stored_end
+    baseline_end: Optional[str] = None
+    stored_end: Optional[str] = None
+    baseline_duration_days: float
+    baseline_critical_path: List[str]
+    scenarios: List[ScenarioResult]
+
+class ReachabilityResponse(BaseModel):
+    project_id: int
+    task_id: str
+    direction: Literal["upstream", "downstream"]
+    count: int
+    tasks: List[str]  # Plan order
+
+class DependencyEdit(BaseModel):
+    add: List[str] = Field(default_factory=list)
+    remove: List[str] = Field(default_factory=list)
+    # Default to the capacity/region the plan was saved with ({} turns leveling off);
+    # values given here are stored for later edits
+    team_capacity: Optional[Dict[str, int]] = None
+    calendar_region: Optional[str] = None
+
+class DependencyEditResponse(BaseModel):
+    project_id: int
+    task_id: str
+    dependencies: List[str]
+    total_duration: int
+    upstream_count: int
+    downstream_count: int
+
+class CrashLimit(BaseModel):
+    max_days: Optional[int] = Field(None, ge=0)  # Defaults by complexity
+    cost_per_day: Optional[float] = Field(None, ge=0)
+
+class CompressionRequest(BaseModel):
+    target_end_date: str  # YYYY-MM-DD, last working day allowed
+    crash: Dict[str, CrashLimit] = Field(default_factory=dict)  # task_id -> limits
+    allow_fast_tracking: bool = True
+    fast_track_cost_per_day: Optional[float] = Field(None, ge=0)
+    calendar_region: Optional[str] = None  # Key of settings.CALENDAR_REGIONS; defaults to settings.CALENDAR_REGION
+
+class CrashedTask(BaseModel):
+    task_id: str
+    days: int
+    cost: float
+
+class OverlappedDependency(BaseModel):
+    task_id: str
+    dependency_id: str
+    overlap_days: int
+    cost: float
+
+class CompressionResponse(BaseModel):
+    project_id: int
+    feasible: bool
+    target_end_date: str
+    baseline_end: Optional[str] = None
+    compressed_end: Optional[str] = None
+    baseline_duration_days: int
+    compressed_duration_days: int
+    total_cost: float
+    crashed: List[CrashedTask]
+    fast_tracked: List[OverlappedDependency]
+    critical_tasks: List[str]  # Zero float after compression, by start
+    changed_tasks: List[TaskShift]
+
+class TeamMember(BaseModel):
+    name: str
+    skills: Dict[str, float] = Field(..., min_length=1)  # category -> proficiency (1.0 = estimated pace)
+    availability: float = Field(1.0, gt=0, le=1)  # Share of a full-time week
+    available_from: Optional[str] = None  # YYYY-MM-DD
+
+class AssignmentRequest(BaseModel):
+    roster: List[TeamMember] = Field(..., min_length=1)
+    calendar_region: Optional[str] = None  # Key of settings.CALENDAR_REGIONS; defaults to settings.CALENDAR_REGION
+
+class AssignedTask(BaseModel):
+    task_id: str
+    name: str
+    start_date: str
+    end_date: str
+    working_days: int
+
+class PersonTimeline(BaseModel):
+    name: str
+    tasks: List[AssignedTask]
+    busy_days: int
+    utilization: float  # busy_days / makespan
+
+class AssignmentResponse(BaseModel):
+    project_id: int
+    makespan_days: int
+    list_schedule_makespan_days: int  # Before local search
+    end_date: Optional[str] = None
+    timelines: List[PersonTimeline]
+    unassigned: List[str]  # Tasks whose category nobody on the roster covers
+
+class PortfolioProject(BaseModel):
+    id: int
+    priority: int = 0  # Higher is scheduled first when the team is contended
+
+class PortfolioRequest(BaseModel):
+    projects: List[PortfolioProject] = Field(..., min_length=1, max_length=200)
+    capacity: Optional[Dict[str, int]] = None  # category -> concurrent tasks; defaults to settings.TEAM_CAPACITY
+    start_date: Optional[str] = None  # YYYY-MM-DD; defaults to today
+    calendar_region: Optional[str] = None  # Key of settings.CALENDAR_REGIONS; defaults to settings.CALENDAR_REGION
+
+class PortfolioTask(BaseModel):
+    id: str
+    start_date: str
+    end_date: str
+
+class PortfolioProjectSchedule(BaseModel):
+    project_id: int
+    priority: int
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    duration_days: int  # Working days from portfolio start to the project's last task
+    standalone_duration_days: int  # Unconstrained CPM duration of the project on its own
+    tasks: List[PortfolioTask]
+
+class PortfolioResponse(BaseModel):
+    start_date: str
+    makespan_days: int
+    unconstrained_makespan_days: int
+    capacity: Dict[str, int]
+    peak_usage: Dict[str, int]
+    projects: List[PortfolioProjectSchedule]
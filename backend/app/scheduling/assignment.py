@@ -0,0 +1,137 @@
+from typing import Dict, Any, List, Optional, Tuple
+from app.scheduling.cpm import topological_indices
+from app.scheduling.graph import TaskGraph
+
+# Cap on schedule re-evaluations during local search (each is one O(V + E) pass)
+MAX_EVALUATIONS = 1500
+
+
+def _evaluate(order: List[int], preds: List[List[int]], assignment: List[int],
+              options: List[Dict[int, int]], base: List[int], ready_from: List[int]) -> Tuple[List[int], List[int]]:
+    """Start/finish of every task for a fixed assignment, people working in ``order``"""
+    n = len(order)
+    start, finish = [0] * n, [0] * n
+    free = list(ready_from)
+    for t in order:
+        ready = 0
+        for d in preds[t]:
+            if finish[d] > ready:
+                ready = finish[d]
+        person = assignment[t]
+        if person < 0:
+            start[t], finish[t] = ready, ready + base[t]
+            continue
+        begin = ready if ready > free[person] else free[person]
+        start[t], finish[t] = begin, begin + options[t][person]
+        free[person] = finish[t]
+    return start, finish
+
+
+def assign_tasks(graph: TaskGraph, options: List[Dict[int, int]], ready_from: List[int],
+                 max_evaluations: int = MAX_EVALUATIONS) -> Dict[str, Any]:
+    """Assign tasks to people to minimize makespan, respecting dependencies and skills.
+
+    ``options[t]`` maps each person able to do task ``t`` to how many
+    working days it takes them; ``ready_from[p]`` is the first working day
+    person ``p`` is available. ``graph.durations`` is used for tasks nobody
+    can do, which are scheduled unassigned (person ``-1``) so they still
+    hold up their dependents.
+
+    List scheduling (HEFT-style): tasks in decreasing upward rank (the
+    longest remaining path using each task's mean duration over its
+    candidates), each given to the candidate who would finish it first.
+    Local search then moves single tasks on the critical chain (the run of
+    dependency and same-person waits that ends at the makespan) to other
+    candidates, keeping a move when it lowers ``(makespan, total finish
+    time)``, until no move helps or ``max_evaluations`` is spent. Returns
+    ``assignment``, ``start``, ``finish``, the ``makespan``, the list
+    schedule's ``initial_makespan`` and the ``evaluations`` used.
+    """
+    n = len(graph)
+    preds = graph.predecessor_lists()
+    succs = graph.successor_lists()
+    base = [int(d) for d in graph.durations.tolist()]
+    mean = [sum(o.values()) / len(o) if o else base[t] for t, o in enumerate(options)]
+
+    rank = [0.0] * n
+    for t in reversed(topological_indices(graph).tolist()):
+        rank[t] = mean[t] + max((rank[s] for s in succs[t]), default=0.0)
+    # Durations are at least one day, so decreasing rank is also a topological order
+    order = sorted(range(n), key=lambda t: (-rank[t], t))
+
+    assignment = [-1] * n
+    finish = [0] * n
+    free = list(ready_from)
+    for t in order:
+        ready = max((finish[d] for d in preds[t]), default=0)
+        best, best_finish = -1, ready + base[t]
+        for person, days in options[t].items():
+            done = max(ready, free[person]) + days
+            if best < 0 or done < best_finish or (done == best_finish and free[person] < free[best]):
+                best, best_finish = person, done
+        assignment[t] = best
+        finish[t] = best_finish
+        if best >= 0:
+            free[best] = best_finish
+
+    start, finish = _evaluate(order, preds, assignment, options, base, ready_from)
+    initial_makespan = max(finish, default=0)
+    score = (initial_makespan, sum(finish))
+    evaluations = 0
+
+    improved = True
+    while improved and evaluations < max_evaluations:
+        improved = False
+        for t in _critical_chain(order, preds, assignment, start, finish):
+            for person in options[t]:
+                if person == assignment[t] or evaluations >= max_evaluations:
+                    continue
+                previous, assignment[t] = assignment[t], person
+                trial_start, trial_finish = _evaluate(order, preds, assignment, options, base, ready_from)
+                evaluations += 1
+                trial = (max(trial_finish), sum(trial_finish))
+                if trial < score:
+                    score, start, finish = trial, trial_start, trial_finish
+                    improved = True
+                    break
+                assignment[t] = previous
+            if improved:
+                break
+
+    return {
+        "assignment": assignment,
+        "start": start,
+        "finish": finish,
+        "makespan": score[0],
+        "initial_makespan": initial_makespan,
+        "evaluations": evaluations,
+    }
+
+
+def _critical_chain(order: List[int], preds: List[List[int]], assignment: List[int],
+                    start: List[int], finish: List[int]) -> List[int]:
+    """Tasks on the binding chain that ends at the makespan, latest first.
+
+    Each step goes to whatever the task waited on: a dependency finishing
+    exactly at its start, or else the previous task of the same person.
+    """
+    if not order:
+        return []
+    previous_of_person: Dict[int, int] = {}
+    previous: List[Optional[int]] = [None] * len(order)
+    for t in order:
+        person = assignment[t]
+        if person >= 0:
+            previous[t] = previous_of_person.get(person)
+            previous_of_person[person] = t
+
+    makespan = max(finish)
+    current: Optional[int] = max((t for t in order if finish[t] == makespan), key=lambda t: start[t])
+    chain = []
+    while current is not None:
+        chain.append(current)
+        waited = next((d for d in preds[current] if finish[d] == start[current]), None)
+        if waited is None and previous[current] is not None and finish[previous[current]] == start[current]:
+            waited = previous[current]
+        current = waited
+    return chain
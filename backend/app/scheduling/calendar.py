@@ -0,0 +1,65 @@
+from typing import Iterable, List, Optional, Sequence
+from datetime import date, timedelta
+from functools import lru_cache
+import numpy as np
+from app.core.config import settings
+
+DATE_FORMAT = "%Y-%m-%d"
+DEFAULT_WEEKMASK = "1111100"  # Mon-Fri
+
+
+def parse_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+@lru_cache(maxsize=32)
+def get_calendar(region: Optional[str] = None) -> np.busdaycalendar:
+    """Cached business-day calendar for a region from ``settings.CALENDAR_REGIONS``.
+
+    Each region may set a ``weekmask`` (``"1111100"`` or ``"Mon Tue Wed Thu Fri"``)
+    and a list of ISO ``holidays``. Unknown regions get a plain Mon-Fri week.
+    """
+    config = settings.CALENDAR_REGIONS.get(region or settings.CALENDAR_REGION, {})
+    return make_calendar(config.get("weekmask", DEFAULT_WEEKMASK), config.get("holidays", ()))
+
+
+def make_calendar(weekmask: str = DEFAULT_WEEKMASK, holidays: Iterable[str] = ()) -> np.busdaycalendar:
+    return np.busdaycalendar(weekmask=weekmask, holidays=sorted(holidays))
+
+
+def roll_forward(day: date, calendar: Optional[np.busdaycalendar] = None) -> date:
+    """Move a non-working day to the next working day"""
+    return add_business_days(day, 0, calendar)
+
+
+def add_business_days(day: date, n: int, calendar: Optional[np.busdaycalendar] = None) -> date:
+    """The working day ``n`` working days after ``day``.
+
+    ``day`` is rolled forward to a working day first, so offset 0 is the
+    first working day on or after it. ``n`` must be non-negative.
+    """
+    result = np.busday_offset(day, n, roll="forward", busdaycal=calendar or get_calendar())
+    return result.astype(object)
+
+
+def working_days_through(start: date, end: date, calendar: Optional[np.busdaycalendar] = None) -> int:
+    """Number of working days in ``[start, end]`` inclusive (0 if ``end`` is before ``start``)"""
+    return max(0, int(np.busday_count(start, end + timedelta(days=1), busdaycal=calendar or get_calendar())))
+
+
+def offset_dates(start: date, offsets: Sequence[int],
+                 calendar: Optional[np.busdaycalendar] = None) -> np.ndarray:
+    """``add_business_days`` for a whole array of offsets in one vectorized call.
+
+    Returns a ``datetime64[D]`` array.
+    """
+    return np.busday_offset(
+        start, np.asarray(offsets, dtype=np.int64), roll="forward",
+        busdaycal=calendar or get_calendar(),
+    )
+
+
+def format_dates(days: np.ndarray) -> List[str]:
+    """``datetime64[D]`` array to ``YYYY-MM-DD`` strings"""
+    return np.datetime_as_string(days, unit="D").tolist()
+
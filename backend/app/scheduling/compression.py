@@ -0,0 +1,309 @@
+from typing import Dict, Any, List, Optional
+from collections import deque
+import math
+from app.scheduling.cpm import topological_indices
+from app.scheduling.graph import TaskGraph
+
+# (share of a task's duration that can be crashed, cost per crashed day) per complexity
+CRASH_DEFAULTS = {
+    "low": (0.25, 1.0),
+    "medium": (0.3, 1.5),
+    "high": (0.4, 2.5),
+}
+
+# A task may start before its dependency finishes by up to this share of the
+# dependency's fully crashed duration
+FAST_TRACK_MAX_OVERLAP = 0.5
+FAST_TRACK_COST_PER_DAY = 2.0
+
+INFINITE = float("inf")
+FLOW_EPSILON = 1e-9
+
+
+class _FlowNetwork:
+    """Residual graph for Dinic max-flow; arcs are ``[to, capacity, reverse index]``"""
+
+    def __init__(self, size: int):
+        self.arcs: List[List[list]] = [[] for _ in range(size)]
+
+    def add(self, u: int, v: int, capacity: float):
+        self.arcs[u].append([v, capacity, len(self.arcs[v])])
+        self.arcs[v].append([u, 0.0, len(self.arcs[u]) - 1])
+
+    def _infinite_path(self, source: int, sink: int) -> bool:
+        """Whether ``sink`` is reachable over uncapacitated arcs only (every cut is infinite)"""
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, capacity, _ in self.arcs[u]:
+                if capacity == INFINITE and v not in seen:
+                    if v == sink:
+                        return True
+                    seen.add(v)
+                    queue.append(v)
+        return False
+
+    def max_flow(self, source: int, sink: int) -> float:
+        """Dinic: augment along shortest paths one BFS level graph at a time"""
+        if self._infinite_path(source, sink):
+            return INFINITE
+        flow = 0.0
+        while True:
+            level = self._levels(source)
+            if level[sink] < 0:
+                return flow
+            cursor = [0] * len(self.arcs)
+            while True:
+                pushed = self._augment(source, sink, level, cursor)
+                if not pushed:
+                    break
+                flow += pushed
+
+    def _levels(self, source: int) -> List[int]:
+        level = [-1] * len(self.arcs)
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, capacity, _ in self.arcs[u]:
+                if capacity > FLOW_EPSILON and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+    def _augment(self, source: int, sink: int, level: List[int], cursor: List[int]) -> float:
+        """Push along one source-sink path of the level graph; 0 once it is blocked"""
+        path: List[tuple] = []
+        u = source
+        while u != sink:
+            arcs = self.arcs[u]
+            while cursor[u] < len(arcs):
+                v, capacity, _ = arcs[cursor[u]]
+                if capacity > FLOW_EPSILON and level[v] == level[u] + 1:
+                    break
+                cursor[u] += 1
+            if cursor[u] < len(arcs):
+                path.append((u, cursor[u]))
+                u = arcs[cursor[u]][0]
+            elif path:
+                # Dead end: retreat and skip the arc that led here
+                level[u] = -1
+                u = path.pop()[0]
+                cursor[u] += 1
+            else:
+                return 0.0
+        pushed = min(self.arcs[u][i][1] for u, i in path)
+        for u, i in path:
+            arc = self.arcs[u][i]
+            arc[1] -= pushed
+            self.arcs[arc[0]][arc[2]][1] += pushed
+        return pushed
+
+    def source_side(self, source: int) -> List[bool]:
+        """Nodes reachable from ``source`` in the residual graph (the min-cut's source side)"""
+        seen = [False] * len(self.arcs)
+        seen[source] = True
+        stack = [source]
+        while stack:
+            u = stack.pop()
+            for v, capacity, _ in self.arcs[u]:
+                if capacity > FLOW_EPSILON and not seen[v]:
+                    seen[v] = True
+                    stack.append(v)
+        return seen
+
+
+def _feasible_flow(network: _FlowNetwork, excess: List[float], source: int, sink: int) -> bool:
+    """Route the arcs' lower bounds (``excess`` per node) as a feasible source-sink flow.
+
+    Standard reduction: a temporary sink -> source arc plus a super source
+    and sink on the network's last two nodes; the lower bounds are met when
+    the super source's arcs saturate. The temporary arcs are then closed so
+    ``max_flow`` can augment the feasible flow to a maximum one.
+    """
+    super_source, super_sink = len(network.arcs) - 2, len(network.arcs) - 1
+    network.add(sink, source, INFINITE)
+    loop = network.arcs[sink][-1]
+    required = 0.0
+    for v, amount in enumerate(excess):
+        if amount > FLOW_EPSILON:
+            network.add(super_source, v, amount)
+            required += amount
+        elif amount < -FLOW_EPSILON:
+            network.add(v, super_sink, -amount)
+    feasible = network.max_flow(super_source, super_sink) >= required - 1e-6
+    loop[1] = network.arcs[source][loop[2]][1] = 0.0
+    return feasible
+
+
+def compress_schedule(graph: TaskGraph, target_duration: float, crash_days: List[int],
+                      crash_costs: List[float], fast_track_cost: Optional[float] = FAST_TRACK_COST_PER_DAY,
+                      max_overlap: float = FAST_TRACK_MAX_OVERLAP) -> Dict[str, Any]:
+    """Cheapest crashing and fast-tracking that brings the CPM duration down to ``target_duration``.
+
+    ``graph.durations`` are whole working days; task ``i`` can be shortened
+    by up to ``crash_days[i]`` at ``crash_costs[i]`` per day. With a
+    ``fast_track_cost``, a dependency can also be overlapped (the task starts
+    before its dependency finishes) at that cost per day.
+
+    Fulkerson / Phillips-Dessouky cut method: each round takes the
+    zero-float subgraph of the current schedule and finds its minimum-cost
+    cut by max-flow over split task nodes and dependency edges. Arcs
+    crossing the cut forwards are crashed or overlapped further; earlier
+    crashes and overlaps crossing it backwards are given days back, and
+    their cost refunded, which lower bounds on those arcs price in. Every
+    step therefore stays on the optimal time-cost curve. Durations are
+    integers, so everything off the critical subgraph has at least a day of
+    float and the cut is applied for as many days as that float and the
+    cut's remaining room and refunds allow. Stops at the target or when no
+    finite cut remains. Returns per-task
+    ``durations``, ``crashed`` days and final ``es``/``ef``/``critical``,
+    per-edge ``overlaps`` (indexed like ``graph.pred_edges``), the
+    ``project_duration``, ``cost`` and whether the target was ``feasible``.
+    """
+    n = len(graph)
+    order = topological_indices(graph).tolist()  # raises ValueError on cycles
+    targets, deps = graph.edge_targets.tolist(), graph.pred_edges.tolist()
+    preds: List[List[tuple]] = [[] for _ in range(n)]
+    succs: List[List[tuple]] = [[] for _ in range(n)]
+    for k, (t, d) in enumerate(zip(targets, deps)):
+        preds[t].append((d, k))
+        succs[d].append((t, k))
+
+    durations = [int(d) for d in graph.durations.tolist()]
+    crash_room = [min(int(c), d - 1) for c, d in zip(crash_days, durations)]
+    crashed = [0] * n
+    overlaps = [0] * len(deps)
+    overlap_room = [
+        int(max_overlap * (durations[d] - crash_room[d])) if fast_track_cost is not None else 0
+        for d in deps
+    ]
+    es, ef, ls = [0] * n, [0] * n, [0] * n
+    cost = 0.0
+
+    while True:
+        # CPM passes with overlaps as negative lags
+        for t in order:
+            start = 0
+            for d, k in preds[t]:
+                if ef[d] - overlaps[k] > start:
+                    start = ef[d] - overlaps[k]
+            es[t], ef[t] = start, start + durations[t]
+        project_duration = max(ef, default=0)
+        for t in reversed(order):
+            finish = project_duration
+            for s, k in succs[t]:
+                if ls[s] + overlaps[k] < finish:
+                    finish = ls[s] + overlaps[k]
+            ls[t] = finish - durations[t]
+        critical = [ls[t] == es[t] for t in range(n)]
+        if project_duration <= target_duration:
+            break
+
+        # Split node t into 2j (in) and 2j + 1 (out) for the j-th critical task. A
+        # crashed task or overlapped edge can be given days back, so its arc also
+        # gets a lower bound of its cost: crossing the cut backwards earns that credit
+        nodes = [t for t in range(n) if critical[t]]
+        slot = {t: j for j, t in enumerate(nodes)}
+        source, sink = 2 * len(nodes), 2 * len(nodes) + 1
+        network = _FlowNetwork(2 * len(nodes) + 4)
+        excess = [0.0] * (2 * len(nodes) + 2)
+
+        def arc(u: int, v: int, upper: float, lower: float):
+            network.add(u, v, upper - lower)
+            excess[u] -= lower
+            excess[v] += lower
+
+        for j, t in enumerate(nodes):
+            arc(2 * j, 2 * j + 1, crash_costs[t] if crash_room[t] > crashed[t] else INFINITE,
+                crash_costs[t] if crashed[t] else 0.0)
+            if es[t] == 0:
+                network.add(source, 2 * j, INFINITE)
+            if ef[t] == project_duration:
+                network.add(2 * j + 1, sink, INFINITE)
+        tight, loose = [], []
+        for k, (t, d) in enumerate(zip(targets, deps)):
+            if not (critical[t] and critical[d]):
+                continue
+            if es[t] != ef[d] - overlaps[k]:
+                loose.append(k)
+                continue
+            tight.append(k)
+            room = overlap_room[k] > overlaps[k]
+            arc(2 * slot[d] + 1, 2 * slot[t], fast_track_cost if room else INFINITE,
+                fast_track_cost if overlaps[k] else 0.0)
+        if not _feasible_flow(network, excess, source, sink):
+            break
+        if network.max_flow(source, sink) == INFINITE:
+            break
+
+        side = network.source_side(source)
+        cut_tasks = [t for j, t in enumerate(nodes) if side[2 * j] and not side[2 * j + 1]]
+        back_tasks = [t for j, t in enumerate(nodes) if side[2 * j + 1] and not side[2 * j] and crashed[t]]
+        cut_edges = [k for k in tight if side[2 * slot[deps[k]] + 1] and not side[2 * slot[targets[k]]]]
+        back_edges = [k for k in tight if side[2 * slot[targets[k]]] and not side[2 * slot[deps[k]] + 1]
+                      and overlaps[k]]
+
+        # Apply the cut for as many days as it stays the cheapest one: until a
+        # new path turns critical, a crash or overlap runs out, or a refund is spent
+        slack = min((ls[t] - es[t] for t in range(n) if not critical[t]), default=project_duration)
+        # Critical tasks not bound to the project's start/end, and non-tight
+        # edges between critical tasks, also close their gap as the cut moves
+        gaps = [
+            es[targets[k]] - ef[deps[k]] + overlaps[k] for k in loose
+            if side[2 * slot[deps[k]] + 1] and not side[2 * slot[targets[k]]]
+        ]
+        gaps += [project_duration - ef[t] for j, t in enumerate(nodes) if side[2 * j + 1] and ef[t] < project_duration]
+        gaps += [es[t] for j, t in enumerate(nodes) if not side[2 * j] and es[t] > 0]
+        step = min(
+            [project_duration - target_duration, slack] + gaps
+            + [crash_room[t] - crashed[t] for t in cut_tasks]
+            + [overlap_room[k] - overlaps[k] for k in cut_edges]
+            + [crashed[t] for t in back_tasks]
+            + [overlaps[k] for k in back_edges]
+        )
+        for t in cut_tasks:
+            durations[t] -= step
+            crashed[t] += step
+            cost += step * crash_costs[t]
+        for t in back_tasks:
+            durations[t] += step
+            crashed[t] -= step
+            cost -= step * crash_costs[t]
+        for k in cut_edges:
+            overlaps[k] += step
+            cost += step * fast_track_cost
+        for k in back_edges:
+            overlaps[k] -= step
+            cost -= step * fast_track_cost
+
+    return {
+        "durations": durations,
+        "crashed": crashed,
+        "overlaps": overlaps,
+        "es": es,
+        "ef": ef,
+        "critical": critical,
+        "project_duration": project_duration,
+        "cost": cost,
+        "feasible": project_duration <= target_duration,
+    }
+
+
+def crash_limits(tasks: List[Dict[str, Any]], durations: Dict[str, int],
+                 overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> tuple:
+    """Per-task ``(crash_days, crash_costs)`` lists from ``CRASH_DEFAULTS`` by complexity.
+
+    ``overrides`` maps task ids to ``{"max_days": ..., "cost_per_day": ...}``;
+    missing or None values keep the default.
+    """
+    overrides = overrides or {}
+    days, costs = [], []
+    for task in tasks:
+        share, cost = CRASH_DEFAULTS.get(task.get("complexity"), CRASH_DEFAULTS["medium"])
+        override = overrides.get(task["id"], {})
+        limit = override.get("max_days")
+        days.append(math.floor(share * durations[task["id"]] if limit is None else limit))
+        costs.append(cost if override.get("cost_per_day") is None else override["cost_per_day"])
+    return days, costs
@@ -0,0 +1,144 @@
+from typing import Dict, Any, List, Optional
+import math
+import numpy as np
+from app.scheduling.cycles import cyclic_component_indices
+from app.scheduling.graph import TaskGraph
+from app.scheduling.layering import layer_indices
+
+# Float tolerance when deciding whether a task has zero slack
+EPSILON = 1e-9
+
+
+def task_durations(tasks: List[Dict[str, Any]], default: float = 5) -> Dict[str, int]:
+    """Whole business days per task, matching how the timeline schedules dates"""
+    return {
+        task["id"]: max(1, math.ceil(task.get("duration", default) or default))
+        for task in tasks
+    }
+
+
+def topological_order(task_ids: List[str], dependencies: Dict[str, List[str]]) -> List[str]:
+    """Topological order via Kahn layering in O(V+E). Raises ValueError on cycles."""
+    graph = TaskGraph.from_dependencies(task_ids, dependencies)
+    return graph.names(topological_indices(graph))
+
+
+def topological_indices(graph: TaskGraph) -> np.ndarray:
+    return _acyclic_order(graph, layer_indices(graph)[0])
+
+
+def _acyclic_order(graph: TaskGraph, layers: List[np.ndarray]) -> np.ndarray:
+    order = np.concatenate(layers) if layers else np.zeros(0, dtype=np.int64)
+    if len(order) < len(graph):
+        cycles = [graph.names(c) for c in cyclic_component_indices(graph)]
+        raise ValueError(f"Dependency graph has cycles: {cycles}")
+    return order
+
+
+def cpm_arrays(graph: TaskGraph) -> Dict[str, Any]:
+    """Forward/backward CPM passes over a ``TaskGraph`` with ``durations`` set.
+
+    Edges are bucketed by Kahn layer so each layer is one vectorized step;
+    the Python-level work is per layer rather than per task. Returns the topological ``order`` and
+    per-task arrays ``es``, ``ef``, ``ls``, ``lf``, ``total_float`` and
+    ``free_float`` plus the ``project_duration``.
+    """
+    layers, _ = layer_indices(graph)
+    order = _acyclic_order(graph, layers)
+    durations = graph.durations
+
+    # Edges grouped by the layer of their dependent (forward) or dependency (backward)
+    layer_of = np.empty(len(graph), dtype=np.int64)
+    for depth, layer in enumerate(layers):
+        layer_of[layer] = depth
+    src, dst = graph.pred_edges, graph.edge_targets
+    forward = np.argsort(layer_of[dst], kind="stable")
+    forward_bounds = np.searchsorted(layer_of[dst][forward], np.arange(len(layers) + 1))
+    backward = np.argsort(layer_of[src], kind="stable")
+    backward_bounds = np.searchsorted(layer_of[src][backward], np.arange(len(layers) + 1))
+    f_src, f_dst = src[forward], dst[forward]
+    b_src, b_dst = src[backward], dst[backward]
+
+    # Forward pass: earliest start is the latest finish among predecessors
+    es = np.zeros_like(durations)
+    ef = np.zeros_like(durations)
+    for depth, layer in enumerate(layers):
+        lo, hi = forward_bounds[depth], forward_bounds[depth + 1]
+        if hi > lo:
+            np.maximum.at(es, f_dst[lo:hi], ef[f_src[lo:hi]])
+        ef[layer] = es[layer] + durations[layer]
+    project_duration = ef.max() if len(ef) else durations.dtype.type(0)
+
+    # Backward pass: latest finish is the earliest latest-start among successors
+    lf = np.full_like(durations, project_duration)
+    ls = np.zeros_like(durations)
+    for depth in range(len(layers) - 1, -1, -1):
+        lo, hi = backward_bounds[depth], backward_bounds[depth + 1]
+        if hi > lo:
+            np.minimum.at(lf, b_src[lo:hi], ls[b_dst[lo:hi]])
+        layer = layers[depth]
+        ls[layer] = lf[layer] - durations[layer]
+
+    next_start = np.full_like(durations, project_duration)
+    np.minimum.at(next_start, graph.pred_edges, es[graph.edge_targets])
+
+    return {
+        "order": order,
+        "project_duration": project_duration,
+        "es": es, "ef": ef, "ls": ls, "lf": lf,
+        "total_float": ls - es,
+        "free_float": next_start - ef,
+    }
+
+
+def compute_cpm(task_ids: List[str], dependencies: Dict[str, List[str]],
+                durations: Dict[str, float], graph: Optional[TaskGraph] = None) -> Dict[str, Any]:
+    """Critical Path Method: forward/backward passes, float and critical path in O(V+E).
+
+    Times are offsets from project start in the units of ``durations``.
+    Returns per-task ``earliest_start``, ``earliest_finish``, ``latest_start``,
+    ``latest_finish``, ``total_float``, ``free_float`` and ``is_critical``, plus
+    the topological order, project duration and duration-weighted critical path.
+    A prebuilt ``graph`` over the same tasks is reused (its durations are
+    replaced by ``durations``).
+    """
+    if graph is None:
+        graph = TaskGraph.from_dependencies(task_ids, dependencies, durations)
+    else:
+        graph.durations = np.array([durations[t] for t in graph.ids])
+    arrays = cpm_arrays(graph)
+    critical = arrays["total_float"] <= EPSILON
+
+    columns = zip(
+        arrays["es"].tolist(), arrays["ef"].tolist(), arrays["ls"].tolist(), arrays["lf"].tolist(),
+        arrays["total_float"].tolist(), arrays["free_float"].tolist(), critical.tolist(),
+    )
+    fields = ("earliest_start", "earliest_finish", "latest_start", "latest_finish",
+              "total_float", "free_float", "is_critical")
+    rows = [dict(zip(fields, row)) for row in columns]
+    order = arrays["order"].tolist()
+
+    return {
+        "order": graph.names(order),
+        "project_duration": arrays["project_duration"].item(),
+        "critical_path": graph.names(_critical_path(graph, arrays, critical)),
+        "tasks": {graph.ids[i]: rows[i] for i in order},
+    }
+
+
+def _critical_path(graph: TaskGraph, arrays: Dict[str, Any], critical: np.ndarray) -> List[int]:
+    """Walk back from a critical end task through zero-float, zero-gap predecessors"""
+    order = arrays["order"]
+    if not len(order):
+        return []
+    es, ef = arrays["es"], arrays["ef"]
+    ends = order[critical[order] & (np.abs(ef[order] - arrays["project_duration"]) <= EPSILON)]
+    current = int(ends[-1]) if len(ends) else None
+    path = []
+    while current is not None:
+        path.append(current)
+        preds = graph.predecessors(current)
+        tight = preds[critical[preds] & (np.abs(ef[preds] - es[current]) <= EPSILON)]
+        current = int(tight[0]) if len(tight) else None
+    path.reverse()
+    return path
@@ -0,0 +1,169 @@
+from typing import Dict, List, Optional, Set, Tuple
+from collections import deque
+from app.scheduling.graph import TaskGraph
+
+
+def scc_indices(graph: TaskGraph) -> List[List[int]]:
+    """Iterative Tarjan SCC over task -> dependency edges of a ``TaskGraph``, O(V+E).
+
+    Components come out in reverse topological order of the condensed graph
+    (dependencies before dependents).
+    """
+    preds = graph.predecessor_lists()
+    n = len(preds)
+    index = [-1] * n
+    lowlink = [0] * n
+    cursor = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [root]
+
+        while work:
+            node = work[-1]
+            deps = preds[node]
+            if cursor[node] < len(deps):
+                dep = deps[cursor[node]]
+                cursor[node] += 1
+                if index[dep] == -1:
+                    index[dep] = lowlink[dep] = counter
+                    counter += 1
+                    stack.append(dep)
+                    on_stack[dep] = True
+                    work.append(dep)
+                elif on_stack[dep] and index[dep] < lowlink[node]:
+                    lowlink[node] = index[dep]
+                continue
+
+            work.pop()
+            if work and lowlink[node] < lowlink[work[-1]]:
+                lowlink[work[-1]] = lowlink[node]
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def cyclic_component_indices(graph: TaskGraph) -> List[List[int]]:
+    """SCCs that actually contain a cycle (more than one task, or a self-dependency)"""
+    return [
+        component for component in scc_indices(graph)
+        if len(component) > 1 or component[0] in graph.predecessors(component[0])
+    ]
+
+
+def strongly_connected_components(task_ids: List[str],
+                                  dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """``scc_indices`` over a dependency dict, as task ids"""
+    graph = TaskGraph.from_dependencies(task_ids, dependencies)
+    return [graph.names(component) for component in scc_indices(graph)]
+
+
+def cyclic_components(task_ids: List[str],
+                      dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """``cyclic_component_indices`` over a dependency dict, as task ids"""
+    graph = TaskGraph.from_dependencies(task_ids, dependencies)
+    return [graph.names(component) for component in cyclic_component_indices(graph)]
+
+
+def find_cycles(task_ids: List[str], dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """One concrete cycle per cyclic component, as ``[a, b, ..., a]`` (a depends on b ...)"""
+    cycles = []
+    for component in cyclic_components(task_ids, dependencies):
+        members = set(component)
+        start = component[-1]
+        if start in dependencies.get(start, []):
+            cycles.append([start, start])
+            continue
+        # BFS along dependency edges inside the component until we return to start
+        parent = {start: None}
+        queue = deque([start])
+        closing = None
+        while queue and closing is None:
+            node = queue.popleft()
+            for dep in dependencies.get(node, []):
+                if dep == start:
+                    closing = node
+                    break
+                if dep in members and dep not in parent:
+                    parent[dep] = node
+                    queue.append(dep)
+        path = [start]
+        node = closing
+        while node is not None and node != start:
+            path.append(node)
+            node = parent[node]
+        cycles.append([start] + list(reversed(path[1:])) + [start])
+    return cycles
+
+
+def repair_cycles(task_ids: List[str], dependencies: Dict[str, List[str]],
+                  confidence: Optional[Dict[Tuple[str, str], float]] = None
+                  ) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]]]:
+    """Make the graph acyclic by removing a minimal set of edges inside each cycle.
+
+    Within each strongly connected component, edges where a task depends on a
+    task listed after it (reverse of the plan order) are the removal
+    candidates; dropping all of them is guaranteed to break every cycle.
+    Candidates are then re-added, highest ``confidence`` first (default:
+    shortest jump back in the plan), whenever that does not close a cycle,
+    so every removed edge is one that had to go. Edges outside cycles are
+    never touched. Returns the repaired copy and the removed ``(task, dep)``
+    edges.
+    """
+    repaired = {task_id: list(dependencies.get(task_id, [])) for task_id in task_ids}
+    position = {task_id: i for i, task_id in enumerate(task_ids)}
+    confidence = confidence or {}
+    removed = []
+
+    for component in cyclic_components(task_ids, repaired):
+        members = set(component)
+        candidates = []
+        for task_id in component:
+            for dep in repaired[task_id]:
+                if dep in members and position[dep] >= position[task_id]:
+                    candidates.append((task_id, dep))
+        for task_id, dep in candidates:
+            repaired[task_id].remove(dep)
+
+        candidates.sort(key=lambda edge: (
+            -confidence.get(edge, 1.0), position[edge[1]] - position[edge[0]]
+        ))
+        for task_id, dep in candidates:
+            if task_id != dep and not _reaches(repaired, dep, task_id, members):
+                repaired[task_id].append(dep)
+            else:
+                removed.append((task_id, dep))
+
+    return repaired, removed
+
+
+def _reaches(dependencies: Dict[str, List[str]], source: str, target: str, members: Set[str]) -> bool:
+    """Whether ``target`` is reachable from ``source`` along dependency edges within ``members``"""
+    seen = {source}
+    stack = [source]
+    while stack:
+        node = stack.pop()
+        if node == target:
+            return True
+        for dep in dependencies.get(node, []):
+            if dep in members and dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    return False
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Sequence
+from functools import cached_property
+import numpy as np
+
+
+class TaskGraph:
+    """Dependency graph with interned task ids and CSR adjacency arrays.
+
+    Task ``i`` is ``ids[i]``; its dependencies are
+    ``pred_edges[pred_offsets[i]:pred_offsets[i + 1]]`` and its dependents
+    ``succ_edges[succ_offsets[i]:succ_offsets[i + 1]]``, both as int32 task
+    indices. Dependencies on unknown ids and duplicate edges are dropped.
+    Graph algorithms take a ``TaskGraph``; the dict-based scheduling
+    functions build one and convert results back to ids at the edge.
+    """
+
+    def __init__(self, ids: List[str], pred_offsets: np.ndarray, pred_edges: np.ndarray,
+                 durations: Optional[np.ndarray] = None):
+        self.ids = ids
+        self.index = {task_id: i for i, task_id in enumerate(ids)}
+        self.pred_offsets = pred_offsets
+        self.pred_edges = pred_edges
+        self.durations = durations
+
+    @classmethod
+    def from_dependencies(cls, task_ids: Sequence[str], dependencies: Dict[str, List[str]],
+                          durations: Optional[Dict[str, float]] = None) -> "TaskGraph":
+        ids = list(task_ids)
+        index = {task_id: i for i, task_id in enumerate(ids)}
+        counts = []
+        edges = []
+        for task_id in ids:
+            deps = [index[d] for d in dependencies.get(task_id, ()) if d in index]
+            if len(deps) > 1 and len(set(deps)) < len(deps):
+                deps = list(dict.fromkeys(deps))
+            edges.extend(deps)
+            counts.append(len(deps))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        weights = np.array([durations[t] for t in ids]) if durations is not None else None
+        if weights is not None and weights.dtype.kind not in "iuf":
+            weights = weights.astype(np.float64)
+        return cls(ids, offsets, np.array(edges, dtype=np.int32), weights)
+
+    @classmethod
+    def union(cls, graphs: Sequence["TaskGraph"], ids: List[str]) -> "TaskGraph":
+        """Disjoint union of graphs as one CSR graph, shifting each graph's edges by its offset.
+
+        ``ids`` names every task of the result (graph by graph, in order) and
+        must be unique. Durations are kept when every graph has them.
+        """
+        sizes = [len(g) for g in graphs]
+        if sum(sizes) != len(ids):
+            raise ValueError(f"expected {sum(sizes)} ids, got {len(ids)}")
+        bases = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64) if graphs else []
+        edge_bases = np.concatenate(([0], np.cumsum([g.edge_count for g in graphs])[:-1])) if graphs else []
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        edges = np.zeros(sum(g.edge_count for g in graphs), dtype=np.int32)
+        for g, base, edge_base in zip(graphs, bases, edge_bases):
+            offsets[base + 1:base + len(g) + 1] = g.pred_offsets[1:] + edge_base
+            edges[edge_base:edge_base + g.edge_count] = g.pred_edges + base
+        durations = None
+        if graphs and all(g.durations is not None for g in graphs):
+            durations = np.concatenate([g.durations for g in graphs])
+        return cls(list(ids), offsets, edges, durations)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.pred_edges)
+
+    @cached_property
+    def edge_targets(self) -> np.ndarray:
+        """Dependent task of each entry in ``pred_edges`` (edge ``targets[k] -> pred_edges[k]``)"""
+        return np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.pred_offsets))
+
+    @cached_property
+    def _successors(self):
+        order = np.argsort(self.pred_edges, kind="stable")
+        offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pred_edges, minlength=len(self.ids)), out=offsets[1:])
+        return offsets, self.edge_targets[order]
+
+    @property
+    def succ_offsets(self) -> np.ndarray:
+        return self._successors[0]
+
+    @property
+    def succ_edges(self) -> np.ndarray:
+        return self._successors[1]
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.pred_offsets)
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.pred_edges[self.pred_offsets[i]:self.pred_offsets[i + 1]]
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.succ_edges[self.succ_offsets[i]:self.succ_offsets[i + 1]]
+
+    def predecessor_lists(self) -> List[List[int]]:
+        """Per-task dependency index lists, for tight pure-Python traversals"""
+        edges = self.pred_edges.tolist()
+        offsets = self.pred_offsets.tolist()
+        return [edges[offsets[i]:offsets[i + 1]] for i in range(len(self.ids))]
+
+    def successor_lists(self) -> List[List[int]]:
+        edges = self.succ_edges.tolist()
+        offsets = self.succ_offsets.tolist()
+        return [edges[offsets[i]:offsets[i + 1]] for i in range(len(self.ids))]
+
+    def names(self, indices) -> List[str]:
+        ids = self.ids
+        return [ids[i] for i in np.asarray(indices).tolist()]
+
+    def to_dependencies(self) -> Dict[str, List[str]]:
+        ids = self.ids
+        return {ids[i]: [ids[d] for d in deps] for i, deps in enumerate(self.predecessor_lists())}
+
@@ -0,0 +1,60 @@
+from typing import Dict, Any, List, Tuple
+from app.scheduling.cycles import repair_cycles
+
+
+def merge_epic_dependencies(epics: List[Dict[str, Any]], dependencies: Dict[str, List[str]]
+                            ) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]]]:
+    """Task graph of a hierarchical plan from per-epic graphs plus epic-level ordering.
+
+    ``epics`` are ``{"id", "dependencies", "tasks"}`` dicts (epic ids and task
+    ids, in plan order); ``dependencies`` holds each epic's internal task
+    edges, and edges that cross epics are dropped. Cycles are repaired inside
+    each epic and, separately, in the much smaller epic graph. An epic
+    dependency ``A -> B`` then becomes edges from every entry task of ``A``
+    (nothing inside ``A`` before it) to every exit task of ``B`` (nothing
+    inside ``B`` after it), so no task-level analysis of the whole plan is
+    needed. An epic without tasks passes its own upstream exits through, so
+    ``C -> B -> A`` with an empty ``B`` still orders ``C`` after ``A``. Returns the task dependencies and the removed ``(task, dep)`` or
+    ``(epic, epic)`` edges.
+    """
+    epic_of = {task_id: epic["id"] for epic in epics for task_id in epic["tasks"]}
+    order = [task_id for epic in epics for task_id in epic["tasks"]]
+    intra = {
+        task_id: [d for d in dependencies.get(task_id, []) if epic_of.get(d) == epic_of[task_id]]
+        for task_id in order
+    }
+    # No edge crosses an epic, so every cycle found here lies inside one epic
+    intra, removed = repair_cycles(order, intra)
+
+    epic_ids = [epic["id"] for epic in epics]
+    known = set(epic_ids)
+    epic_deps = {
+        epic["id"]: [d for d in epic.get("dependencies", []) if d in known and d != epic["id"]]
+        for epic in epics
+    }
+    epic_deps, removed_epics = repair_cycles(epic_ids, epic_deps)
+
+    has_dependents = {dep for deps in intra.values() for dep in deps}
+    entries = {epic["id"]: [t for t in epic["tasks"] if not intra[t]] for epic in epics}
+    exits = {epic["id"]: [t for t in epic["tasks"] if t not in has_dependents] for epic in epics}
+
+    def upstream_exits(epic_id: str) -> List[str]:
+        """Exits of the epics ``epic_id`` depends on, seen through empty epics"""
+        found = []
+        for dep in epic_deps[epic_id]:
+            found.extend(exits[dep] if exits[dep] else resolved(dep))
+        return list(dict.fromkeys(found))
+
+    passed_through: Dict[str, List[str]] = {}
+
+    def resolved(epic_id: str) -> List[str]:
+        if epic_id not in passed_through:
+            passed_through[epic_id] = upstream_exits(epic_id)
+        return passed_through[epic_id]
+
+    merged = {task_id: list(deps) for task_id, deps in intra.items()}
+    for epic_id in epic_ids:
+        upstream = upstream_exits(epic_id)
+        for task_id in entries[epic_id]:
+            merged[task_id].extend(upstream)
+    return merged, removed + removed_epics
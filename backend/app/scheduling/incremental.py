@@ -0,0 +1,158 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import heapq
+import numpy as np
+from app.scheduling.cpm import EPSILON, cpm_arrays, topological_indices
+from app.scheduling.graph import TaskGraph
+
+Edge = Tuple[int, int]  # (task, dependency) as graph indices
+
+
+class IncrementalSchedule:
+    """Baseline CPM for a plan that evaluates edits by recomputing only what they touch.
+
+    A scenario is a set of duration overrides plus added/removed dependency
+    edges. Earliest times are re-derived only for the downstream cone of the
+    edits and latest times only for their upstream cone; every other task
+    keeps its baseline value (latest times shifted by the change in project
+    duration). Scenarios are overlays, so the baseline is never mutated and
+    any number of them can be evaluated against one instance.
+    """
+
+    def __init__(self, graph: TaskGraph):
+        arrays = cpm_arrays(graph)
+        self.graph = graph
+        self.durations = graph.durations
+        self.preds = graph.predecessor_lists()
+        self.succs = graph.successor_lists()
+        self.position = np.empty(len(graph), dtype=np.int64)
+        self.position[arrays["order"]] = np.arange(len(graph))
+        self.es, self.ef, self.ls = arrays["es"], arrays["ef"], arrays["ls"]
+        self.project_duration = arrays["project_duration"]
+        # Python-list copies for the per-task loops (numpy scalar access is slow)
+        self._es, self._ef, self._ls = self.es.tolist(), self.ef.tolist(), self.ls.tolist()
+        self._durations = self.durations.tolist()
+        self._position = self.position.tolist()
+
+    def evaluate(self, durations: Optional[Dict[int, float]] = None,
+                 added: Iterable[Edge] = (), removed: Iterable[Edge] = ()) -> Dict[str, Any]:
+        """CPM for the baseline with the given edits applied.
+
+        Raises ValueError if an added edge closes a cycle. Returns full
+        ``es``/``ef``/``ls``/``total_float`` arrays, ``project_duration``,
+        the ``critical_path`` and the indices of tasks whose start or finish
+        moved (``changed``).
+        """
+        durations = durations or {}
+        added, removed = list(added), list(removed)
+        preds = {t: list(self.preds[t]) for t, _ in added + removed}
+        succs = {d: list(self.succs[d]) for _, d in added + removed}
+        for t, d in removed:
+            if d in preds[t]:
+                preds[t].remove(d)
+                succs[d].remove(t)
+        for t, d in added:
+            if d not in preds[t]:
+                preds[t].append(d)
+                succs[d].append(t)
+
+        position = self._position
+        if any(position[d] > position[t] for t, d in added):
+            # An added edge runs against the baseline order: re-sort the edited graph
+            position = self._reorder(preds)
+        base_es, base_ef, base_ls = self._es, self._ef, self._ls
+
+        def dur(t):
+            return durations.get(t, self._durations[t])
+
+        # Forward pass over the downstream cone, in topological order
+        es, ef = {}, {}
+        heap = [(position[t], t) for t in set(durations) | set(preds)]
+        heapq.heapify(heap)
+        queued = {t for _, t in heap}
+        while heap:
+            _, t = heapq.heappop(heap)
+            start = max((ef.get(p, base_ef[p]) for p in preds.get(t, self.preds[t])), default=0)
+            finish = start + dur(t)
+            if start == base_es[t] and finish == base_ef[t] and t not in ef:
+                continue
+            previous = ef.get(t, base_ef[t])
+            es[t], ef[t] = start, finish
+            if finish != previous:
+                for s in succs.get(t, self.succs[t]):
+                    if s not in queued:
+                        queued.add(s)
+                        heapq.heappush(heap, (position[s], s))
+
+        dtype = np.result_type(self.es, *durations.values())
+        es_all, ef_all = self.es.astype(dtype), self.ef.astype(dtype)
+        if es:
+            touched = np.fromiter(es, dtype=np.int64, count=len(es))
+            es_all[touched] = [es[t] for t in touched.tolist()]
+            ef_all[touched] = [ef[t] for t in touched.tolist()]
+        project_duration = ef_all.max() if len(ef_all) else self.project_duration
+        shift = project_duration - self.project_duration
+
+        # Backward pass over the upstream cone, in reverse topological order;
+        # untouched tasks keep their baseline latest start shifted by the new end
+        ls = {}
+        heap = [(-position[t], t) for t in set(durations) | set(succs)]
+        heapq.heapify(heap)
+        queued = {t for _, t in heap}
+        while heap:
+            _, t = heapq.heappop(heap)
+            finish = min((ls.get(s, base_ls[s] + shift) for s in succs.get(t, self.succs[t])),
+                         default=project_duration)
+            latest = finish - dur(t)
+            if latest == base_ls[t] + shift:
+                continue
+            ls[t] = latest
+            for p in preds.get(t, self.preds[t]):
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-position[p], p))
+
+        ls_all = (self.ls + shift).astype(dtype)
+        if ls:
+            touched = np.fromiter(ls, dtype=np.int64, count=len(ls))
+            ls_all[touched] = [ls[t] for t in touched.tolist()]
+        total_float = ls_all - es_all
+
+        changed = sorted(t for t in es if es[t] != base_es[t] or ef[t] != base_ef[t])
+        return {
+            "es": es_all,
+            "ef": ef_all,
+            "ls": ls_all,
+            "total_float": total_float,
+            "project_duration": project_duration,
+            "critical_path": self._critical_path(es_all, ef_all, total_float, project_duration,
+                                                 position, preds),
+            "changed": changed,
+        }
+
+    def _reorder(self, preds: Dict[int, List[int]]) -> List[int]:
+        ids = self.graph.ids
+        dependencies = {
+            ids[t]: [ids[d] for d in preds.get(t, self.preds[t])] for t in range(len(ids))
+        }
+        order = topological_indices(TaskGraph.from_dependencies(ids, dependencies))
+        position = np.empty(len(ids), dtype=np.int64)
+        position[order] = np.arange(len(ids))
+        return position.tolist()
+
+    def _critical_path(self, es: np.ndarray, ef: np.ndarray, total_float: np.ndarray,
+                       project_duration: float, position: List[int],
+                       preds: Dict[int, List[int]]) -> List[int]:
+        """Walk back from the last critical end task through zero-float, zero-gap predecessors"""
+        critical = total_float <= EPSILON
+        ends = np.flatnonzero(critical & (np.abs(ef - project_duration) <= EPSILON))
+        current = max(ends.tolist(), key=position.__getitem__) if len(ends) else None
+        path = []
+        while current is not None:
+            path.append(current)
+            current = next(
+                (p for p in preds.get(current, self.preds[current])
+                 if critical[p] and abs(ef[p] - es[current]) <= EPSILON),
+                None,
+            )
+        path.reverse()
+        return path
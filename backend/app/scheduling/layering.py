@@ -0,0 +1,51 @@
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from app.scheduling.cycles import cyclic_component_indices
+from app.scheduling.graph import TaskGraph
+
+
+def layer_indices(graph: TaskGraph) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Kahn layering over the CSR successor lists, O(V+E).
+
+    Returns the layers as index arrays and the remaining in-degrees; tasks
+    with a positive remaining in-degree sit in or behind a cycle.
+    """
+    successors = graph.successor_lists()
+    in_degree = graph.in_degree().tolist()
+    frontier = [i for i, degree in enumerate(in_degree) if degree == 0]
+    layers = []
+    while frontier:
+        layers.append(np.array(frontier, dtype=np.int64))
+        next_frontier = []
+        for i in frontier:
+            for succ in successors[i]:
+                in_degree[succ] -= 1
+                if in_degree[succ] == 0:
+                    next_frontier.append(succ)
+        frontier = next_frontier
+    return layers, np.array(in_degree, dtype=np.int64)
+
+
+def topological_layers(task_ids: List[str], dependencies: Dict[str, List[str]],
+                       graph: Optional[TaskGraph] = None) -> Dict[str, Any]:
+    """Kahn's algorithm with in-degree counters, one frontier per layer, O(V+E).
+
+    Returns ``layers`` (tasks that can run in parallel once earlier layers
+    finish), ``order`` (a topological order), ``cycles`` (strongly connected
+    components that block layering) and ``blocked`` (tasks downstream of a
+    cycle that are not themselves part of one). Dependencies on unknown ids
+    are ignored. A prebuilt ``graph`` over the same tasks is reused.
+    """
+    graph = graph or TaskGraph.from_dependencies(task_ids, dependencies)
+    layers, in_degree = layer_indices(graph)
+    layers = [graph.names(layer) for layer in layers]
+    order = [task_id for layer in layers for task_id in layer]
+
+    cycles, blocked = [], []
+    if len(order) < len(graph):
+        components = cyclic_component_indices(graph)
+        in_cycle = {i for component in components for i in component}
+        cycles = [graph.names(component) for component in components]
+        blocked = graph.names([i for i in np.flatnonzero(in_degree > 0).tolist() if i not in in_cycle])
+
+    return {"layers": layers, "order": order, "cycles": cycles, "blocked": blocked}
@@ -0,0 +1,111 @@
+from typing import Dict, List
+from app.scheduling.cpm import topological_indices
+from app.scheduling.graph import TaskGraph
+
+
+def _members(bits: int) -> List[int]:
+    """Set bit positions of ``bits`` in ascending order, O(popcount)"""
+    members = []
+    while bits:
+        low = bits & -bits
+        members.append(low.bit_length() - 1)
+        bits ^= low
+    return members
+
+
+class ReachabilityIndex:
+    """Transitive closure of a dependency DAG as per-task ancestor/descendant bitsets.
+
+    Bit ``j`` of ``ancestors[i]`` is set when task ``i`` transitively depends
+    on task ``j``; ``descendants`` is the mirror. "Does X need Y?" is one bit
+    test, and listing a task's ``k`` upstream or downstream tasks is O(k)
+    word-parallel steps. Edges can be added and removed in place without a
+    rebuild: an insertion ORs the new reach into the two affected cones and
+    a deletion recomputes only those cones.
+    """
+
+    def __init__(self, graph: TaskGraph):
+        self.ids = list(graph.ids)
+        self.index = dict(graph.index)
+        self.preds = [set(deps) for deps in graph.predecessor_lists()]
+        self.succs = [set(deps) for deps in graph.successor_lists()]
+        order = topological_indices(graph).tolist()  # raises ValueError on cycles
+
+        self.ancestors = [0] * len(self.ids)
+        for task in order:
+            reach = 0
+            for dep in self.preds[task]:
+                reach |= self.ancestors[dep] | 1 << dep
+            self.ancestors[task] = reach
+        self.descendants = [0] * len(self.ids)
+        for task in reversed(order):
+            reach = 0
+            for succ in self.succs[task]:
+                reach |= self.descendants[succ] | 1 << succ
+            self.descendants[task] = reach
+
+    @classmethod
+    def from_dependencies(cls, task_ids: List[str], dependencies: Dict[str, List[str]]) -> "ReachabilityIndex":
+        return cls(TaskGraph.from_dependencies(task_ids, dependencies))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, task_id: str) -> int:
+        if task_id not in self.index:
+            raise KeyError(task_id)
+        return self.index[task_id]
+
+    def depends_on(self, task_id: str, dep_id: str) -> bool:
+        """Whether ``task_id`` transitively needs ``dep_id``"""
+        return bool(self.ancestors[self._position(task_id)] >> self._position(dep_id) & 1)
+
+    def upstream(self, task_id: str) -> List[str]:
+        """Every task ``task_id`` transitively depends on, in plan order"""
+        return [self.ids[i] for i in _members(self.ancestors[self._position(task_id)])]
+
+    def downstream(self, task_id: str) -> List[str]:
+        """Every task transitively blocked by ``task_id``, in plan order"""
+        return [self.ids[i] for i in _members(self.descendants[self._position(task_id)])]
+
+    def add_dependency(self, task_id: str, dep_id: str):
+        """Add ``task_id -> dep_id``; raises ValueError if it would close a cycle"""
+        task, dep = self._position(task_id), self._position(dep_id)
+        if task == dep or self.descendants[task] >> dep & 1:
+            raise ValueError(f"{task_id} -> {dep_id} would create a dependency cycle")
+        if dep in self.preds[task]:
+            return
+        self.preds[task].add(dep)
+        self.succs[dep].add(task)
+        gained_upstream = self.ancestors[dep] | 1 << dep
+        gained_downstream = self.descendants[task] | 1 << task
+        for i in _members(gained_downstream):
+            self.ancestors[i] |= gained_upstream
+        for i in _members(gained_upstream):
+            self.descendants[i] |= gained_downstream
+
+    def remove_dependency(self, task_id: str, dep_id: str):
+        """Remove ``task_id -> dep_id`` (a no-op if absent), recomputing the affected cones"""
+        task, dep = self._position(task_id), self._position(dep_id)
+        if dep not in self.preds[task]:
+            return
+        self.preds[task].discard(dep)
+        self.succs[dep].discard(task)
+
+        # A strict ancestor always has fewer ancestors than its descendant, so
+        # sorting by (pre-removal) ancestor count is a topological order of the cone
+        cone = _members(self.descendants[task] | 1 << task)
+        cone.sort(key=lambda i: self.ancestors[i].bit_count())
+        for i in cone:
+            reach = 0
+            for p in self.preds[i]:
+                reach |= self.ancestors[p] | 1 << p
+            self.ancestors[i] = reach
+
+        cone = _members(self.ancestors[dep] | 1 << dep)
+        cone.sort(key=lambda i: self.descendants[i].bit_count())
+        for i in cone:
+            reach = 0
+            for s in self.succs[i]:
+                reach |= self.descendants[s] | 1 << s
+            self.descendants[i] = reach
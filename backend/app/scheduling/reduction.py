@@ -0,0 +1,42 @@
+from typing import List, Tuple
+import numpy as np
+from app.scheduling.cpm import topological_indices
+from app.scheduling.graph import TaskGraph
+
+
+def transitive_reduction(graph: TaskGraph) -> Tuple[TaskGraph, List[Tuple[str, str]]]:
+    """Drop dependencies already implied through another dependency.
+
+    ``task -> dep`` is redundant when some other dependency of ``task``
+    already (transitively) depends on ``dep``. Ancestor sets are Python int
+    bitsets built in topological order, so each check is a word-parallel
+    AND/OR and the pass is O(E * V / 64). Reachability is unchanged. The
+    graph must be acyclic. Returns the reduced graph and the removed
+    ``(task, dep)`` edges.
+    """
+    predecessors = graph.predecessor_lists()
+    ancestors = [0] * len(graph)
+    kept_lists = list(predecessors)
+    removed = []
+
+    for task in topological_indices(graph).tolist():
+        deps = predecessors[task]
+        if not deps:
+            continue
+        # Everything reachable through any dependency, excluding the dependencies themselves
+        implied = 0
+        for dep in deps:
+            implied |= ancestors[dep]
+        kept = [dep for dep in deps if not implied >> dep & 1]
+        if len(kept) < len(deps):
+            kept_lists[task] = kept
+            removed.extend((graph.ids[task], graph.ids[dep]) for dep in deps if implied >> dep & 1)
+        reach = implied
+        for dep in kept:
+            reach |= 1 << dep
+        ancestors[task] = reach
+
+    offsets = np.zeros(len(graph) + 1, dtype=np.int64)
+    np.cumsum([len(deps) for deps in kept_lists], out=offsets[1:])
+    edges = np.array([dep for deps in kept_lists for dep in deps], dtype=np.int32)
+    return TaskGraph(graph.ids, offsets, edges, graph.durations), removed
@@ -0,0 +1,100 @@
+from typing import Dict, Any, List, Optional
+import heapq
+import numpy as np
+from app.scheduling.cpm import compute_cpm
+from app.scheduling.graph import TaskGraph
+
+
+def level_resources(task_ids: List[str], dependencies: Dict[str, List[str]],
+                    durations: Dict[str, int], resources: Dict[str, str],
+                    capacity: Dict[str, int],
+                    cpm: Optional[Dict[str, Any]] = None,
+                    graph: Optional[TaskGraph] = None,
+                    priorities: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Resource-constrained schedule via a serial schedule-generation scheme.
+
+    Every task needs one unit of its resource (``resources[task_id]``, e.g.
+    its category) for its whole duration; ``capacity`` caps concurrent units
+    per resource and resources without a cap are unlimited. Eligible tasks
+    (all dependencies scheduled) are taken minimum-slack first, i.e. by CPM
+    latest start, then earliest start and plan order, and each is placed at
+    the earliest time that respects both its dependencies and the resource
+    profile. ``priorities`` (comparable keys, lower first) take precedence
+    over slack, e.g. to favour one project of a portfolio. Durations must be whole periods.
+
+    Returns per-task ``start``/``finish`` offsets, the leveled ``makespan``,
+    the ``unconstrained_makespan`` from CPM, ``peak_usage`` per resource and
+    ``resource_links``: for each task held back by its resource, the tasks
+    of that resource whose finish freed the unit it started on. Dependencies
+    plus these links reproduce the leveled starts under plain CPM, so float
+    and the critical path of the leveled plan come from ``compute_cpm``.
+    """
+    cpm = cpm or compute_cpm(task_ids, dependencies, durations)
+    timing = cpm["tasks"]
+    graph = graph or TaskGraph.from_dependencies(task_ids, dependencies)
+    predecessors = graph.predecessor_lists()
+    successors = graph.successor_lists()
+    ids = graph.ids
+    lengths = [durations[t] for t in ids]
+    needs = [resources.get(t) for t in ids]
+
+    # One usage profile per capped resource; no schedule can exceed the serial length
+    horizon = sum(lengths) + 1
+    usage = {
+        resource: np.zeros(horizon, dtype=np.int32)
+        for resource, cap in capacity.items() if cap is not None
+    }
+    booked = dict.fromkeys(usage, 0)
+    limits = {resource: max(1, int(cap)) for resource, cap in capacity.items() if cap is not None}
+
+    ranks = [priorities.get(t, 0) for t in ids] if priorities else [0] * len(ids)
+
+    def priority(i):
+        t = timing[ids[i]]
+        return (ranks[i], t["latest_start"], t["earliest_start"], i)
+
+    remaining = [len(p) for p in predecessors]
+    eligible = [priority(i) for i in range(len(ids)) if remaining[i] == 0]
+    heapq.heapify(eligible)
+    start = [0] * len(ids)
+    finish = [0] * len(ids)
+    finished_at: Dict[tuple, List[int]] = {}
+    links: Dict[int, List[int]] = {}
+
+    while eligible:
+        i = heapq.heappop(eligible)[-1]
+        duration = lengths[i]
+        ready = t = max((finish[p] for p in predecessors[i]), default=0)
+
+        resource = needs[i]
+        profile = usage.get(resource)
+        if profile is not None:
+            # First run of ``duration`` free periods at or after t; past the
+            # resource's latest booking everything is free
+            full = np.flatnonzero(profile[t:booked[resource]] >= limits[resource])
+            if full.size:
+                run_starts = np.concatenate(([0], full + 1))
+                run_ends = np.concatenate((full, [horizon]))
+                t += int(run_starts[np.argmax(run_ends - run_starts >= duration)])
+            profile[t:t + duration] += 1
+            booked[resource] = max(booked[resource], t + duration)
+            if t > ready:
+                # Period t - 1 was full, so some task of this resource ends at t
+                links[i] = finished_at.get((resource, t), [])
+            finished_at.setdefault((resource, t + duration), []).append(i)
+
+        start[i] = t
+        finish[i] = t + duration
+        for succ in successors[i]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                heapq.heappush(eligible, priority(succ))
+
+    index = graph.index
+    return {
+        "tasks": {t: {"start": start[index[t]], "finish": finish[index[t]]} for t in cpm["order"]},
+        "makespan": max(finish, default=0),
+        "unconstrained_makespan": cpm["project_duration"],
+        "peak_usage": {resource: int(profile.max()) for resource, profile in usage.items()},
+        "resource_links": {ids[i]: [ids[j] for j in blockers] for i, blockers in links.items()},
+    }
@@ -0,0 +1,205 @@
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+from datetime import date
+import math
+import numpy as np
+from app.scheduling.calendar import format_dates, get_calendar, offset_dates, roll_forward
+from app.scheduling.graph import TaskGraph
+from app.scheduling.layering import layer_indices
+
+# (optimistic, most likely, pessimistic) working days per complexity, for tasks
+# whose category x complexity has no calibrated history
+COMPLEXITY_ESTIMATES = {
+    "low": (1.5, 2, 4),
+    "medium": (3, 5, 10),
+    "high": (6, 10, 20),
+}
+PERCENTILES = (50, 80, 95)
+
+# Float tolerance when deciding whether a sampled task has zero slack
+SLACK_TOLERANCE = 1e-6
+
+# Upper bound on iterations x tasks held in memory at once
+CHUNK_CELLS = 2_000_000
+
+# Grid size of the tabulated Beta CDF used for PERT sampling
+QUANTILE_POINTS = 65537
+
+
+def _beta_quantiles(alpha: float, beta: float, points: int = QUANTILE_POINTS) -> np.ndarray:
+    """Quantile function of Beta(alpha, beta) tabulated at ``points`` evenly spaced probabilities.
+
+    The CDF is integrated on a grid (alpha, beta >= 1, so the density is
+    finite) and inverted once; sampling is then a table lookup.
+    """
+    x = np.linspace(0.0, 1.0, points)
+    pdf = x ** (alpha - 1) * (1 - x) ** (beta - 1)
+    cdf = np.concatenate(([0.0], np.cumsum((pdf[1:] + pdf[:-1]) / 2)))
+    return np.interp(np.linspace(0.0, 1.0, points), cdf / cdf[-1], x)
+
+
+def sample_durations(rng: np.random.Generator, estimates: np.ndarray, iterations: int,
+                     distribution: str = "pert") -> np.ndarray:
+    """``(tasks, iterations)`` duration samples from three-point estimates.
+
+    ``estimates`` is ``(tasks, 3)``: optimistic, most likely, pessimistic.
+    ``pert`` is Beta-PERT (lambda 4) and ``triangular`` the triangular
+    distribution, both by inverse transform of one uniform draw per cell;
+    Beta quantiles come from a table per distinct shape, which is several
+    times faster than ``rng.beta``. Degenerate estimates (all three equal)
+    are allowed.
+    """
+    low, mode, high = (estimates[:, i:i + 1] for i in range(3))
+    spread = high - low
+    safe = np.where(spread > 0, spread, 1.0)
+    if distribution == "pert":
+        shapes = np.round(np.hstack((1 + 4 * (mode - low) / safe, 1 + 4 * (high - mode) / safe)), 6)
+        distinct, group = np.unique(shapes, axis=0, return_inverse=True)
+        tables = np.stack([_beta_quantiles(alpha, beta) for alpha, beta in distinct])
+        # Nearest table entry: one gather per cell into the stacked per-shape tables
+        u = rng.random((len(estimates), iterations), dtype=np.float32)
+        index = (u * (QUANTILE_POINTS - 1) + 0.5).astype(np.intp)
+        index += group.reshape(-1, 1) * QUANTILE_POINTS
+        return low + tables.ravel()[index] * spread
+    u = rng.random((len(estimates), iterations))
+    if distribution == "triangular":
+        split = (mode - low) / safe
+        rising = low + np.sqrt(u * spread * (mode - low))
+        falling = high - np.sqrt((1 - u) * spread * (high - mode))
+        return np.where(u < split, rising, falling)
+    raise ValueError(f"Unknown duration distribution: {distribution}")
+
+
+def _layer_edges(layers: List[np.ndarray], owners: np.ndarray, others: np.ndarray,
+                 n: int) -> List[List[Tuple[np.ndarray, np.ndarray]]]:
+    """Per layer, the edges owned by its tasks split into slots.
+
+    Slot ``k`` holds each owner's ``k``-th edge, so within a slot every owner
+    appears once and a slot is a plain gather/compare/scatter over rows.
+    The number of slots is the layer's largest degree.
+    """
+    layer_of = np.empty(n, dtype=np.int64)
+    for depth, layer in enumerate(layers):
+        layer_of[layer] = depth
+    order = np.lexsort((owners, layer_of[owners]))
+    owners, others = owners[order], others[order]
+    # Rank of each edge among its owner's edges
+    first = np.r_[True, owners[1:] != owners[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(owners)), 0))
+    rank = np.arange(len(owners)) - group_start
+    bounds = np.searchsorted(layer_of[owners], np.arange(len(layers) + 1))
+
+    slots = []
+    for depth in range(len(layers)):
+        lo, hi = bounds[depth], bounds[depth + 1]
+        layer_rank = rank[lo:hi]
+        slots.append([
+            (owners[lo:hi][layer_rank == k], others[lo:hi][layer_rank == k])
+            for k in range(int(layer_rank.max()) + 1 if hi > lo else 0)
+        ])
+    return slots
+
+
+def simulate_schedule(graph: TaskGraph, estimates: np.ndarray, iterations: int = 10000,
+                      distribution: str = "pert", seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Monte Carlo CPM: sampled durations pushed through the DAG a layer at a time.
+
+    Samples are laid out task-major (one contiguous row of iterations per
+    task), so each Kahn layer's forward and backward step is a handful of
+    whole-row gathers and ``maximum``/``minimum`` calls for all iterations
+    at once. Iterations run in chunks
+    of at most ``CHUNK_CELLS`` cells to bound memory. Returns the sampled
+    ``completion`` times and each task's ``criticality`` (share of
+    iterations in which it had zero total float). Raises ValueError for
+    fewer than one iteration.
+    """
+    if iterations < 1:
+        raise ValueError(f"iterations must be at least 1, got {iterations}")
+    n = len(graph)
+    layers, _ = layer_indices(graph)
+    if sum(len(layer) for layer in layers) < n:
+        raise ValueError("Dependency graph has cycles")
+    rng = np.random.default_rng(seed)
+    forward = _layer_edges(layers, graph.edge_targets, graph.pred_edges, n)
+    backward = _layer_edges(layers, graph.pred_edges, graph.edge_targets, n)
+
+    completions = []
+    critical_counts = np.zeros(n, dtype=np.int64)
+    chunk = max(1, min(iterations, CHUNK_CELLS // max(n, 1)))
+    for done in range(0, iterations, chunk):
+        durations = sample_durations(rng, estimates, min(chunk, iterations - done), distribution)
+
+        # Forward pass: earliest start is the latest finish among predecessors
+        es = np.zeros_like(durations)
+        ef = np.empty_like(durations)
+        for layer, slots in zip(layers, forward):
+            for tasks, deps in slots:
+                es[tasks] = np.maximum(es[tasks], ef[deps])
+            ef[layer] = es[layer] + durations[layer]
+        completion = ef.max(axis=0)
+
+        # Backward pass: latest finish is the earliest latest-start among successors
+        lf = np.repeat(completion[None, :], n, axis=0)
+        ls = np.empty_like(durations)
+        for layer, slots in zip(reversed(layers), reversed(backward)):
+            for tasks, succs in slots:
+                lf[tasks] = np.minimum(lf[tasks], ls[succs])
+            ls[layer] = lf[layer] - durations[layer]
+
+        critical_counts += (ls - es <= SLACK_TOLERANCE).sum(axis=1)
+        completions.append(completion)
+
+    return {"completion": np.concatenate(completions), "criticality": critical_counts / iterations}
+
+
+def scaled_iterations(task_count: int, iterations: int, cell_budget: int, minimum: int) -> int:
+    """``iterations`` cut down so ``iterations x task_count`` stays within ``cell_budget``, but not below ``minimum``"""
+    return max(1, min(iterations, max(minimum, cell_budget // max(task_count, 1))))
+
+
+def schedule_risk(tasks: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                  project_start: date, iterations: int = 10000, distribution: str = "pert",
+                  seed: Optional[int] = None, region: Optional[str] = None,
+                  graph: Optional[TaskGraph] = None,
+                  percentiles: Sequence[int] = PERCENTILES,
+                  three_point: Optional[Callable[[Optional[str], Optional[str]],
+                                                 Optional[Tuple[float, float, float]]]] = None) -> Dict[str, Any]:
+    """Completion-date percentiles and criticality indices for a plan.
+
+    Task durations are sampled from three-point estimates: ``three_point``
+    looks them up by category and complexity (pass the planning duration
+    table's ``DurationTable.three_point`` so the simulation and the plan
+    describe the same durations, calibrated or not); without it, or for
+    tasks it returns None for, ``COMPLEXITY_ESTIMATES`` by complexity are
+    used. Percentiles are reported in working days and as calendar dates (the
+    last working day of the project) on the region's calendar.
+    """
+    graph = graph or TaskGraph.from_dependencies([t["id"] for t in tasks], dependencies)
+    by_id = {t["id"]: t for t in tasks}
+
+    def estimate(task: Dict[str, Any]) -> Tuple[float, float, float]:
+        complexity = task.get("complexity", "medium")
+        calibrated = three_point(task.get("category"), complexity) if three_point else None
+        return calibrated or COMPLEXITY_ESTIMATES.get(complexity, COMPLEXITY_ESTIMATES["medium"])
+
+    estimates = np.array(
+        [estimate(by_id[task_id]) for task_id in graph.ids], dtype=np.float64
+    ).reshape(len(graph), 3)
+    result = simulate_schedule(graph, estimates, iterations, distribution, seed)
+
+    calendar = get_calendar(region)
+    project_start = roll_forward(project_start, calendar)
+    days = np.percentile(result["completion"], percentiles)
+    dates = format_dates(offset_dates(project_start, [max(0, math.ceil(d) - 1) for d in days], calendar))
+
+    return {
+        "iterations": iterations,
+        "distribution": distribution,
+        "mean_working_days": round(float(result["completion"].mean()), 1),
+        "percentiles": {
+            f"p{p}": {"working_days": round(float(d), 1), "date": day}
+            for p, d, day in zip(percentiles, days, dates)
+        },
+        "criticality": {
+            task_id: round(float(index), 3) for task_id, index in zip(graph.ids, result["criticality"])
+        },
+    }
@@ -0,0 +1,79 @@
+from typing import Dict, Any, List, Optional
+from datetime import date
+from app.scheduling.calendar import format_dates, get_calendar, offset_dates, roll_forward
+from app.scheduling.cpm import compute_cpm, task_durations
+from app.scheduling.graph import TaskGraph
+from app.scheduling.resources import level_resources
+
+
+def propagate_schedule(tasks: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                       project_start: date, region: Optional[str] = None,
+                       graph: Optional[TaskGraph] = None) -> Dict[str, Any]:
+    """Schedule every task at its earliest start, in topological order, in one O(V+E) pass.
+
+    Offsets come from the CPM forward pass in whole working days and are
+    turned into dates with a single vectorized ``busday_offset`` call on the
+    region's calendar. A task occupies working days ``[start, end]``
+    inclusive and its successors start on the next working day. Writes
+    ``start_date`` and ``end_date`` onto the tasks and returns the CPM result
+    plus project dates.
+    """
+    calendar = get_calendar(region)
+    project_start = roll_forward(project_start, calendar)
+    cpm = compute_cpm([t["id"] for t in tasks], dependencies, task_durations(tasks), graph=graph)
+
+    timings = [cpm["tasks"][task["id"]] for task in tasks]
+    starts = offset_dates(project_start, [t["earliest_start"] for t in timings], calendar)
+    ends = offset_dates(project_start, [t["earliest_finish"] - 1 for t in timings], calendar)
+    for task, start, end in zip(tasks, format_dates(starts), format_dates(ends)):
+        task["start_date"] = start
+        task["end_date"] = end
+
+    cpm["project_start"] = project_start
+    cpm["project_end"] = ends.max().astype(object) if len(ends) else project_start
+    return cpm
+
+
+def level_schedule(tasks: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                   cpm: Dict[str, Any], capacity: Dict[str, int], region: Optional[str] = None,
+                   graph: Optional[TaskGraph] = None) -> Dict[str, Any]:
+    """Re-date a ``propagate_schedule`` result so no category runs more tasks at once than ``capacity``.
+
+    Writes the leveled ``start_date``/``end_date`` onto the tasks (on the
+    region's calendar, from ``cpm["project_start"]``) along with float and
+    criticality of the leveled plan: CPM over the dependencies plus the
+    leveling's resource links, which starts every task exactly where the
+    leveling put it. Returns the leveling summary, the leveled
+    ``project_end``, that leveled ``cpm`` and the ``constrained``
+    dependencies (dependencies plus resource links) it was computed on.
+    """
+    ids = [t["id"] for t in tasks]
+    durations = task_durations(tasks)
+    leveled = level_resources(
+        ids, dependencies, durations,
+        {t["id"]: t.get("category") for t in tasks}, capacity, cpm=cpm, graph=graph,
+    )
+    links = leveled["resource_links"]
+    constrained = {t: list(dict.fromkeys(dependencies.get(t, []) + links.get(t, []))) for t in ids}
+    leveled_cpm = compute_cpm(ids, constrained, durations)
+
+    calendar = get_calendar(region)
+    timings = [leveled["tasks"][t["id"]] for t in tasks]
+    starts = offset_dates(cpm["project_start"], [t["start"] for t in timings], calendar)
+    ends = offset_dates(cpm["project_start"], [t["finish"] - 1 for t in timings], calendar)
+    for task, start, end in zip(tasks, format_dates(starts), format_dates(ends)):
+        task.update(leveled_cpm["tasks"][task["id"]])
+        task["start_date"] = start
+        task["end_date"] = end
+
+    return {
+        "capacity": dict(capacity),
+        "makespan_days": leveled["makespan"],
+        "unconstrained_makespan_days": leveled["unconstrained_makespan"],
+        "delay_days": leveled["makespan"] - leveled["unconstrained_makespan"],
+        "peak_usage": leveled["peak_usage"],
+        "resource_links": sum(len(blockers) for blockers in links.values()),
+        "project_end": ends.max().astype(object) if len(ends) else cpm["project_start"],
+        "cpm": leveled_cpm,
+        "constrained": constrained,
+    }
@@ -0,0 +1,77 @@
+from typing import Dict, Any, List
+from datetime import date, timedelta
+import math
+from app.models.schemas import AssignedTask, AssignmentRequest, AssignmentResponse, PersonTimeline
+from app.scheduling.assignment import assign_tasks
+from app.scheduling.calendar import (
+    format_dates, get_calendar, offset_dates, parse_date, roll_forward, working_days_through,
+)
+from app.scheduling.cpm import task_durations
+from app.scheduling.graph import TaskGraph
+
+
+def run_assignment(project_id: int, tasks: List[Dict[str, Any]],
+                   request: AssignmentRequest) -> AssignmentResponse:
+    """Per-person timelines for a stored plan and roster (nothing is persisted).
+
+    A person takes ``duration / (proficiency * availability)`` working days
+    (rounded up) for a task in a category they have a skill for. Raises
+    ValueError on a bad date or a cyclic plan.
+    """
+    ids = [task["id"] for task in tasks]
+    durations = task_durations(tasks)
+    graph = TaskGraph.from_dependencies(ids, {t["id"]: t.get("dependencies", []) for t in tasks}, durations)
+    starts = [parse_date(t["start_date"]) for t in tasks if t.get("start_date")]
+    calendar = get_calendar(request.calendar_region)
+    project_start = roll_forward(min(starts) if starts else date.today(), calendar)
+
+    roster = request.roster
+    options = [
+        {
+            p: max(1, math.ceil(durations[task["id"]] / (member.skills[task.get("category")] * member.availability)))
+            for p, member in enumerate(roster)
+            if member.skills.get(task.get("category"), 0) > 0
+        }
+        for task in tasks
+    ]
+    ready_from = [
+        working_days_through(project_start, parse_date(m.available_from) - timedelta(days=1), calendar)
+        if m.available_from else 0
+        for m in roster
+    ]
+    result = assign_tasks(graph, options, ready_from)
+
+    start_dates = format_dates(offset_dates(project_start, result["start"], calendar))
+    end_dates = format_dates(offset_dates(project_start, [max(0, f - 1) for f in result["finish"]], calendar))
+    by_person: List[List[int]] = [[] for _ in roster]
+    for t, person in enumerate(result["assignment"]):
+        if person >= 0:
+            by_person[person].append(t)
+
+    makespan = result["makespan"]
+    timelines = []
+    for member, assigned in zip(roster, by_person):
+        assigned.sort(key=lambda t: result["start"][t])
+        busy = sum(result["finish"][t] - result["start"][t] for t in assigned)
+        timelines.append(PersonTimeline(
+            name=member.name,
+            tasks=[
+                AssignedTask(
+                    task_id=ids[t], name=tasks[t].get("name", ids[t]),
+                    start_date=start_dates[t], end_date=end_dates[t],
+                    working_days=result["finish"][t] - result["start"][t],
+                )
+                for t in assigned
+            ],
+            busy_days=busy,
+            utilization=round(busy / makespan, 3) if makespan else 0.0,
+        ))
+
+    return AssignmentResponse(
+        project_id=project_id,
+        makespan_days=makespan,
+        list_schedule_makespan_days=result["initial_makespan"],
+        end_date=format_dates(offset_dates(project_start, [max(0, makespan - 1)], calendar))[0] if ids else None,
+        timelines=timelines,
+        unassigned=[ids[t] for t, person in enumerate(result["assignment"]) if person < 0],
+    )
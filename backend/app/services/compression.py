@@ -0,0 +1,82 @@
+from typing import Dict, Any, List
+from datetime import date
+from app.models.schemas import (
+    CompressionRequest, CompressionResponse, CrashedTask, OverlappedDependency, TaskShift,
+)
+from app.scheduling.calendar import (
+    format_dates, get_calendar, offset_dates, parse_date, roll_forward, working_days_through,
+)
+from app.scheduling.compression import FAST_TRACK_COST_PER_DAY, INFINITE, compress_schedule, crash_limits
+from app.scheduling.cpm import task_durations
+from app.scheduling.graph import TaskGraph
+
+
+def run_compression(project_id: int, tasks: List[Dict[str, Any]],
+                    request: CompressionRequest) -> CompressionResponse:
+    """Cheapest crash/fast-track plan for a stored project to end by ``target_end_date``.
+
+    Nothing is persisted; the response lists the reductions, their cost and
+    the dates that move. Raises ValueError on a bad date or a cyclic plan.
+    """
+    ids = [task["id"] for task in tasks]
+    durations = task_durations(tasks)
+    graph = TaskGraph.from_dependencies(ids, {t["id"]: t.get("dependencies", []) for t in tasks}, durations)
+    starts = [parse_date(t["start_date"]) for t in tasks if t.get("start_date")]
+    calendar = get_calendar(request.calendar_region)
+    project_start = roll_forward(min(starts) if starts else date.today(), calendar)
+    target = working_days_through(project_start, parse_date(request.target_end_date), calendar)
+
+    crash_days, crash_costs = crash_limits(
+        tasks, durations, {task_id: limit.model_dump() for task_id, limit in request.crash.items()}
+    )
+    fast_track_cost = None
+    if request.allow_fast_tracking:
+        fast_track_cost = request.fast_track_cost_per_day
+        if fast_track_cost is None:
+            fast_track_cost = FAST_TRACK_COST_PER_DAY
+    # An unreachable-by-definition target just schedules the plan as it is
+    baseline = compress_schedule(graph, INFINITE, crash_days, crash_costs)
+    result = compress_schedule(graph, target, crash_days, crash_costs, fast_track_cost)
+
+    changed = [
+        i for i in range(len(ids))
+        if result["es"][i] != baseline["es"][i] or result["ef"][i] != baseline["ef"][i]
+    ]
+    start_dates = format_dates(offset_dates(project_start, [result["es"][i] for i in changed], calendar))
+    end_dates = format_dates(offset_dates(project_start, [result["ef"][i] - 1 for i in changed], calendar))
+    ends = format_dates(offset_dates(project_start, [
+        max(0, baseline["project_duration"] - 1), max(0, result["project_duration"] - 1)
+    ], calendar))
+    critical = sorted((i for i in range(len(ids)) if result["critical"][i]), key=lambda i: result["es"][i])
+
+    return CompressionResponse(
+        project_id=project_id,
+        feasible=result["feasible"],
+        target_end_date=request.target_end_date,
+        baseline_end=ends[0] if ids else None,
+        compressed_end=ends[1] if ids else None,
+        baseline_duration_days=baseline["project_duration"],
+        compressed_duration_days=result["project_duration"],
+        total_cost=round(result["cost"], 2),
+        crashed=[
+            CrashedTask(task_id=ids[i], days=days, cost=round(days * crash_costs[i], 2))
+            for i, days in enumerate(result["crashed"]) if days
+        ],
+        fast_tracked=[
+            OverlappedDependency(
+                task_id=ids[t], dependency_id=ids[d], overlap_days=days,
+                cost=round(days * fast_track_cost, 2),
+            )
+            for t, d, days in zip(graph.edge_targets.tolist(), graph.pred_edges.tolist(), result["overlaps"])
+            if days
+        ],
+        critical_tasks=[ids[i] for i in critical],
+        changed_tasks=[
+            TaskShift(
+                id=ids[i], start_date=start, end_date=end,
+                start_shift_days=result["es"][i] - baseline["es"][i],
+                end_shift_days=result["ef"][i] - baseline["ef"][i],
+            )
+            for i, start, end in zip(changed, start_dates, end_dates)
+        ],
+    )
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.agents.planner_agent import PlannerAgent
 from app.agents.timeline_agent import TimelineAgent
 from app.agents.dependency_agent import DependencyAgent
@@ -11,7 +11,10 @@ class Orchestrator:
         self.dependency = DependencyAgent()
         self.formatter = FormatterAgent()
         
-    async def run(self, description: str) -> Dict[str, Any]:
+    async def run(self, description: str, team_capacity: Optional[Dict[str, int]] = None,
+                  dependency_mode: Optional[str] = None,
+                  planning_mode: Optional[str] = None,
+                  calendar_region: Optional[str] = None) -> Dict[str, Any]:
         # Initial state
         state = {
             "description": description,
@@ -19,7 +22,11 @@ class Orchestrator:
             "total_duration": 0,
             "dependencies": {},
             "parallel_groups": [],
-            "critical_path": []
+            "critical_path": [],
+            "team_capacity": team_capacity or {},
+            "dependency_mode": dependency_mode,
+            "planning_mode": planning_mode,
+            "calendar_region": calendar_region
         }
         
         # Run agents in sequence
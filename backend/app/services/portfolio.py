@@ -0,0 +1,86 @@
+from typing import Dict, Any, List, Tuple
+from datetime import date
+from app.core.config import settings
+from app.models.schemas import PortfolioProjectSchedule, PortfolioRequest, PortfolioResponse, PortfolioTask
+from app.scheduling.calendar import DATE_FORMAT, format_dates, get_calendar, offset_dates, parse_date, roll_forward
+from app.scheduling.cpm import compute_cpm, task_durations
+from app.scheduling.graph import TaskGraph
+from app.scheduling.resources import level_resources
+
+
+def run_portfolio(projects: List[Tuple[int, List[Dict[str, Any]]]],
+                  request: PortfolioRequest) -> PortfolioResponse:
+    """Level several stored plans against one shared team (nothing is persisted).
+
+    Each project's graph is built on its own and the CSR arrays are joined
+    into one disjoint graph (task ids become ``"<project>:<task>"``), which
+    is then leveled once with the serial SGS. Project priority outranks
+    slack when tasks compete for a category. Raises ValueError on a bad
+    date or a cyclic plan.
+    """
+    priority = {p.id: p.priority for p in request.projects}
+    capacity = request.capacity if request.capacity is not None else settings.TEAM_CAPACITY
+    calendar = get_calendar(request.calendar_region)
+    portfolio_start = roll_forward(parse_date(request.start_date) if request.start_date else date.today(), calendar)
+
+    graphs, ids, durations, resources, ranks, spans = [], [], {}, {}, {}, []
+    for project_id, tasks in projects:
+        local = task_durations(tasks)
+        graph = TaskGraph.from_dependencies(
+            [t["id"] for t in tasks], {t["id"]: t.get("dependencies", []) for t in tasks}, local
+        )
+        spans.append((len(ids), len(ids) + len(tasks)))
+        for task in tasks:
+            key = f"{project_id}:{task['id']}"
+            ids.append(key)
+            durations[key] = local[task["id"]]
+            resources[key] = task.get("category")
+            ranks[key] = -priority.get(project_id, 0)
+        graphs.append(graph)
+
+    merged = TaskGraph.union(graphs, ids)
+    cpm = compute_cpm(ids, {}, durations, graph=merged)
+    
+    # Slack measured against each project's own end, not the longest project's,
+    # so short projects are not pushed back just for being short
+    priorities = {}
+    for (project_id, _), (lo, hi) in zip(projects, spans):
+        shift = cpm["project_duration"] - max(
+            (cpm["tasks"][ids[i]]["earliest_finish"] for i in range(lo, hi)), default=0
+        )
+        for key in ids[lo:hi]:
+            priorities[key] = (ranks[key], cpm["tasks"][key]["latest_start"] - shift)
+    leveled = level_resources(ids, {}, durations, resources, capacity, cpm=cpm, graph=merged,
+                              priorities=priorities)
+
+    timings = [leveled["tasks"][key] for key in ids]
+    start_dates = format_dates(offset_dates(portfolio_start, [t["start"] for t in timings], calendar))
+    end_dates = format_dates(offset_dates(portfolio_start, [max(0, t["finish"] - 1) for t in timings], calendar))
+
+    schedules = []
+    for (project_id, tasks), (lo, hi) in zip(projects, spans):
+        finish = max((timings[i]["finish"] for i in range(lo, hi)), default=0)
+        standalone = max((cpm["tasks"][ids[i]]["earliest_finish"] for i in range(lo, hi)), default=0)
+        first = min(range(lo, hi), key=lambda i: timings[i]["start"], default=None)
+        last = max(range(lo, hi), key=lambda i: timings[i]["finish"], default=None)
+        schedules.append(PortfolioProjectSchedule(
+            project_id=project_id,
+            priority=priority.get(project_id, 0),
+            start_date=start_dates[first] if first is not None else None,
+            end_date=end_dates[last] if last is not None else None,
+            duration_days=finish,
+            standalone_duration_days=standalone,
+            tasks=[
+                PortfolioTask(id=task["id"], start_date=start_dates[i], end_date=end_dates[i])
+                for task, i in zip(tasks, range(lo, hi))
+            ],
+        ))
+
+    return PortfolioResponse(
+        start_date=portfolio_start.strftime(DATE_FORMAT),
+        makespan_days=leveled["makespan"],
+        unconstrained_makespan_days=leveled["unconstrained_makespan"],
+        capacity=dict(capacity),
+        peak_usage=leveled["peak_usage"],
+        projects=schedules,
+    )
@@ -0,0 +1,45 @@
+from typing import Any, Callable, Dict, List
+from collections import OrderedDict
+from app.scheduling.reachability import ReachabilityIndex
+
+
+class ReachabilityCache:
+    """LRU of per-project reachability indexes, keyed by project id.
+
+    Each entry remembers the project version (``updated_at`` or
+    ``created_at``) it was built from; a lookup with a different version
+    rebuilds, so edits made elsewhere are never served stale. Edits made
+    through the API update the cached index in place and re-stamp it once
+    saved, or evict it if saving fails.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, project_id: int, version: Any,
+            load_tasks: Callable[[], List[Dict[str, Any]]]) -> ReachabilityIndex:
+        """Cached index, or one built from ``load_tasks()`` (only called on a miss)"""
+        entry = self._entries.get(project_id)
+        if entry is None or entry[0] != version:
+            tasks = load_tasks()
+            index = ReachabilityIndex.from_dependencies(
+                [task["id"] for task in tasks],
+                {task["id"]: task.get("dependencies", []) for task in tasks},
+            )
+            self.put(project_id, version, index)
+            return index
+        self._entries.move_to_end(project_id)
+        return entry[1]
+
+    def evict(self, project_id: int):
+        self._entries.pop(project_id, None)
+
+    def put(self, project_id: int, version: Any, index: ReachabilityIndex):
+        self._entries[project_id] = (version, index)
+        self._entries.move_to_end(project_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+reachability_cache = ReachabilityCache()
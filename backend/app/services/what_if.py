@@ -0,0 +1,99 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date
+import math
+from app.models.schemas import ScenarioResult, TaskShift, WhatIfResponse, WhatIfScenario
+from app.scheduling.calendar import DATE_FORMAT, format_dates, get_calendar, offset_dates, parse_date, roll_forward
+from app.scheduling.cpm import task_durations
+from app.scheduling.graph import TaskGraph
+from app.scheduling.incremental import IncrementalSchedule
+
+
+def run_what_if(project_id: int, tasks: List[Dict[str, Any]],
+                scenarios: List[WhatIfScenario], region: Optional[str] = None) -> WhatIfResponse:
+    """Evaluate scenarios against a stored plan without persisting anything.
+
+    The baseline CPM is computed once; each scenario is an overlay on it that
+    only recomputes the tasks downstream (earliest times) and upstream
+    (latest times) of its edits. Baseline and scenarios use dependencies
+    only, dated on ``region``'s calendar: resource leveling is not re-run,
+    so for a leveled plan ``baseline_end`` can fall before the saved end
+    date, which is reported as ``stored_end``. Shifts are relative to the
+    baseline.
+    """
+    ids = [task["id"] for task in tasks]
+    dependencies = {task["id"]: task.get("dependencies", []) for task in tasks}
+    graph = TaskGraph.from_dependencies(ids, dependencies, task_durations(tasks))
+    baseline = IncrementalSchedule(graph)
+    starts = [parse_date(t["start_date"]) for t in tasks if t.get("start_date")]
+    calendar = get_calendar(region)
+    project_start = roll_forward(min(starts) if starts else date.today(), calendar)
+
+    results = []
+    for scenario in scenarios:
+        try:
+            durations, added, removed = _edits(graph, scenario)
+            outcome = baseline.evaluate(durations, added, removed)
+        except ValueError as e:
+            results.append(ScenarioResult(name=scenario.name, error=str(e)))
+            continue
+
+        changed = outcome["changed"]
+        start_days = [int(outcome["es"][t]) for t in changed]
+        end_days = [max(0, math.ceil(outcome["ef"][t]) - 1) for t in changed]
+        start_dates = format_dates(offset_dates(project_start, start_days, calendar))
+        end_dates = format_dates(offset_dates(project_start, end_days, calendar))
+        project_duration = float(outcome["project_duration"])
+        results.append(ScenarioResult(
+            name=scenario.name,
+            project_end=_end_date(project_start, project_duration, calendar),
+            project_duration_days=project_duration,
+            end_shift_days=project_duration - float(baseline.project_duration),
+            critical_path=graph.names(outcome["critical_path"]),
+            changed_tasks=[
+                TaskShift(
+                    id=graph.ids[t], start_date=start, end_date=end,
+                    start_shift_days=math.ceil(outcome["es"][t] - baseline.es[t]),
+                    end_shift_days=math.ceil(outcome["ef"][t] - baseline.ef[t]),
+                )
+                for t, start, end in zip(changed, start_dates, end_dates)
+            ],
+        ))
+
+    baseline_path = baseline.evaluate()["critical_path"]
+    ends = [parse_date(t["end_date"]) for t in tasks if t.get("end_date")]
+    return WhatIfResponse(
+        project_id=project_id,
+        baseline_end=_end_date(project_start, float(baseline.project_duration), calendar) if tasks else None,
+        stored_end=max(ends).strftime(DATE_FORMAT) if ends else None,
+        baseline_duration_days=float(baseline.project_duration),
+        baseline_critical_path=graph.names(baseline_path),
+        scenarios=results,
+    )
+
+
+def _edits(graph: TaskGraph, scenario: WhatIfScenario) -> Tuple[Dict[int, float], list, list]:
+    """Scenario changes as graph-index edits. Raises ValueError on unknown task ids."""
+    def index(task_id: str) -> int:
+        if task_id not in graph.index:
+            raise ValueError(f"Unknown task id: {task_id}")
+        return graph.index[task_id]
+
+    durations, added, removed = {}, [], []
+    for change in scenario.changes:
+        t = index(change.task_id)
+        duration = durations.get(t, graph.durations[t])
+        if change.duration is not None:
+            duration = change.duration
+        if change.delay_days:
+            duration += change.delay_days
+        if change.duration is not None or change.delay_days:
+            durations[t] = max(1, math.ceil(duration))
+        added.extend((t, index(dep)) for dep in change.add_dependencies)
+        removed.extend((t, index(dep)) for dep in change.remove_dependencies)
+    if any(t == d for t, d in added):
+        raise ValueError("A task cannot depend on itself")
+    return durations, added, removed
+
+
+def _end_date(project_start: date, duration: float, calendar) -> str:
+    return format_dates(offset_dates(project_start, [max(0, math.ceil(duration) - 1)], calendar))[0]
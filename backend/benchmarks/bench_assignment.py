@@ -0,0 +1,47 @@
+"""Benchmark skill-aware task assignment (list scheduling + local search).
+
+Usage (from backend/):
+    python benchmarks/bench_assignment.py [--tasks 500] [--people 40]
+"""
+import argparse
+import math
+import random
+
+from plans import CATEGORIES, best_of, random_dag
+
+from app.scheduling.assignment import assign_tasks
+from app.scheduling.graph import TaskGraph
+
+
+def random_plan(n: int, people: int, seed: int = 13):
+    rng = random.Random(seed)
+    ids, dependencies = random_dag(rng, n)
+    durations = {task_id: rng.randint(1, 10) for task_id in ids}
+    categories = [rng.choice(CATEGORIES) for _ in ids]
+    skills = [
+        {c: rng.choice([0.75, 1.0, 1.25]) for c in rng.sample(CATEGORIES, rng.randint(1, 3))}
+        for _ in range(people)
+    ]
+    options = [
+        {p: max(1, math.ceil(durations[ids[t]] / s[categories[t]])) for p, s in enumerate(skills) if categories[t] in s}
+        for t in range(n)
+    ]
+    return TaskGraph.from_dependencies(ids, dependencies, durations), options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task assignment benchmark")
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--people", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'people':>7} {'list':>7} {'searched':>9} {'evals':>7} {'ms':>9}")
+    for n, people in ((args.tasks // 10, max(2, args.people // 8)), (args.tasks, args.people)):
+        graph, options = random_plan(n, people)
+        result, elapsed = best_of(lambda: assign_tasks(graph, options, [0] * people))
+        print(f"{n:>8} {people:>7} {result['initial_makespan']:>7} {result['makespan']:>9} "
+              f"{result['evaluations']:>7} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
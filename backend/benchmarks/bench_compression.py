@@ -0,0 +1,42 @@
+"""Benchmark iterative min-cut schedule compression.
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py [--tasks 1000]
+"""
+import argparse
+import random
+
+from plans import best_of, random_dag
+
+from app.scheduling.compression import compress_schedule
+from app.scheduling.graph import TaskGraph
+
+
+def random_plan(n: int, seed: int = 13):
+    rng = random.Random(seed)
+    ids, dependencies = random_dag(rng, n)
+    durations = {task_id: rng.randint(1, 12) for task_id in ids}
+    crash_costs = [rng.choice([1.0, 1.5, 2.5]) for _ in ids]
+    return TaskGraph.from_dependencies(ids, dependencies, durations), crash_costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule compression benchmark")
+    parser.add_argument("--tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'target':>8} {'days':>11} {'feasible':>9} {'cost':>9} {'ms':>9}")
+    for n in (args.tasks // 10, args.tasks):
+        graph, crash_costs = random_plan(n)
+        crash_days = [int(d) // 3 for d in graph.durations]
+        baseline = compress_schedule(graph, float("inf"), crash_days, crash_costs)["project_duration"]
+        for share in (0.9, 0.75, 0.6):
+            target = int(baseline * share)
+            result, elapsed = best_of(lambda: compress_schedule(graph, target, crash_days, crash_costs))
+            days = f"{baseline}->{result['project_duration']}"
+            print(f"{n:>8} {share:>8.0%} {days:>11} {str(result['feasible']):>9} "
+                  f"{result['cost']:>9.1f} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
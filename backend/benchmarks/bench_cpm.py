@@ -0,0 +1,38 @@
+"""Benchmark the CPM engine on large random DAGs.
+
+Usage (from backend/):
+    python benchmarks/bench_cpm.py [--tasks 10000] [--max-deps 3]
+"""
+import argparse
+import random
+
+from plans import best_of, random_dag
+
+from app.scheduling.cpm import compute_cpm
+
+
+def random_plan(n: int, max_deps: int, seed: int = 42):
+    """Random DAG: each task depends on up to ``max_deps`` of the 50 tasks before it"""
+    rng = random.Random(seed)
+    task_ids, dependencies = random_dag(rng, n, max_deps, window=50)
+    durations = {task_id: rng.randint(1, 10) for task_id in task_ids}
+    return task_ids, dependencies, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPM benchmark")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--max-deps", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in (args.tasks // 10, args.tasks):
+        task_ids, dependencies, durations = random_plan(n, args.max_deps)
+        edges = sum(len(deps) for deps in dependencies.values())
+        result, best = best_of(lambda: compute_cpm(task_ids, dependencies, durations), args.repeat)
+        print(f"{n:>7} tasks {edges:>7} edges: best {best * 1000:8.1f} ms "
+              f"(duration {result['project_duration']}, critical path {len(result['critical_path'])} tasks)")
+
+
+if __name__ == "__main__":
+    main()
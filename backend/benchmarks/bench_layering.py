@@ -0,0 +1,58 @@
+"""Benchmark Kahn layering (parallel_groups) on graphs up to 100k edges.
+
+Prints time per edge at doubling sizes so linear scaling is easy to check,
+plus the previous rescan-every-round grouping for comparison on small graphs.
+
+Usage (from backend/):
+    python benchmarks/bench_layering.py [--max-edges 100000]
+"""
+import argparse
+import random
+
+from plans import best_of, random_dag
+
+from app.scheduling.layering import topological_layers
+
+
+def rescan_groups(task_ids, dependencies):
+    """The previous O(n^2 * d) grouping, kept here only as a baseline"""
+    groups = []
+    remaining = set(task_ids)
+    completed = set()
+    while remaining:
+        current = [t for t in remaining if all(d in completed for d in dependencies.get(t, []))]
+        if not current:
+            current = list(remaining)
+        groups.append(current)
+        completed.update(current)
+        remaining.difference_update(current)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layering benchmark")
+    parser.add_argument("--max-edges", type=int, default=100000)
+    parser.add_argument("--edges-per-task", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'edges':>8} {'layers':>7} {'kahn ms':>9} {'ns/edge':>8} {'rescan ms':>10}")
+    largest = args.max_edges // args.edges_per_task
+    sizes = [n for n in (1000, 2000, 4000, 8000, 16000) if n < largest] + [largest]
+    for n in sizes:
+        # Bounded dependency window, so layer counts grow with n
+        task_ids, dependencies = random_dag(random.Random(7), n, args.edges_per_task, window=200,
+                                            min_deps=args.edges_per_task)
+        edges = sum(len(d) for d in dependencies.values())
+        result = topological_layers(task_ids, dependencies)
+        _, kahn = best_of(lambda: topological_layers(task_ids, dependencies), args.repeat)
+        rescan = (
+            f"{best_of(lambda: rescan_groups(task_ids, dependencies))[1] * 1000:>10.1f}"
+            if n <= 4000 else f"{'-':>10}"
+        )
+        print(f"{n:>8} {edges:>8} {len(result['layers']):>7} {kahn * 1000:>9.1f} "
+              f"{kahn / edges * 1e9:>8.0f} {rescan}")
+
+
+if __name__ == "__main__":
+    main()
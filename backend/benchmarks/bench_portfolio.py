@@ -0,0 +1,43 @@
+"""Benchmark portfolio leveling of many plans against one shared team.
+
+Usage (from backend/):
+    python benchmarks/bench_portfolio.py [--projects 50] [--tasks 100]
+"""
+import argparse
+import random
+
+from plans import CATEGORIES, best_of, random_tasks
+
+from app.models.schemas import PortfolioRequest
+from app.services.portfolio import run_portfolio
+
+CAPACITY = {"development": 12, "testing": 4, "documentation": 2, "deployment": 2}
+
+
+def random_plan(n: int, rng: random.Random):
+    return random_tasks(rng, n, max_deps=2, window=10,
+                        duration=lambda r: r.choice([2.4, 6.0, 12.0]),
+                        category=lambda r: r.choice(CATEGORIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio scheduling benchmark")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print(f"{'projects':>9} {'tasks':>7} {'makespan':>9} {'unconstrained':>14} {'ms':>9}")
+    for count in (max(1, args.projects // 10), args.projects):
+        projects = [(i, random_plan(args.tasks, rng)) for i in range(1, count + 1)]
+        request = PortfolioRequest(
+            projects=[{"id": i, "priority": 1 if i <= count // 10 else 0} for i in range(1, count + 1)],
+            capacity=CAPACITY, start_date="2026-01-05",
+        )
+        result, elapsed = best_of(lambda: run_portfolio(projects, request))
+        print(f"{count:>9} {count * args.tasks:>7} {result.makespan_days:>9} "
+              f"{result.unconstrained_makespan_days:>14} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
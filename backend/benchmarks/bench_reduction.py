@@ -0,0 +1,30 @@
+"""Benchmark bitset transitive reduction on dense random dependency graphs.
+
+Usage (from backend/):
+    python benchmarks/bench_reduction.py [--tasks 5000] [--deps 6]
+"""
+import argparse
+import random
+
+from plans import best_of, random_dag
+
+from app.scheduling.graph import TaskGraph
+from app.scheduling.reduction import transitive_reduction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transitive reduction benchmark")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--deps", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'edges':>8} {'removed':>8} {'ms':>9}")
+    for n in (args.tasks // 10, args.tasks // 2, args.tasks):
+        ids, dependencies = random_dag(random.Random(11), n, args.deps, window=40)
+        graph = TaskGraph.from_dependencies(ids, dependencies)
+        (_, removed), elapsed = best_of(lambda: transitive_reduction(graph))
+        print(f"{n:>8} {graph.edge_count:>8} {len(removed):>8} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
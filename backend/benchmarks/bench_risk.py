@@ -0,0 +1,38 @@
+"""Benchmark the Monte Carlo schedule-risk simulation.
+
+Usage (from backend/):
+    python benchmarks/bench_risk.py [--tasks 1000] [--iterations 10000]
+"""
+import argparse
+import random
+from datetime import date
+
+from plans import best_of, random_tasks
+
+from app.scheduling.risk import schedule_risk
+
+
+def random_plan(n: int, seed: int = 13):
+    tasks = random_tasks(random.Random(seed), n, complexity=lambda r: r.choice(["low", "medium", "high"]))
+    return tasks, {task["id"]: task["dependencies"] for task in tasks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule risk benchmark")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'distribution':>12} {'ms':>9}   P50 / P80 / P95 (working days)")
+    for n in (args.tasks // 10, args.tasks):
+        tasks, dependencies = random_plan(n)
+        for distribution in ("pert", "triangular"):
+            risk, elapsed = best_of(
+                lambda: schedule_risk(tasks, dependencies, date(2026, 1, 5), args.iterations, distribution, seed=1)
+            )
+            days = " / ".join(str(risk["percentiles"][p]["working_days"]) for p in ("p50", "p80", "p95"))
+            print(f"{n:>8} {distribution:>12} {elapsed * 1000:>9.1f}   {days}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark topological schedule propagation on large plans.
+
+Compares propagate_schedule (CPM offsets + O(1) business-day arithmetic)
+against the previous list-order pass that looped day by day and re-parsed
+dates with strptime.
+
+Usage (from backend/):
+    python benchmarks/bench_schedule.py [--tasks 20000]
+"""
+import argparse
+import random
+from datetime import date, datetime, timedelta
+
+from plans import best_of, random_tasks
+
+from app.scheduling.schedule import propagate_schedule
+
+
+def random_plan(n: int, seed: int = 3):
+    tasks = random_tasks(random.Random(seed), n, window=100,
+                         duration=lambda r: r.choice([2.4, 6.0, 12.0]),
+                         start_date=lambda r: "2026-01-05", end_date=lambda r: "2026-01-07")
+    return tasks, {task["id"]: task["dependencies"] for task in tasks}
+
+
+def list_order_baseline(tasks, dependencies):
+    """The previous _adjust_timeline loop, kept only as a baseline"""
+    task_map = {t["id"]: t for t in tasks}
+    for task in tasks:
+        deps = dependencies.get(task["id"], [])
+        if not deps:
+            continue
+        latest_end = max(datetime.strptime(task_map[d]["end_date"], "%Y-%m-%d") for d in deps)
+        new_start = latest_end + timedelta(days=1)
+        while new_start.weekday() >= 5:
+            new_start += timedelta(days=1)
+        end_date, days_added = new_start, 0
+        while days_added < task["duration"]:
+            end_date += timedelta(days=1)
+            if end_date.weekday() < 5:
+                days_added += 1
+        task["start_date"] = new_start.strftime("%Y-%m-%d")
+        task["end_date"] = end_date.strftime("%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule propagation benchmark")
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'topological ms':>15} {'list-order ms':>14}  project end")
+    for n in (args.tasks // 20, args.tasks // 4, args.tasks):
+        tasks, dependencies = random_plan(n)
+        result, topo = best_of(lambda: propagate_schedule(tasks, dependencies, date(2026, 1, 5)))
+
+        tasks, dependencies = random_plan(n)
+        _, baseline = best_of(lambda: list_order_baseline(tasks, dependencies))
+        print(f"{n:>8} {topo * 1000:>15.1f} {baseline * 1000:>14.1f}  {result['project_end']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark batched what-if evaluation against a full CPM per scenario.
+
+Usage (from backend/):
+    python benchmarks/bench_what_if.py [--tasks 10000] [--scenarios 50]
+"""
+import argparse
+import random
+
+from plans import best_of, random_tasks
+
+from app.models.schemas import WhatIfScenario
+from app.scheduling.cpm import compute_cpm, task_durations
+from app.services.what_if import run_what_if
+
+
+def random_plan(n: int, seed: int = 13):
+    return random_tasks(random.Random(seed), n, duration=lambda r: r.randint(1, 10),
+                        start_date=lambda r: "2026-01-05")
+
+
+def random_scenarios(tasks, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    scenarios = []
+    for s in range(count):
+        task = rng.choice(tasks)
+        changes = [{"task_id": task["id"], "delay_days": rng.randint(-3, 10)}]
+        if task["dependencies"]:
+            changes.append({"task_id": task["id"], "remove_dependencies": task["dependencies"][:1]})
+        scenarios.append(WhatIfScenario(name=f"scenario_{s}", changes=changes))
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if benchmark")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--scenarios", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'scenarios':>10} {'batched ms':>11} {'full CPM ms':>12}")
+    for n in (args.tasks // 10, args.tasks):
+        tasks = random_plan(n)
+        scenarios = random_scenarios(tasks, args.scenarios)
+
+        _, batched = best_of(lambda: run_what_if(1, tasks, scenarios))
+
+        # Baseline: one full recompute per scenario
+        ids = [t["id"] for t in tasks]
+        durations = task_durations(tasks)
+        dependencies = {t["id"]: t["dependencies"] for t in tasks}
+        _, full = best_of(lambda: [compute_cpm(ids, dependencies, durations) for _ in scenarios])
+        print(f"{n:>8} {len(scenarios):>10} {batched * 1000:>11.1f} {full * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
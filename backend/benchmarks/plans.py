@@ -0,0 +1,46 @@
+"""Shared setup for the benchmarks: the import path and random plan generators.
+
+Every ``bench_*.py`` imports this module before anything from ``app``;
+running ``python benchmarks/bench_<name>.py`` from backend/ puts this
+directory on ``sys.path``, and importing it adds backend/ as well.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CATEGORIES = ["development", "testing", "documentation", "deployment"]
+
+
+def random_dag(rng: random.Random, n: int, max_deps: int = 3, window: int = 30,
+               min_deps: int = 0) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Ids ``task_0..`` where each task depends on ``min_deps``-``max_deps`` of the ``window`` tasks before it"""
+    ids = [f"task_{i}" for i in range(n)]
+    dependencies = {
+        task_id: rng.sample(ids[max(0, i - window):i], min(i, rng.randint(min_deps, max_deps)))
+        for i, task_id in enumerate(ids)
+    }
+    return ids, dependencies
+
+
+def random_tasks(rng: random.Random, n: int, max_deps: int = 3, window: int = 30,
+                 **fields: Callable[[random.Random], Any]) -> List[Dict[str, Any]]:
+    """Task dicts of a ``random_dag`` with ``id``, ``dependencies`` and a value drawn by each of ``fields``"""
+    ids, dependencies = random_dag(rng, n, max_deps, window)
+    return [
+        {"id": task_id, "dependencies": dependencies[task_id], **{name: draw(rng) for name, draw in fields.items()}}
+        for task_id in ids
+    ]
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 1) -> Tuple[Any, float]:
+    """Result of the last call and the fastest of ``repeat`` wall-clock timings, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return result, min(timings)
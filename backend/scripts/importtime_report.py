@@ -0,0 +1,79 @@
+"""Report what the cold-start import path costs.
+
+Runs ``python -X importtime`` on the app and the LLM provider modules in a
+fresh interpreter and prints the slowest imports by cumulative time.
+
+Usage (from backend/):
+    python scripts/importtime_report.py [--top 25] [--module app.main --module langchain_groq]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["app.main", "langchain_groq"]
+
+
+def run_importtime(modules: List[str]) -> str:
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "import failed", file=sys.stderr)
+    return result.stderr
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """Parse ``import time: self | cumulative | name`` lines into (name, self_us, cumulative_us, depth)"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", dest="modules",
+                        help="module to import (repeatable)")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    modules = args.modules or DEFAULT_MODULES
+    rows = parse_importtime(run_importtime(modules))
+    if not rows:
+        print("No import timings captured")
+        return
+
+    # Top-level entries (depth 0) sum to the total cold import cost
+    total_us = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+    print(f"Cold import of {', '.join(modules)}: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    roots = {}
+    for name, _, cumulative_us, depth in rows:
+        if depth == 0:
+            package = name.split(".")[0]
+            roots[package] = roots.get(package, 0) + cumulative_us
+    print("\nBy top-level package:")
+    for package, cumulative_us in sorted(roots.items(), key=lambda r: r[1], reverse=True)[:10]:
+        print(f"{cumulative_us / 1000:>14.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""compress_schedule against exhaustive search on small random plans"""
+import itertools
+import random
+
+import pytest
+
+from app.scheduling.compression import compress_schedule
+from app.scheduling.graph import TaskGraph
+
+
+def random_graph(rng: random.Random, max_tasks: int, max_preds: int):
+    n = rng.randint(2, max_tasks)
+    ids = [f"t{i}" for i in range(n)]
+    preds = [sorted(rng.sample(range(t), min(t, rng.randint(0, max_preds)))) for t in range(n)]
+    durations = [rng.randint(1, 6) for _ in range(n)]
+    graph = TaskGraph.from_dependencies(
+        ids, {ids[t]: [ids[d] for d in preds[t]] for t in range(n)}, dict(zip(ids, durations)),
+    )
+    return graph, durations
+
+
+def finish(graph: TaskGraph, durations, crashed, overlaps) -> int:
+    """Project duration with tasks shortened by ``crashed`` and edges overlapped by ``overlaps``"""
+    edges = list(zip(graph.edge_targets.tolist(), graph.pred_edges.tolist()))
+    ef = [0] * len(durations)
+    for t in range(len(durations)):  # Plan order is topological here
+        start = max((ef[d] - overlaps[k] for k, (u, d) in enumerate(edges) if u == t), default=0)
+        ef[t] = start + durations[t] - crashed[t]
+    return max(ef)
+
+
+def cheapest(graph, durations, room, costs, overlap_room, fast_track_cost, target):
+    best = None
+    for crashed in itertools.product(*[range(r + 1) for r in room]):
+        for overlaps in itertools.product(*[range(r + 1) for r in overlap_room]):
+            if finish(graph, durations, crashed, overlaps) <= target:
+                cost = sum(c * x for c, x in zip(crashed, costs)) + sum(overlaps) * (fast_track_cost or 0)
+                best = cost if best is None else min(best, cost)
+    return best
+
+
+def check(graph, durations, room, costs, fast_track_cost, target):
+    deps = graph.pred_edges.tolist()
+    overlap_room = [
+        int(0.5 * (durations[d] - room[d])) if fast_track_cost is not None else 0 for d in deps
+    ]
+    result = compress_schedule(graph, target, room, costs, fast_track_cost, max_overlap=0.5)
+
+    # The reported schedule is consistent with itself
+    assert result["crashed"] == [d - r for d, r in zip(durations, result["durations"])]
+    assert all(0 <= c <= r for c, r in zip(result["crashed"], room))
+    assert all(0 <= o <= r for o, r in zip(result["overlaps"], overlap_room))
+    assert finish(graph, durations, result["crashed"], result["overlaps"]) == result["project_duration"]
+    cost = (sum(c * x for c, x in zip(result["crashed"], costs))
+            + sum(result["overlaps"]) * (fast_track_cost or 0))
+    assert cost == pytest.approx(result["cost"])
+
+    expected = cheapest(graph, durations, room, costs, overlap_room, fast_track_cost, target)
+    if expected is None:
+        assert not result["feasible"]
+    else:
+        assert result["feasible"]
+        assert result["cost"] == pytest.approx(expected)
+
+
+def test_uncrashes_earlier_steps_when_cheaper():
+    # Greedy cheapest-cut crashing pays 36 here; the optimum gives days back and pays 31
+    ids = [f"t{i}" for i in range(6)]
+    preds = [[], [], [], [0, 1], [], [0]]
+    durations = [3, 3, 3, 4, 5, 5]
+    graph = TaskGraph.from_dependencies(
+        ids, {ids[t]: [ids[d] for d in preds[t]] for t in range(6)}, dict(zip(ids, durations)),
+    )
+    result = compress_schedule(graph, 5, [1, 2, 1, 3, 2, 3], [6, 5, 2, 8, 6, 6], None)
+    assert result["feasible"]
+    assert result["cost"] == pytest.approx(31)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_crashing_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        graph, durations = random_graph(rng, max_tasks=7, max_preds=2)
+        room = [rng.randint(0, min(3, d - 1)) for d in durations]
+        costs = [rng.randint(1, 9) for _ in durations]
+        base = finish(graph, durations, [0] * len(durations), [0] * len(graph.pred_edges))
+        check(graph, durations, room, costs, None, rng.randint(max(1, base // 2), base))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fast_tracking_matches_exhaustive_search(seed):
+    rng = random.Random(1000 + seed)
+    checked = 0
+    while checked < 20:
+        graph, durations = random_graph(rng, max_tasks=6, max_preds=3)
+        if len(graph.pred_edges) > 4:
+            continue
+        room = [rng.randint(0, min(3, d - 1)) for d in durations]
+        costs = [rng.randint(1, 9) for _ in durations]
+        base = finish(graph, durations, [0] * len(durations), [0] * len(graph.pred_edges))
+        check(graph, durations, room, costs, float(rng.randint(1, 9)), rng.randint(1, base))
+        checked += 1
@@ -0,0 +1,70 @@
+"""IncrementalSchedule.evaluate against a full CPM of the edited plan"""
+import random
+
+import numpy as np
+import pytest
+
+from app.scheduling.cpm import cpm_arrays
+from app.scheduling.graph import TaskGraph
+from app.scheduling.incremental import IncrementalSchedule
+
+
+def random_plan(rng: random.Random):
+    n = rng.randint(1, 25)
+    ids = [f"t{i}" for i in range(n)]
+    dependencies = {ids[t]: [ids[d] for d in rng.sample(range(t), min(t, rng.randint(0, 3)))] for t in range(n)}
+    durations = {task_id: rng.randint(1, 8) for task_id in ids}
+    return ids, dependencies, durations
+
+
+def random_edits(rng: random.Random, graph: TaskGraph, dependencies):
+    n = len(graph)
+    durations = {t: rng.randint(1, 10) for t in rng.sample(range(n), rng.randint(0, min(n, 3)))}
+    edges = [(graph.index[t], graph.index[d]) for t, deps in dependencies.items() for d in deps]
+    removed = rng.sample(edges, rng.randint(0, min(len(edges), 2)))
+    # Any pair, so some added edges run against the plan order or close a cycle
+    added = [tuple(rng.sample(range(n), 2)) for _ in range(rng.randint(0, 2))] if n > 1 else []
+    return durations, added, removed
+
+
+def full_cpm(ids, dependencies, base_durations, durations, added, removed):
+    edited = {t: list(deps) for t, deps in dependencies.items()}
+    for t, d in removed:
+        edited[ids[t]].remove(ids[d])
+    for t, d in added:
+        if ids[d] not in edited[ids[t]]:
+            edited[ids[t]].append(ids[d])
+    lengths = {t: durations.get(i, base_durations[t]) for i, t in enumerate(ids)}
+    return cpm_arrays(TaskGraph.from_dependencies(ids, edited, lengths))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_evaluate_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    for _ in range(25):
+        ids, dependencies, base_durations = random_plan(rng)
+        graph = TaskGraph.from_dependencies(ids, dependencies, base_durations)
+        schedule = IncrementalSchedule(graph)
+        baseline = cpm_arrays(graph)
+
+        for _ in range(4):
+            durations, added, removed = random_edits(rng, graph, dependencies)
+            try:
+                expected = full_cpm(ids, dependencies, base_durations, durations, added, removed)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    schedule.evaluate(durations, added, removed)
+                continue
+
+            outcome = schedule.evaluate(durations, added, removed)
+            assert outcome["project_duration"] == expected["project_duration"]
+            for field in ("es", "ef", "ls", "total_float"):
+                np.testing.assert_array_equal(outcome[field], expected[field], err_msg=field)
+            moved = np.flatnonzero((expected["es"] != baseline["es"]) | (expected["ef"] != baseline["ef"]))
+            assert outcome["changed"] == moved.tolist()
+
+        # Scenarios are overlays: the baseline is untouched
+        unchanged = schedule.evaluate()
+        np.testing.assert_array_equal(unchanged["es"], baseline["es"])
+        np.testing.assert_array_equal(unchanged["ls"], baseline["ls"])
+        assert unchanged["changed"] == []
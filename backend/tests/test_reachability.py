@@ -0,0 +1,140 @@
+"""Incremental reachability maintenance and dependency edits against rebuilding from scratch"""
+import json
+import random
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes import projects as project_routes
+from app.core.database import Base, get_db
+from app.main import app
+from app.models.models import Project
+from app.scheduling.reachability import ReachabilityIndex
+from app.scheduling.schedule import level_schedule, propagate_schedule
+from app.services.reachability import ReachabilityCache
+
+
+def random_dependencies(rng: random.Random, n: int):
+    ids = [f"t{i}" for i in range(n)]
+    return ids, {ids[t]: [ids[d] for d in rng.sample(range(t), min(t, rng.randint(0, 3)))] for t in range(n)}
+
+
+def assert_same_closure(index: ReachabilityIndex, ids, dependencies):
+    expected = ReachabilityIndex.from_dependencies(ids, dependencies)
+    for task_id in ids:
+        assert index.upstream(task_id) == expected.upstream(task_id), task_id
+        assert index.downstream(task_id) == expected.downstream(task_id), task_id
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_edit_sequences_match_rebuild(seed):
+    rng = random.Random(seed)
+    ids, dependencies = random_dependencies(rng, rng.randint(2, 40))
+    index = ReachabilityIndex.from_dependencies(ids, dependencies)
+    for _ in range(60):
+        task_id, dep_id = rng.sample(ids, 2)
+        if rng.random() < 0.4 and dependencies[task_id]:
+            dep_id = rng.choice(dependencies[task_id])
+            index.remove_dependency(task_id, dep_id)
+            dependencies[task_id].remove(dep_id)
+        else:
+            try:
+                index.add_dependency(task_id, dep_id)
+            except ValueError:
+                # Only a real cycle is rejected, and the index is left as it was
+                assert dep_id in ReachabilityIndex.from_dependencies(ids, dependencies).downstream(task_id)
+            else:
+                if dep_id not in dependencies[task_id]:
+                    dependencies[task_id].append(dep_id)
+        assert_same_closure(index, ids, dependencies)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)
+
+    def override_db():
+        db = session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(project_routes, "reachability_cache", ReachabilityCache())
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app), session
+    app.dependency_overrides.pop(get_db, None)
+
+
+def save_plan(session, rng: random.Random, capacity):
+    ids, dependencies = random_dependencies(rng, 30)
+    tasks = [
+        {"id": task_id, "name": task_id, "description": "", "category": rng.choice(["backend", "frontend"]),
+         "complexity": "medium", "duration": rng.randint(1, 6), "dependencies": dependencies[task_id]}
+        for task_id in ids
+    ]
+    cpm = propagate_schedule(tasks, dependencies, date(2026, 11, 2))
+    for task in tasks:
+        task.update(cpm["tasks"][task["id"]])
+    project_end = level_schedule(tasks, dependencies, cpm, capacity)["project_end"]
+    db = session()
+    project = Project(description="test", tasks=json.dumps(tasks),
+                      total_duration=(project_end - cpm["project_start"]).days,
+                      team_capacity=json.dumps(capacity), calendar_region="default")
+    db.add(project)
+    db.commit()
+    project_id = project.id
+    db.close()
+    return project_id, ids
+
+
+def stored(session, project_id):
+    db = session()
+    project = db.get(Project, project_id)
+    result = json.loads(project.tasks), project.total_duration
+    db.close()
+    return result
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_api_edit_sequence_matches_rebuild(client, seed):
+    client, session = client
+    rng = random.Random(seed)
+    capacity = {"backend": 1, "frontend": 2}
+    project_id, ids = save_plan(session, rng, capacity)
+    url = f"/api/v1/projects/{project_id}/tasks"
+
+    for _ in range(15):
+        task_id = rng.choice(ids)
+        tasks, duration = stored(session, project_id)
+        current = {t["id"]: t["dependencies"] for t in tasks}
+        edit = {"add": rng.sample(ids, 2), "remove": current[task_id][:1]}
+        response = client.patch(f"{url}/{task_id}/dependencies", json=edit)
+        after, after_duration = stored(session, project_id)
+
+        if response.status_code == 422:
+            # A cycle-closing edit changes nothing, stored or cached
+            assert (after, after_duration) == (tasks, duration)
+        else:
+            assert response.status_code == 200, response.text
+            # Re-dated and re-leveled with the stored capacity, as a fresh plan would be
+            dependencies = {t["id"]: t["dependencies"] for t in after}
+            fresh = [dict(t) for t in after]
+            cpm = propagate_schedule(fresh, dependencies, min(date.fromisoformat(t["start_date"]) for t in after))
+            for task in fresh:
+                task.update(cpm["tasks"][task["id"]])
+            project_end = level_schedule(fresh, dependencies, cpm, capacity)["project_end"]
+            assert after_duration == (project_end - cpm["project_start"]).days
+            assert [(t["start_date"], t["end_date"]) for t in after] == \
+                   [(t["start_date"], t["end_date"]) for t in fresh]
+
+        expected = ReachabilityIndex.from_dependencies(ids, {t["id"]: t["dependencies"] for t in after})
+        for task_id in rng.sample(ids, 5):
+            for direction in ("upstream", "downstream"):
+                body = client.get(f"{url}/{task_id}/{direction}").json()
+                assert body["tasks"] == getattr(expected, direction)(task_id)